@@ -0,0 +1,39 @@
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Concurrent headless sessions for the app load tests. AppTest mocks a
+# process-wide runtime, so every session gets a process of its own.
+
+
+def run_load(play_session, app_file, sessions, actions):
+    """Run play_session(app_file, actions, seed) in `sessions` processes at once
+
+    play_session returns one latency in seconds per action (a click, a
+    round). Returns the actions per second across all sessions and the
+    latency percentiles.
+    """
+    with ProcessPoolExecutor(max_workers=sessions) as pool:
+        # Spawn the workers and import Streamlit in them before timing anything
+        list(pool.map(time.sleep, [0] * sessions))
+        start = time.perf_counter()
+        results = list(pool.map(play_session, [app_file] * sessions, [actions] * sessions, range(sessions)))
+        elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for result in results for latency in result)
+    return {
+        "sessions": sessions,
+        "actions": len(latencies),
+        "seconds": elapsed,
+        "actions_per_sec": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    }
+
+
+def print_load(play_session, app_file, session_counts, actions, noun):
+    """One table row per session count; noun names an action ("moves", "rounds")"""
+    print(f"{'sessions':>8} {noun:>7} {noun + '/s':>9} {'p50 ms':>8} {'p95 ms':>8}")
+    for sessions in session_counts:
+        r = run_load(play_session, app_file, sessions, actions)
+        print(f"{r['sessions']:>8} {r['actions']:>7} {r['actions_per_sec']:>9.1f} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f}")
@@ -1,16 +1,50 @@
 import streamlit as st
+import os
 import random
 import time
+from concurrent.futures import ProcessPoolExecutor
+import day12_tictactoe_ai as ai
+import day12_tictactoe_engine as engine
+from day12_tictactoe_board import board_component
+from day12_tictactoe_mcts import LARGE_BOARD_TIME_BUDGET, MCTS
+from day12_tictactoe_table import open_table
 
 # Game Configuration
 EMPTY = ""
 PLAYER_X = "❌"
 PLAYER_O = "⭕"
 
+# Engine player index for each mark
+PLAYER_INDEX = {PLAYER_X: engine.X, PLAYER_O: engine.O}
+PLAYER_MARKS = {engine.X: PLAYER_X, engine.O: PLAYER_O}
+
+# "Classic" is the original win/block/center/corner heuristic
+DIFFICULTY_LEVELS = ["Classic"] + list(ai.DIFFICULTIES) + ["MCTS"]
+DEFAULT_DIFFICULTY = "Medium"
+
+# Computer opponents on boards larger than 3x3
+LARGE_BOARD_OPPONENTS = ["Heuristic", "MCTS"]
+DEFAULT_OPPONENT = "MCTS"
+
+# Monte Carlo tree search: thinking time per move (3x3, larger boards), and
+# extra processes that can search in parallel when the player turns it on
+MCTS_TIME_BUDGET = 0.05
+MCTS_LARGE_BOARD_TIME_BUDGET = LARGE_BOARD_TIME_BUDGET
+MCTS_WORKERS = max((os.cpu_count() or 1) - 1, 0)
+
+# Board size limits (N x N, K in a row)
+MAX_BOARD_SIZE = 19
+MAX_WIN_LENGTH = 6
+
+# The computer's mark fades in after this many seconds. It is purely a
+# browser-side animation: the move itself is made in the same script run.
+THINKING_DELAY = 0.4
+
 def initialize_session_state():
     """Initialize session state variables"""
     if 'board' not in st.session_state:
-        st.session_state.board = [["" for _ in range(3)] for _ in range(3)]
+        # Bitboard: (X mask, O mask), bit row * board_size + col
+        st.session_state.board = (0, 0)
     if 'current_player' not in st.session_state:
         st.session_state.current_player = PLAYER_X
     if 'game_mode' not in st.session_state:
@@ -23,109 +57,157 @@ def initialize_session_state():
         st.session_state.winning_line = []
     if 'scores' not in st.session_state:
         st.session_state.scores = {"X": 0, "O": 0, "Draw": 0}
-    if 'computer_thinking' not in st.session_state:
-        st.session_state.computer_thinking = False
+    if 'difficulty' not in st.session_state:
+        st.session_state.difficulty = DEFAULT_DIFFICULTY
+    if 'board_size' not in st.session_state:
+        st.session_state.board_size = engine.SIZE
+    if 'win_length' not in st.session_state:
+        st.session_state.win_length = engine.SIZE
+    if 'last_move' not in st.session_state:
+        st.session_state.last_move = None
+    if 'opponent' not in st.session_state:
+        st.session_state.opponent = DEFAULT_OPPONENT
+    if 'mcts' not in st.session_state:
+        st.session_state.mcts = None
+    if 'mcts_stats' not in st.session_state:
+        st.session_state.mcts_stats = None
+    if 'scores_changed' not in st.session_state:
+        st.session_state.scores_changed = False
+    # Rerun and render measurements
+    if 'full_runs' not in st.session_state:
+        st.session_state.full_runs = 0
+    if 'board_runs' not in st.session_state:
+        st.session_state.board_runs = 0
+    if 'moves_played' not in st.session_state:
+        st.session_state.moves_played = 0
+    if 'board_render_ms' not in st.session_state:
+        st.session_state.board_render_ms = 0.0
 
 def reset_board():
     """Reset the game board and state"""
-    st.session_state.board = [["" for _ in range(3)] for _ in range(3)]
+    st.session_state.board = (0, 0)
     st.session_state.current_player = PLAYER_X
     st.session_state.game_over = False
     st.session_state.winner = None
     st.session_state.winning_line = []
-    st.session_state.computer_thinking = False
+    st.session_state.last_move = None
+    st.session_state.mcts = None
+    st.session_state.mcts_stats = None
+
+def is_classic_board():
+    """3x3, three in a row: the board the solved-game AI knows"""
+    return st.session_state.board_size == engine.SIZE
+
+def cell_mark(row, col):
+    """Mark at a position ("" when empty)"""
+    x_mask, o_mask = st.session_state.board
+    bit = 1 << engine.cell_index(row, col, st.session_state.board_size)
+    if x_mask & bit:
+        return PLAYER_X
+    if o_mask & bit:
+        return PLAYER_O
+    return EMPTY
 
 def check_winner():
-    """Check if there's a winner and return winner and winning line"""
-    board = st.session_state.board
-    
-    # Check rows
-    for i in range(3):
-        if board[i][0] == board[i][1] == board[i][2] != "":
-            return board[i][0], [(i, 0), (i, 1), (i, 2)]
-    
-    # Check columns
-    for j in range(3):
-        if board[0][j] == board[1][j] == board[2][j] != "":
-            return board[0][j], [(0, j), (1, j), (2, j)]
-    
-    # Check diagonals
-    if board[0][0] == board[1][1] == board[2][2] != "":
-        return board[0][0], [(0, 0), (1, 1), (2, 2)]
-    
-    if board[0][2] == board[1][1] == board[2][0] != "":
-        return board[0][2], [(0, 2), (1, 1), (2, 0)]
-    
-    return None, []
+    """Check the lines through the last move and return winner and winning line"""
+    index = st.session_state.last_move
+    if index is None:
+        return None, []
+    size = st.session_state.board_size
+    x_mask, o_mask = st.session_state.board
+    player = engine.X if x_mask >> index & 1 else engine.O
+    line = engine.line_through(
+        x_mask if player == engine.X else o_mask, index, size, st.session_state.win_length
+    )
+    if not line:
+        return None, []
+    return PLAYER_MARKS[player], [engine.cell_position(i, size) for i in line]
 
 def is_board_full():
     """Check if the board is full"""
-    for row in st.session_state.board:
-        if "" in row:
-            return False
-    return True
+    return engine.is_full(*st.session_state.board, st.session_state.board_size)
 
 def get_empty_positions():
     """Get list of empty positions on the board"""
-    empty_positions = []
-    for i in range(3):
-        for j in range(3):
-            if st.session_state.board[i][j] == "":
-                empty_positions.append((i, j))
-    return empty_positions
+    size = st.session_state.board_size
+    return [engine.cell_position(i, size) for i in engine.empty_cells(*st.session_state.board, size)]
+
+def place_mark(row, col, player):
+    """Put a player's mark on the board"""
+    index = engine.cell_index(row, col, st.session_state.board_size)
+    st.session_state.board = engine.play(st.session_state.board, index, PLAYER_INDEX[player])
+    st.session_state.last_move = index
+    st.session_state.moves_played += 1
+
+@st.cache_resource
+def solved_table():
+    """Memory-mapped solved table, opened once per server process"""
+    return open_table()
+
+@st.cache_resource
+def mcts_pool():
+    """Worker processes for parallel MCTS, shared by every session"""
+    return ProcessPoolExecutor(MCTS_WORKERS)
+
+def uses_mcts():
+    """Whether the selected computer opponent is the tree search"""
+    if is_classic_board():
+        return st.session_state.difficulty == "MCTS"
+    return st.session_state.opponent == "MCTS"
+
+def mcts_move():
+    """Search for the computer's move, reusing the tree from its previous move"""
+    if st.session_state.mcts is None:
+        budget = MCTS_TIME_BUDGET if is_classic_board() else MCTS_LARGE_BOARD_TIME_BUDGET
+        st.session_state.mcts = MCTS(
+            st.session_state.board_size, st.session_state.win_length, time_budget=budget
+        )
+    mcts = st.session_state.mcts
+    if MCTS_WORKERS and st.session_state.get("parallel_mcts"):
+        index = mcts.choose_move(st.session_state.board, engine.O, mcts_pool(), MCTS_WORKERS)
+    else:
+        index = mcts.choose_move(st.session_state.board, engine.O)
+    st.session_state.mcts_stats = mcts.last_stats
+    return index
 
 def computer_move():
-    """Make a computer move (random for now, but could be enhanced with AI)"""
+    """Make a computer move at the selected difficulty"""
     empty_positions = get_empty_positions()
     if empty_positions:
-        # Simple AI: Try to win first, then block player, then random
-        best_move = get_best_move()
-        if best_move:
-            row, col = best_move
+        if uses_mcts():
+            row, col = engine.cell_position(mcts_move(), st.session_state.board_size)
+        elif not is_classic_board():
+            # Larger boards: win, block, else play next to the action
+            row, col = engine.cell_position(get_line_move(), st.session_state.board_size)
+        elif st.session_state.difficulty == "Classic":
+            # Simple AI: win, block, centre, corner, then random
+            row, col = engine.cell_position(ai.heuristic_move(st.session_state.board, engine.O))
         else:
-            row, col = random.choice(empty_positions)
+            # Solved-game lookup, with random slips on easier levels
+            index = solved_table().choose_move(st.session_state.board, st.session_state.difficulty)
+            row, col = engine.cell_position(index)
         
-        st.session_state.board[row][col] = PLAYER_O
+        place_mark(row, col, PLAYER_O)
         st.session_state.current_player = PLAYER_X
 
-def get_best_move():
-    """Get the best move for computer (simple AI logic)"""
-    # Check if computer can win
-    for i in range(3):
-        for j in range(3):
-            if st.session_state.board[i][j] == "":
-                st.session_state.board[i][j] = PLAYER_O
-                winner, _ = check_winner()
-                st.session_state.board[i][j] = ""  # Undo move
-                if winner == PLAYER_O:
-                    return (i, j)
+def get_line_move():
+    """Win or block K in a row on any board size, else a cell next to a mark"""
+    size = st.session_state.board_size
+    win_length = st.session_state.win_length
+    x_mask, o_mask = st.session_state.board
+    empty = engine.empty_cells(x_mask, o_mask, size)
     
-    # Check if computer needs to block player
-    for i in range(3):
-        for j in range(3):
-            if st.session_state.board[i][j] == "":
-                st.session_state.board[i][j] = PLAYER_X
-                winner, _ = check_winner()
-                st.session_state.board[i][j] = ""  # Undo move
-                if winner == PLAYER_X:
-                    return (i, j)
+    for mask in (o_mask, x_mask):
+        index = engine.line_move(mask, empty, size, win_length)
+        if index is not None:
+            return index
     
-    # Take center if available
-    if st.session_state.board[1][1] == "":
-        return (1, 1)
-    
-    # Take corners
-    corners = [(0, 0), (0, 2), (2, 0), (2, 2)]
-    available_corners = [(i, j) for i, j in corners if st.session_state.board[i][j] == ""]
-    if available_corners:
-        return random.choice(available_corners)
-    
-    return None
+    return random.choice(engine.frontier_cells(x_mask, o_mask, size))
 
 def make_move(row, col):
     """Make a move at the specified position"""
-    if st.session_state.board[row][col] == "" and not st.session_state.game_over:
-        st.session_state.board[row][col] = st.session_state.current_player
+    if cell_mark(row, col) == EMPTY and not st.session_state.game_over:
+        place_mark(row, col, st.session_state.current_player)
         
         # Check for winner
         winner, winning_line = check_winner()
@@ -138,58 +220,91 @@ def make_move(row, col):
                 st.session_state.scores["X"] += 1
             else:
                 st.session_state.scores["O"] += 1
+            st.session_state.scores_changed = True
         elif is_board_full():
             st.session_state.game_over = True
             st.session_state.winner = "Draw"
             st.session_state.scores["Draw"] += 1
+            st.session_state.scores_changed = True
         else:
             # Switch player
             st.session_state.current_player = PLAYER_O if st.session_state.current_player == PLAYER_X else PLAYER_X
             
-            # If playing against computer and it's computer's turn
+            # If playing against computer, it replies in the same run
             if (st.session_state.game_mode == "vs Computer" and 
                 st.session_state.current_player == PLAYER_O and 
                 not st.session_state.game_over):
-                st.session_state.computer_thinking = True
+                handle_computer_move()
+
+def computer_just_moved():
+    """Whether the last mark on the board is the computer's reply"""
+    index = st.session_state.last_move
+    return (st.session_state.game_mode == "vs Computer" and index is not None and
+            st.session_state.board[1] >> index & 1)
 
+def on_board_click(key):
+    """Apply a clicked cell before the board fragment reruns"""
+    index = st.session_state[key].get("clicked")
+    if index is not None:
+        make_move(*engine.cell_position(index, st.session_state.board_size))
+
+@st.fragment
 def display_board():
-    """Display the game board with buttons"""
+    """Display the game board as a single component
+    
+    Clicks are applied in the component's callback, so a move (and the
+    computer's reply) costs one run of this fragment rather than two runs
+    of the whole script. The page only reruns in full when a game ends,
+    to update the scoreboard.
+    """
+    start = time.perf_counter()
+    st.session_state.board_runs += 1
     st.markdown("### 🎯 Game Board")
     
-    # Create 3x3 grid
-    for i in range(3):
-        cols = st.columns(3)
-        for j in range(3):
-            with cols[j]:
-                # Determine button style based on winning line
-                button_style = ""
-                if (i, j) in st.session_state.winning_line:
-                    button_style = "🌟"  # Highlight winning positions
-                
-                # Button content
-                button_text = st.session_state.board[i][j] if st.session_state.board[i][j] else "⬜"
-                if (i, j) in st.session_state.winning_line:
-                    button_text = f"{button_style}{st.session_state.board[i][j]}{button_style}"
-                
-                # Create button with larger size
-                if st.button(
-                    button_text,
-                    key=f"btn_{i}_{j}",
-                    use_container_width=True,
-                    disabled=st.session_state.board[i][j] != "" or st.session_state.game_over or st.session_state.computer_thinking
-                ):
-                    make_move(i, j)
-                    st.rerun()
+    size = st.session_state.board_size
+    key = f"board_{size}"
+    board_component(
+        st.session_state.board,
+        size,
+        {"x": PLAYER_X, "o": PLAYER_O},
+        highlight=[engine.cell_index(i, j, size) for i, j in st.session_state.winning_line],
+        disabled=st.session_state.game_over,
+        fresh=st.session_state.last_move if computer_just_moved() else None,
+        fade_delay=THINKING_DELAY,
+        on_click=lambda: on_board_click(key),
+        key=key,
+    )
+    
+    # Game information
+    st.markdown("---")
+    display_game_info()
+    
+    stats = st.session_state.mcts_stats
+    if st.session_state.game_mode == "vs Computer" and uses_mcts() and stats:
+        st.caption(
+            f"🌲 Last move: {stats['simulations']:,} simulations in "
+            f"{stats['seconds'] * 1000:.0f} ms ({stats['sims_per_sec']:,.0f}/s), "
+            f"{stats['reused']:,} reused from the previous search"
+        )
+    
+    st.session_state.board_render_ms = (time.perf_counter() - start) * 1000
+    st.caption(
+        f"⏱️ Board rendered in {st.session_state.board_render_ms:.1f} ms · "
+        f"{st.session_state.moves_played} moves, {st.session_state.full_runs} full runs, "
+        f"{st.session_state.board_runs - st.session_state.full_runs} board-only runs"
+    )
+    
+    if st.session_state.scores_changed:
+        st.session_state.scores_changed = False
+        st.rerun()
 
 def display_game_info():
     """Display current game information"""
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        if not st.session_state.game_over and not st.session_state.computer_thinking:
+        if not st.session_state.game_over:
             st.info(f"Current Player: {st.session_state.current_player}")
-        elif st.session_state.computer_thinking:
-            st.warning("🤖 Computer is thinking...")
         elif st.session_state.winner == "Draw":
             st.warning("🤝 It's a Draw!")
         else:
@@ -239,18 +354,57 @@ def display_game_controls():
         if st.button("🆕 New Game", use_container_width=True):
             reset_board()
             st.rerun()
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        new_size = st.number_input(
+            "Board Size:",
+            min_value=engine.SIZE,
+            max_value=MAX_BOARD_SIZE,
+            value=st.session_state.board_size
+        )
+    
+    with col2:
+        new_length = st.number_input(
+            "In a Row to Win:",
+            min_value=engine.SIZE,
+            max_value=min(new_size, MAX_WIN_LENGTH),
+            value=min(st.session_state.win_length, new_size, MAX_WIN_LENGTH)
+        )
+    
+    if new_size != st.session_state.board_size or new_length != st.session_state.win_length:
+        st.session_state.board_size = new_size
+        st.session_state.win_length = new_length
+        reset_board()
+        st.rerun()
+    
+    if st.session_state.game_mode == "vs Computer":
+        if is_classic_board():
+            st.selectbox(
+                "🤖 Computer Difficulty:",
+                DIFFICULTY_LEVELS,
+                key="difficulty"
+            )
+        else:
+            st.selectbox(
+                "🤖 Computer Opponent:",
+                LARGE_BOARD_OPPONENTS,
+                key="opponent",
+                help="Heuristic wins or blocks when it can; MCTS searches for "
+                     f"{MCTS_LARGE_BOARD_TIME_BUDGET * 1000:.0f} ms per move"
+            )
+        
+        if uses_mcts() and MCTS_WORKERS:
+            st.checkbox(f"⚡ Search on {MCTS_WORKERS + 1} cores", key="parallel_mcts")
 
 def handle_computer_move():
-    """Handle computer move with a slight delay for better UX"""
-    if (st.session_state.computer_thinking and 
-        st.session_state.game_mode == "vs Computer" and 
+    """Play the computer's reply and settle the game if it ends"""
+    if (st.session_state.game_mode == "vs Computer" and 
         st.session_state.current_player == PLAYER_O and 
         not st.session_state.game_over):
         
-        # Add a small delay for better user experience
-        time.sleep(0.5)
         computer_move()
-        st.session_state.computer_thinking = False
         
         # Check for winner after computer move
         winner, winning_line = check_winner()
@@ -260,12 +414,12 @@ def handle_computer_move():
             st.session_state.winning_line = winning_line
             if winner == PLAYER_O:
                 st.session_state.scores["O"] += 1
+            st.session_state.scores_changed = True
         elif is_board_full():
             st.session_state.game_over = True
             st.session_state.winner = "Draw"
             st.session_state.scores["Draw"] += 1
-        
-        st.rerun()
+            st.session_state.scores_changed = True
 
 def display_game_rules():
     """Display game rules and instructions"""
@@ -273,24 +427,26 @@ def display_game_rules():
         st.markdown("""
         **Tic-Tac-Toe Rules:**
         
-        🎯 **Objective:** Get three of your marks in a row (horizontally, vertically, or diagonally)
+        🎯 **Objective:** Get three of your marks in a row (horizontally, vertically, or diagonally).
+        On larger boards, get as many in a row as the *In a Row to Win* setting (15x15 with 5 is Gomoku)
         
         🎮 **How to Play:**
         - Click on any empty square to place your mark
         - Players alternate turns (❌ goes first)
-        - First player to get 3 in a row wins!
+        - First player to get 3 (or the chosen number) in a row wins!
         - If all squares are filled without a winner, it's a draw
         
         🤖 **vs Computer Mode:**
         - You play as ❌ (X)
         - Computer plays as ⭕ (O)
-        - Computer uses basic AI strategy
+        - Choose the computer's difficulty: *Perfect* never loses,
+          *Classic* is the original win/block strategy, *MCTS* searches with random playouts
         
         👥 **Two Player Mode:**
         - Take turns clicking squares
         - ❌ (Player X) always goes first
         
-        🌟 **Winning combinations are highlighted with stars!**
+        🌟 **Winning combinations are highlighted!**
         """)
 
 def main():
@@ -305,26 +461,19 @@ def main():
     
     # Initialize session state
     initialize_session_state()
+    st.session_state.full_runs += 1
     
     # Main title
     st.title("🎮 Tic-Tac-Toe Game ❌⭕")
     st.markdown("*A classic game for all ages!*")
     st.markdown("---")
     
-    # Handle computer move if needed
-    if st.session_state.computer_thinking:
-        handle_computer_move()
-    
     # Main game layout
     col1, col2 = st.columns([2, 1])
     
     with col1:
-        # Game board
+        # Game board and information
         display_board()
-        
-        # Game information
-        st.markdown("---")
-        display_game_info()
     
     with col2:
         # Game controls
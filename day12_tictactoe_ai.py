@@ -0,0 +1,250 @@
+import random
+from functools import lru_cache
+
+from day12_tictactoe_engine import CELLS, FULL, MASK_CELLS, WINNING_LINE, X, winning_move
+
+# AI Configuration
+WIN_SCORE = 10  # a win is worth WIN_SCORE minus the marks on the board, so faster wins score higher
+
+# Chance of playing a random move instead of a perfect one
+DIFFICULTIES = {
+    "Easy": 0.6,
+    "Medium": 0.3,
+    "Hard": 0.1,
+    "Perfect": 0.0,
+}
+
+# Transposition table flags
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+
+def _symmetries():
+    """The 8 rotations/reflections of the board as cell permutations"""
+    def rotate(i):
+        row, col = divmod(i, 3)
+        return col * 3 + (2 - row)
+
+    def mirror(i):
+        row, col = divmod(i, 3)
+        return row * 3 + (2 - col)
+
+    perms = []
+    perm = list(range(CELLS))
+    for _ in range(4):
+        perms.append(tuple(perm))
+        perms.append(tuple(mirror(p) for p in perm))
+        perm = [rotate(p) for p in perm]
+    return tuple(perms)
+
+
+SYMMETRIES = _symmetries()
+
+# TRANSFORMS[s][mask] is mask with every cell moved by symmetry s
+TRANSFORMS = tuple(
+    tuple(sum(1 << perm[i] for i in MASK_CELLS[mask]) for mask in range(FULL + 1))
+    for perm in SYMMETRIES
+)
+
+
+def canonical(x_mask, o_mask):
+    """(key, symmetry) of the smallest equivalent position
+
+    The key packs both masks as x | o << 9; symmetry is the index into
+    SYMMETRIES that maps this board onto the canonical one.
+    """
+    best_key, best_sym = None, 0
+    for sym, table in enumerate(TRANSFORMS):
+        key = table[x_mask] | table[o_mask] << CELLS
+        if best_key is None or key < best_key:
+            best_key, best_sym = key, sym
+    return best_key, best_sym
+
+
+def popcount(mask):
+    return bin(mask).count("1")
+
+
+def side_to_move(x_mask, o_mask):
+    """0 when X is to move, 1 when O is"""
+    return 0 if popcount(x_mask) == popcount(o_mask) else 1
+
+
+class Minimax:
+    """Negamax with alpha-beta pruning and a symmetry-reduced transposition table
+
+    Scores are from the side to move: WIN_SCORE - marks for a win, 0 for a
+    draw, negative for a loss.
+    """
+
+    def __init__(self):
+        self.table = {}
+        self.nodes = 0
+
+    def search(self, me, opp, alpha=-WIN_SCORE, beta=WIN_SCORE):
+        """Score of the position for the player owning `me`, who is to move"""
+        self.nodes += 1
+        if WINNING_LINE[opp]:
+            return -(WIN_SCORE - popcount(me | opp))
+        if me | opp == FULL:
+            return 0
+
+        key, _ = canonical(me, opp)
+        entry = self.table.get(key)
+        if entry is not None:
+            value, flag = entry
+            if flag == EXACT:
+                return value
+            if flag == LOWER:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if alpha >= beta:
+                return value
+
+        original_alpha = alpha
+        best = -WIN_SCORE - 1
+        for index in MASK_CELLS[FULL & ~(me | opp)]:
+            value = -self.search(opp, me | 1 << index, -beta, -alpha)
+            if value > best:
+                best = value
+            if best > alpha:
+                alpha = best
+            if alpha >= beta:
+                break
+
+        if best <= original_alpha:
+            flag = UPPER
+        elif best >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.table[key] = (best, flag)
+        return best
+
+    def move_scores(self, x_mask, o_mask):
+        """Exact score of every legal move for the side to move ({cell: score})"""
+        if side_to_move(x_mask, o_mask) == 0:
+            me, opp = x_mask, o_mask
+        else:
+            me, opp = o_mask, x_mask
+        return {
+            index: -self.search(opp, me | 1 << index)
+            for index in MASK_CELLS[FULL & ~(me | opp)]
+        }
+
+
+def depth_search(me, opp, depth, alpha=-WIN_SCORE, beta=WIN_SCORE):
+    """Negamax cut off after `depth` plies; positions at the horizon score 0"""
+    if WINNING_LINE[opp]:
+        return -(WIN_SCORE - popcount(me | opp))
+    if me | opp == FULL or depth == 0:
+        return 0
+    best = -WIN_SCORE - 1
+    for index in MASK_CELLS[FULL & ~(me | opp)]:
+        value = -depth_search(opp, me | 1 << index, depth - 1, -beta, -alpha)
+        if value > best:
+            best = value
+        if best > alpha:
+            alpha = best
+        if alpha >= beta:
+            break
+    return best
+
+
+def depth_move_scores(board, depth):
+    """{cell: score} for the side to move, looking `depth` plies ahead"""
+    x_mask, o_mask = board
+    if side_to_move(x_mask, o_mask) == 0:
+        me, opp = x_mask, o_mask
+    else:
+        me, opp = o_mask, x_mask
+    return {
+        index: -depth_search(opp, me | 1 << index, depth - 1)
+        for index in MASK_CELLS[FULL & ~(me | opp)]
+    }
+
+
+def heuristic_move(board, player, rng=random):
+    """The classic strategy: win, block, centre, a corner, else any cell"""
+    x_mask, o_mask = board
+    me, opp = (x_mask, o_mask) if player == X else (o_mask, x_mask)
+    empty = FULL & ~(x_mask | o_mask)
+
+    for mask in (me, opp):
+        index = winning_move(mask, empty)
+        if index is not None:
+            return index
+
+    if empty >> 4 & 1:
+        return 4
+    corners = [index for index in (0, 2, 6, 8) if empty >> index & 1]
+    if corners:
+        return rng.choice(corners)
+    return rng.choice(MASK_CELLS[empty])
+
+
+@lru_cache(maxsize=None)
+def solved_table():
+    """Move scores for every reachable non-terminal position, solved once
+
+    Keyed by canonical key; values are 9-tuples of scores in canonical cell
+    order (None for occupied cells). About 5.5k reachable positions collapse
+    to under a thousand canonical ones.
+    """
+    minimax = Minimax()
+    table = {}
+    seen = set()
+    stack = [(0, 0)]
+    while stack:
+        x_mask, o_mask = stack.pop()
+        key, sym = canonical(x_mask, o_mask)
+        if key in seen:
+            continue
+        seen.add(key)
+        if WINNING_LINE[x_mask] or WINNING_LINE[o_mask] or x_mask | o_mask == FULL:
+            continue
+
+        perm = SYMMETRIES[sym]
+        scores = [None] * CELLS
+        for index, score in minimax.move_scores(x_mask, o_mask).items():
+            scores[perm[index]] = score
+        table[key] = tuple(scores)
+
+        player_x = side_to_move(x_mask, o_mask) == 0
+        for index in MASK_CELLS[FULL & ~(x_mask | o_mask)]:
+            if player_x:
+                stack.append((x_mask | 1 << index, o_mask))
+            else:
+                stack.append((x_mask, o_mask | 1 << index))
+    return table
+
+
+def move_scores(board):
+    """{cell: score} for the side to move, read from the solved table"""
+    x_mask, o_mask = board
+    key, sym = canonical(x_mask, o_mask)
+    scores = solved_table()[key]
+    perm = SYMMETRIES[sym]
+    return {index: scores[perm[index]] for index in MASK_CELLS[FULL & ~(x_mask | o_mask)]}
+
+
+def best_moves(board):
+    """All cells that score as well as the best move"""
+    scores = move_scores(board)
+    top = max(scores.values())
+    return [index for index, score in scores.items() if score == top]
+
+
+def choose_move(board, difficulty="Perfect", rng=random):
+    """Cell index for the side to move at the given difficulty"""
+    return pick_move(move_scores(board), difficulty, rng)
+
+
+def pick_move(scores, difficulty="Perfect", rng=random):
+    """Pick from {cell: score}: a random slip at the difficulty's rate, else a best move"""
+    if rng.random() < DIFFICULTIES[difficulty]:
+        return rng.choice(list(scores))
+    top = max(scores.values())
+    return rng.choice([index for index, score in scores.items() if score == top])
@@ -0,0 +1,128 @@
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import day12_tictactoe_ai as ai
+import day12_tictactoe_engine as engine
+from day12_tictactoe_mcts import MCTS
+from round_robin import mirror_results, print_matrices
+
+# Arena Configuration
+DEFAULT_STRATEGIES = ["random", "heuristic", "minimax:1", "minimax:2", "minimax:4", "perfect", "mcts:200"]
+DEFAULT_GAMES = 1000  # per pair of strategies
+CHUNK_GAMES = 500  # games per pool task
+
+
+def make_strategy(spec, rng):
+    """Strategy function (board, player) -> cell index from a name like "minimax:2"
+
+    random          any empty cell
+    heuristic       the app's Classic win/block/centre/corner rule
+    minimax:DEPTH   depth-limited negamax, random among the best moves
+    perfect         solved-game lookup
+    mcts:ITERATIONS UCT search with that many playouts per move
+    mcts:MSms       UCT search against the clock, e.g. mcts:50ms
+    """
+    name, _, arg = spec.partition(":")
+    if name == "random":
+        return lambda board, player: rng.choice(engine.empty_cells(*board))
+    if name == "heuristic":
+        return lambda board, player: ai.heuristic_move(board, player, rng)
+    if name == "minimax":
+        depth = int(arg or engine.CELLS)
+        return lambda board, player: ai.pick_move(ai.depth_move_scores(board, depth), "Perfect", rng)
+    if name == "perfect":
+        return lambda board, player: ai.choose_move(board, "Perfect", rng)
+    if name == "mcts":
+        if arg.endswith("ms"):
+            mcts = MCTS(time_budget=float(arg[:-2]) / 1000, rng=rng)
+        else:
+            mcts = MCTS(iterations=int(arg or 1000), rng=rng)
+        return mcts.choose_move
+    raise ValueError(f"Unknown strategy: {spec}")
+
+
+def play_game(x_strategy, o_strategy):
+    """Play one game; returns engine.X, engine.O or None for a draw"""
+    board = (0, 0)
+    strategies = (x_strategy, o_strategy)
+    player = engine.X
+    while True:
+        board = engine.play(board, strategies[player](board, player), player)
+        winner, _ = engine.winner(board)
+        if winner is not None:
+            return winner
+        if engine.is_full(*board):
+            return None
+        player ^= 1
+
+
+def play_chunk(spec_a, spec_b, games, seed):
+    """(wins for a, draws, wins for b); a plays X in even games and O in odd ones"""
+    rng = random.Random(seed)
+    a = make_strategy(spec_a, rng)
+    b = make_strategy(spec_b, rng)
+    wins_a = draws = wins_b = 0
+    for game in range(games):
+        a_player = engine.X if game % 2 == 0 else engine.O
+        winner = play_game(a, b) if a_player == engine.X else play_game(b, a)
+        if winner is None:
+            draws += 1
+        elif winner == a_player:
+            wins_a += 1
+        else:
+            wins_b += 1
+    return wins_a, draws, wins_b
+
+
+def run_arena(specs, games, workers=None, seed=0):
+    """Round robin between every pair of strategies on a process pool
+
+    Returns {(a, b): (wins, draws, losses)} for a against b in both orders,
+    plus the wall-clock seconds taken.
+    """
+    tasks = []
+    for i, spec_a in enumerate(specs):
+        for spec_b in specs[i + 1:]:
+            for start in range(0, games, CHUNK_GAMES):
+                tasks.append((spec_a, spec_b, min(CHUNK_GAMES, games - start), seed + len(tasks)))
+
+    totals = {}
+    start_time = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [(task, pool.submit(play_chunk, *task)) for task in tasks]
+        for (spec_a, spec_b, _, _), future in futures:
+            wins_a, draws, wins_b = future.result()
+            old = totals.get((spec_a, spec_b), (0, 0, 0))
+            totals[(spec_a, spec_b)] = (old[0] + wins_a, old[1] + draws, old[2] + wins_b)
+    elapsed = time.perf_counter() - start_time
+
+    return mirror_results(totals), elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Self-play arena for tic-tac-toe strategies")
+    parser.add_argument("--strategies", nargs="+", default=DEFAULT_STRATEGIES,
+                        help="random, heuristic, minimax:DEPTH, perfect, mcts:ITERATIONS, mcts:MSms")
+    parser.add_argument("--games", type=int, default=DEFAULT_GAMES, help="games per pair")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    for spec in args.strategies:
+        make_strategy(spec, random)  # fail fast on a typo
+
+    results, elapsed = run_arena(args.strategies, args.games, args.workers, args.seed)
+    print_matrices(args.strategies, results)
+
+    total_games = sum(sum(counts) for counts in results.values()) // 2
+    print(f"\n⏱️ {total_games:,} games in {elapsed:.2f}s "
+          f"({total_games / elapsed:,.0f} games/sec on {args.workers} workers)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+import streamlit as st
+
+# One component for the whole grid, so an N x N board costs one element per
+# rerun instead of N² buttons inside N column containers
+
+BOARD_HTML = '<div class="board"></div>'
+
+BOARD_CSS = """
+.board {
+    display: grid;
+    gap: 3px;
+    max-width: 640px;
+    margin: 0 auto;
+}
+.cell {
+    aspect-ratio: 1;
+    padding: 0;
+    font-size: var(--cell-font);
+    line-height: 1;
+    border: 1px solid var(--st-border-color, #d0d0d0);
+    border-radius: 4px;
+    background: var(--st-secondary-background-color, #f0f2f6);
+    cursor: pointer;
+}
+.cell:disabled {
+    cursor: default;
+}
+.cell.win {
+    background: #ffe08a;
+}
+.cell.fresh {
+    animation: appear 0.15s ease-in var(--fade-delay) both;
+}
+@keyframes appear {
+    from { opacity: 0; }
+    to { opacity: 1; }
+}
+"""
+
+BOARD_JS = """
+export default function(component) {
+    const { data, setTriggerValue, parentElement } = component;
+    const board = parentElement.querySelector(".board");
+    const highlight = new Set(data.highlight);
+
+    board.style.gridTemplateColumns = `repeat(${data.size}, 1fr)`;
+    board.style.setProperty("--cell-font", `${Math.max(10, Math.floor(240 / data.size))}px`);
+    board.style.setProperty("--fade-delay", `${data.fadeDelay}s`);
+
+    // Fade a fresh mark in once; later renders of the same move show it straight away
+    const freshKey = `${data.fresh}:${data.cells}`;
+    const fresh = data.fresh !== null && board.dataset.fresh !== freshKey ? data.fresh : null;
+    board.dataset.fresh = freshKey;
+    board.replaceChildren(...Array.from(data.cells, (code, index) => {
+        const cell = document.createElement("button");
+        cell.className = highlight.has(index) ? "cell win" : "cell";
+        if (index === fresh) {
+            cell.classList.add("fresh");
+        }
+        cell.textContent = data.marks[code];
+        cell.disabled = data.disabled || code !== ".";
+        cell.dataset.cell = index;
+        return cell;
+    }));
+
+    board.onclick = (event) => {
+        const cell = event.target.closest(".cell");
+        if (cell && !cell.disabled) {
+            setTriggerValue("clicked", Number(cell.dataset.cell));
+        }
+    };
+}
+"""
+
+_board_component = st.components.v2.component(
+    "tictactoe_board",
+    html=BOARD_HTML,
+    css=BOARD_CSS,
+    js=BOARD_JS,
+)
+
+
+def board_cells(board, size):
+    """One character per cell: "x", "o" or "." for empty"""
+    x_mask, o_mask = board
+    return "".join(
+        "x" if x_mask >> i & 1 else "o" if o_mask >> i & 1 else "."
+        for i in range(size * size)
+    )
+
+
+def board_component(board, size, marks, highlight=(), disabled=False, fresh=None, fade_delay=0,
+                    on_click=None, key="board"):
+    """Draw the board and return the clicked cell index (None if nothing was clicked)
+
+    marks maps "x" and "o" to the symbols to show; highlight lists cell
+    indices to mark as the winning line. The mark in cell `fresh` fades in
+    after `fade_delay` seconds, in the browser only. on_click runs before
+    the rerun a click causes, with the cell in st.session_state[key]["clicked"].
+    """
+    result = _board_component(
+        key=key,
+        data={
+            "size": size,
+            "cells": board_cells(board, size),
+            "marks": {"x": marks["x"], "o": marks["o"], ".": ""},
+            "highlight": list(highlight),
+            "disabled": disabled,
+            "fresh": fresh,
+            "fadeDelay": fade_delay,
+        },
+        on_clicked_change=on_click or (lambda: None),
+    )
+    return result.get("clicked")
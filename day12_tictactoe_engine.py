@@ -0,0 +1,166 @@
+# Bitboard tic-tac-toe core (no Streamlit, safe to call millions of times)
+#
+# A position is two 9-bit masks, one per player. Cell (row, col) is bit
+# row * 3 + col. Win and empty-cell questions are answered by lookups into
+# tables with one entry per possible 9-bit mask, built once at import.
+#
+# Larger N x N boards with K in a row use the same two-mask layout (bit
+# row * N + col, masks are plain ints) and the line_through family below,
+# which only looks at the lines through the last move.
+
+from functools import lru_cache
+
+SIZE = 3
+CELLS = SIZE * SIZE
+FULL = (1 << CELLS) - 1
+
+X = 0
+O = 1
+
+WIN_MASKS = (
+    0b000000111, 0b000111000, 0b111000000,  # rows
+    0b001001001, 0b010010010, 0b100100100,  # columns
+    0b100010001, 0b001010100,               # diagonals
+)
+
+
+def _first_win(mask):
+    for win in WIN_MASKS:
+        if mask & win == win:
+            return win
+    return 0
+
+
+# WINNING_LINE[mask] is the first complete line in mask (0 if none)
+WINNING_LINE = tuple(_first_win(mask) for mask in range(FULL + 1))
+
+# MASK_CELLS[mask] lists the cell indices set in mask
+MASK_CELLS = tuple(
+    tuple(i for i in range(CELLS) if mask >> i & 1) for mask in range(FULL + 1)
+)
+
+
+# Row/column steps for the four lines through a cell
+LINE_DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+
+def cell_index(row, col, size=SIZE):
+    """Bit index for a (row, col) position"""
+    return row * size + col
+
+
+def cell_position(index, size=SIZE):
+    """(row, col) position for a bit index"""
+    return divmod(index, size)
+
+
+def has_won(mask):
+    """Check whether a player's mask contains a complete line"""
+    return WINNING_LINE[mask] != 0
+
+
+def empty_mask(x_mask, o_mask):
+    """Mask of unoccupied cells"""
+    return FULL & ~(x_mask | o_mask)
+
+
+def empty_cells(x_mask, o_mask, size=SIZE):
+    """Unoccupied cell indices in ascending order"""
+    if size == SIZE:
+        return MASK_CELLS[FULL & ~(x_mask | o_mask)]
+    return mask_indices(edge_masks(size)[0] & ~(x_mask | o_mask))
+
+
+def is_full(x_mask, o_mask, size=SIZE):
+    """Check whether every cell is taken"""
+    return x_mask | o_mask == (1 << size * size) - 1
+
+
+def play(board, index, player):
+    """Board (x_mask, o_mask) after player takes cell index"""
+    x_mask, o_mask = board
+    if (x_mask | o_mask) >> index & 1:
+        raise ValueError(f"Cell {index} is already taken")
+    if player == X:
+        return (x_mask | 1 << index, o_mask)
+    return (x_mask, o_mask | 1 << index)
+
+
+def winner(board):
+    """(player, winning line mask) for a finished line, else (None, 0)"""
+    x_mask, o_mask = board
+    line = WINNING_LINE[x_mask]
+    if line:
+        return X, line
+    line = WINNING_LINE[o_mask]
+    if line:
+        return O, line
+    return None, 0
+
+
+def winning_move(mask, empty):
+    """First empty cell that completes a line for mask (None if there is none)"""
+    for index in MASK_CELLS[empty]:
+        if WINNING_LINE[mask | 1 << index]:
+            return index
+    return None
+
+
+def line_through(mask, index, size=SIZE, k=SIZE):
+    """Cells of a k-in-a-row in mask that passes through index (empty if none)
+
+    Only the four lines through index are walked, stopping after k cells,
+    so checking the last move is O(k) whatever the board size.
+    """
+    row, col = divmod(index, size)
+    for dr, dc in LINE_DIRECTIONS:
+        cells = [index]
+        for step_r, step_c in ((dr, dc), (-dr, -dc)):
+            r, c = row + step_r, col + step_c
+            while len(cells) < k and 0 <= r < size and 0 <= c < size and mask >> (r * size + c) & 1:
+                cells.append(r * size + c)
+                r += step_r
+                c += step_c
+        if len(cells) >= k:
+            return tuple(sorted(cells))
+    return ()
+
+
+def line_move(mask, cells, size=SIZE, k=SIZE):
+    """First of the given empty cells that completes k in a row for mask (None if none)"""
+    for index in cells:
+        if line_through(mask | 1 << index, index, size, k):
+            return index
+    return None
+
+
+def mask_indices(mask):
+    """Indices of the set bits in mask, ascending"""
+    cells = []
+    while mask:
+        low = mask & -mask
+        cells.append(low.bit_length() - 1)
+        mask ^= low
+    return tuple(cells)
+
+
+@lru_cache(maxsize=None)
+def edge_masks(size):
+    """(full board, first column, last column) masks for a size x size board"""
+    first = sum(1 << row * size for row in range(size))
+    return (1 << size * size) - 1, first, first << size - 1
+
+
+def frontier_cells(x_mask, o_mask, size=SIZE):
+    """Empty cells touching a mark (the centre on an empty board)
+
+    The marks are grown by one cell in every direction with shifts, keeping
+    bits from wrapping between rows, so this is a handful of big-int ops.
+    """
+    taken = x_mask | o_mask
+    if not taken:
+        return (size * size // 2,)
+    full, first_column, last_column = edge_masks(size)
+    grown = (taken | taken << 1 & ~first_column | taken >> 1 & ~last_column) & full
+    grown |= grown << size | grown >> size
+    return mask_indices(grown & full & ~taken)
@@ -0,0 +1,103 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+import streamlit
+from streamlit.testing.v1 import AppTest
+
+import day12_tictactoe_engine as engine
+from apptest_load import print_load
+
+# Load Test Configuration
+APP_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "day12_tictactoe.py")
+DEFAULT_SESSIONS = [1, 4, 16]
+DEFAULT_MOVES = 20  # player moves per session
+SCRIPT_TIMEOUT = 60
+TESTED_STREAMLIT = "1.65"  # click_cell relies on AppTest internals of this release
+
+# Baseline, recorded on one core with 10 moves per session (moves/s, p50 ms):
+#
+#   sessions   sleep + st.rerun()   same-run reply
+#          1      1.7    550.1       12.2    37.6
+#          4      5.1    658.7       12.3   157.4
+#         16      9.0   1011.6       10.0   783.9
+#
+# The one-component board that followed took one session's p50 to 28.3 ms.
+# Revisions that draw the 3x3 board as btn_{row}_{col} buttons are clicked
+# through AppTest's public API on any Streamlit, so `--app` on an older
+# revision reproduces the left-hand columns; only the component board needs
+# click_cell and TESTED_STREAMLIT.
+
+
+def click_cell(at, index):
+    """Click a cell of the board component and run the app
+
+    AppTest has no API for custom components, so this sends the click the
+    way the browser does: as the component's trigger event, next to the
+    current state of every other widget. That takes three private pieces
+    of Streamlit, which is why it refuses any release but TESTED_STREAMLIT:
+    _make_trigger_id (the id of the component's event widget),
+    AppTest._tree.get_widget_states() and AppTest._run(widget_states).
+    Revisions with per-cell buttons don't come through here.
+    """
+    if streamlit.__version__.rsplit(".", 1)[0] != TESTED_STREAMLIT:
+        raise RuntimeError(f"click_cell was written against Streamlit {TESTED_STREAMLIT}.x, found "
+                           f"{streamlit.__version__}; check its private calls still work, then update "
+                           "TESTED_STREAMLIT")
+    # Imported here so another Streamlit gets the message above, not an ImportError
+    from streamlit.components.v2.bidi_component.main import _make_trigger_id
+
+    board = at.get("bidi_component")[0]
+    states = at._tree.get_widget_states()
+    states.widgets.add(id=board.proto.id, json_value="{}")
+    states.widgets.add(
+        id=_make_trigger_id(board.proto.id, "events"),
+        json_trigger_value=json.dumps([{"event": "clicked", "value": index}]),
+    )
+    return at._run(states)
+
+
+def play_session(app_file, moves, seed):
+    """Play vs Computer in one headless session; returns per-move latencies in seconds
+
+    Each latency is one player click, measured until the app has finished
+    running, including any reruns and the computer's reply.
+    """
+    rng = random.Random(seed)
+    at = AppTest.from_file(app_file, default_timeout=SCRIPT_TIMEOUT).run()
+    at.selectbox[0].select("vs Computer").run()
+    new_game = next(b for b in at.button if b.label == "🆕 New Game")
+
+    latencies = []
+    while len(latencies) < moves:
+        if at.session_state.game_over:
+            new_game.click().run()
+            continue
+        index = rng.choice(engine.empty_cells(*at.session_state.board))
+        row, col = engine.cell_position(index)
+        cell_button = next((b for b in at.button if b.key == f"btn_{row}_{col}"), None)
+        start = time.perf_counter()
+        if cell_button is not None:
+            cell_button.click().run()  # a revision that still draws per-cell buttons
+        else:
+            click_cell(at, index)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test vs-Computer tic-tac-toe sessions")
+    parser.add_argument("--app", default=APP_FILE, help="app script to test (e.g. an older revision)")
+    parser.add_argument("--sessions", type=int, nargs="+", default=DEFAULT_SESSIONS)
+    parser.add_argument("--moves", type=int, default=DEFAULT_MOVES)
+    args = parser.parse_args(argv)
+
+    print_load(play_session, args.app, args.sessions, args.moves, "moves")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
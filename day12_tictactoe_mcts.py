@@ -0,0 +1,256 @@
+import argparse
+import math
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import day12_tictactoe_engine as engine
+
+# MCTS Configuration
+EXPLORATION = math.sqrt(2)  # UCB1 exploration constant
+DEFAULT_ITERATIONS = 1000
+DEFAULT_TIME_BUDGET = 0.05  # seconds per move when searching against the clock
+# 15x15 five in a row runs ~1.4-2k sims/s on one core, so 50 ms is under 100
+# simulations a move; half a second gives the search ~900 to work with
+LARGE_BOARD_TIME_BUDGET = 0.5
+CLOCK_CHECK_INTERVAL = 8  # iterations between deadline checks
+
+DRAW = -1
+
+
+class Node:
+    """A position in the search tree, reached when `player` played `move`"""
+
+    __slots__ = ("move", "player", "parent", "children", "untried", "result", "wins", "visits")
+
+    def __init__(self, move, player, parent, untried, result=None):
+        self.move = move
+        self.player = player
+        self.parent = parent
+        self.children = []
+        self.untried = untried
+        self.result = result  # None while the game goes on, else the winner (DRAW for a draw)
+        self.wins = 0.0
+        self.visits = 0
+
+
+class MCTS:
+    """Monte Carlo tree search with UCT for N x N, K-in-a-row positions
+
+    Each iteration walks down the tree by UCB1, adds one untried move, plays
+    random moves to the end of the game and backs the result up. A node's
+    wins are from the point of view of the player who moved into it (a
+    draw counts half).
+
+    With a time_budget the search runs against the clock instead of for a
+    fixed number of iterations. The subtree under the chosen move is kept,
+    so when the opponent's reply is one the search already explored, the
+    next move starts from those playouts instead of from nothing. On boards
+    larger than 3x3 the tree only considers cells next to existing marks;
+    rollouts still use the whole board.
+    """
+
+    def __init__(self, size=engine.SIZE, k=engine.SIZE, iterations=DEFAULT_ITERATIONS,
+                 time_budget=None, exploration=EXPLORATION, rng=None):
+        self.size = size
+        self.k = k
+        self.iterations = iterations
+        self.time_budget = time_budget
+        self.exploration = exploration
+        self.rng = rng or random.Random()
+        self.root = None
+        self.root_board = None
+        self.last_stats = None
+
+    def candidate_moves(self, masks):
+        """Moves the tree expands from a position"""
+        if self.size == engine.SIZE:
+            return list(engine.empty_cells(*masks, self.size))
+        return list(engine.frontier_cells(*masks, self.size))
+
+    def new_root(self, board, player):
+        """Tree root for a position where `player` is to move"""
+        return Node(None, player ^ 1, None, self.candidate_moves(board))
+
+    def reuse_root(self, board, player):
+        """The stored subtree for board, if it was reached by moves the tree already has"""
+        if self.root is None:
+            return None
+        old_x, old_o = self.root_board
+        if old_x & ~board[0] or old_o & ~board[1]:
+            return None
+        added = [board[0] & ~old_x, board[1] & ~old_o]
+        node = self.root
+        while added[0] | added[1]:
+            mover = node.player ^ 1
+            node = next((child for child in node.children if added[mover] >> child.move & 1), None)
+            if node is None:
+                return None
+            added[mover] &= ~(1 << node.move)
+        if node.player != player ^ 1 or node.result is not None:
+            return None
+        node.parent = None
+        return node
+
+    def search(self, board, player):
+        """Grow the tree for this position until the budget runs out; returns the root"""
+        root = self.reuse_root(board, player) or self.new_root(board, player)
+        reused = root.visits
+        start = time.perf_counter()
+        if self.time_budget is None:
+            for _ in range(self.iterations):
+                self.iterate(root, board)
+        else:
+            deadline = start + self.time_budget
+            while True:
+                for _ in range(CLOCK_CHECK_INTERVAL):
+                    self.iterate(root, board)
+                if time.perf_counter() >= deadline:
+                    break
+        elapsed = time.perf_counter() - start
+        self.last_stats = {
+            "simulations": root.visits - reused,
+            "reused": reused,
+            "seconds": elapsed,
+            "sims_per_sec": (root.visits - reused) / elapsed if elapsed else 0.0,
+        }
+        return root
+
+    def choose_move(self, board, player, pool=None, workers=0):
+        """Most visited move from the position
+
+        With a process pool, `workers` independent searches run alongside
+        this one and their root visit counts are added in (root
+        parallelisation). Only this process's tree is kept for reuse.
+        """
+        futures = []
+        if pool is not None:
+            futures = [
+                pool.submit(root_visits, self.size, self.k, board, player, self.iterations,
+                            self.time_budget, self.exploration, self.rng.getrandbits(32))
+                for _ in range(workers)
+            ]
+        root = self.search(board, player)
+
+        visits = {child.move: child.visits for child in root.children}
+        for future in futures:
+            worker_visits, simulations = future.result()
+            for move, count in worker_visits.items():
+                visits[move] = visits.get(move, 0) + count
+            self.last_stats["simulations"] += simulations
+        self.last_stats["sims_per_sec"] = self.last_stats["simulations"] / max(self.last_stats["seconds"], 1e-9)
+
+        move = max(visits, key=visits.get)
+        chosen = next((child for child in root.children if child.move == move), None)
+        if chosen is None:
+            self.root = None
+        else:
+            self.root = chosen
+            self.root_board = engine.play(board, move, player)
+        return move
+
+    def iterate(self, root, board):
+        """One select / expand / rollout / backpropagate pass"""
+        masks = list(board)
+        node = root
+
+        # Selection: follow UCB1 through fully expanded nodes
+        while node.result is None and not node.untried and node.children:
+            node = self.select(node)
+            masks[node.player] |= 1 << node.move
+
+        # Expansion: add one random untried move
+        if node.result is None and node.untried:
+            untried = node.untried
+            i = self.rng.randrange(len(untried))
+            untried[i], untried[-1] = untried[-1], untried[i]
+            move = untried.pop()
+            mover = node.player ^ 1
+            masks[mover] |= 1 << move
+            candidates = self.candidate_moves(masks)
+            if engine.line_through(masks[mover], move, self.size, self.k):
+                result = mover
+            elif not candidates:
+                result = DRAW
+            else:
+                result = None
+            child = Node(move, mover, node, candidates, result)
+            node.children.append(child)
+            node = child
+
+        # Simulation: random playout unless the game is already decided
+        result = node.result
+        if result is None:
+            result = self.rollout(masks, node.player ^ 1)
+
+        # Backpropagation
+        while node is not None:
+            node.visits += 1
+            if result == node.player:
+                node.wins += 1
+            elif result == DRAW:
+                node.wins += 0.5
+            node = node.parent
+
+    def select(self, node):
+        """Child with the highest UCB1 score"""
+        log_visits = math.log(node.visits)
+        exploration = self.exploration
+        return max(
+            node.children,
+            key=lambda child: child.wins / child.visits + exploration * math.sqrt(log_visits / child.visits),
+        )
+
+    def rollout(self, masks, to_move):
+        """Play random moves to the end; returns the winner or DRAW"""
+        empty = list(engine.empty_cells(*masks, self.size))
+        self.rng.shuffle(empty)
+        for index in empty:
+            masks[to_move] |= 1 << index
+            if engine.line_through(masks[to_move], index, self.size, self.k):
+                return to_move
+            to_move ^= 1
+        return DRAW
+
+
+def root_visits(size, k, board, player, iterations, time_budget, exploration, seed):
+    """Fresh search in a worker process; returns ({move: visits}, simulations)"""
+    mcts = MCTS(size, k, iterations, time_budget, exploration, random.Random(seed))
+    root = mcts.search(board, player)
+    return {child.move: child.visits for child in root.children}, root.visits
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MCTS self-play: simulations per second per move")
+    parser.add_argument("--size", type=int, default=15)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=LARGE_BOARD_TIME_BUDGET, help="seconds per move")
+    parser.add_argument("--moves", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=0, help="extra processes searching in parallel")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    mcts = MCTS(args.size, args.k, time_budget=args.budget, rng=random.Random(args.seed))
+    pool = ProcessPoolExecutor(args.workers) if args.workers else None
+    board = (0, 0)
+    player = engine.X
+    print(f"{'move':>4} {'cell':>8} {'sims':>8} {'reused':>8} {'sims/s':>10}")
+    try:
+        for number in range(1, args.moves + 1):
+            move = mcts.choose_move(board, player, pool, args.workers)
+            stats = mcts.last_stats
+            print(f"{number:>4} {str(engine.cell_position(move, args.size)):>8} {stats['simulations']:>8,} "
+                  f"{stats['reused']:>8,} {stats['sims_per_sec']:>10,.0f}")
+            board = engine.play(board, move, player)
+            if engine.line_through(board[player], move, args.size, args.k) or engine.is_full(*board, args.size):
+                break
+            player ^= 1
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
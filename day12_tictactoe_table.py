@@ -0,0 +1,136 @@
+import argparse
+import mmap
+import os
+import random
+import struct
+import sys
+import time
+
+import day12_tictactoe_ai as ai
+from day12_tictactoe_engine import CELLS, FULL, MASK_CELLS, WINNING_LINE
+
+# Solved table file layout:
+#   header  "<4sHH"  magic, record count, record size
+#   records one per base-3 board index, CELLS signed bytes of move scores
+# Occupied cells and unreachable/finished positions hold NO_MOVE.
+TABLE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "day12_tictactoe_table.bin")
+HEADER = struct.Struct("<4sHH")
+RECORD = struct.Struct(f"<{CELLS}b")
+MAGIC = b"TTT1"
+POSITIONS = 3 ** CELLS
+NO_MOVE = -128
+
+# BASE3[mask] is the base-3 value with a 1 digit in every cell set in mask
+BASE3 = tuple(sum(3 ** i for i in MASK_CELLS[mask]) for mask in range(FULL + 1))
+
+
+def position_index(x_mask, o_mask):
+    """Base-3 board encoding: digit i is 0 empty, 1 X, 2 O"""
+    return BASE3[x_mask] + 2 * BASE3[o_mask]
+
+
+def reachable_positions():
+    """Every position reachable from the empty board where the game isn't over"""
+    seen = set()
+    stack = [(0, 0)]
+    while stack:
+        board = stack.pop()
+        if board in seen:
+            continue
+        seen.add(board)
+        x_mask, o_mask = board
+        if WINNING_LINE[x_mask] or WINNING_LINE[o_mask] or x_mask | o_mask == FULL:
+            continue
+        yield board
+        player_x = ai.side_to_move(x_mask, o_mask) == 0
+        for index in MASK_CELLS[FULL & ~(x_mask | o_mask)]:
+            if player_x:
+                stack.append((x_mask | 1 << index, o_mask))
+            else:
+                stack.append((x_mask, o_mask | 1 << index))
+
+
+def build_table(path=TABLE_FILE):
+    """Solve the game and write the table to path; returns the number of positions stored"""
+    data = bytearray(HEADER.pack(MAGIC, POSITIONS, RECORD.size) + RECORD.pack(*[NO_MOVE] * CELLS) * POSITIONS)
+
+    stored = 0
+    for board in reachable_positions():
+        scores = [NO_MOVE] * CELLS
+        for index, score in ai.move_scores(board).items():
+            scores[index] = score
+        RECORD.pack_into(data, HEADER.size + position_index(*board) * RECORD.size, *scores)
+        stored += 1
+
+    # Write next to the target and rename, so a running worker never maps a half-written file
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(data)
+    os.replace(temp_path, path)
+    return stored
+
+
+class SolvedTable:
+    """Read-only view of a table file through mmap
+
+    The pages live in the OS page cache, so every server process that maps
+    the same file shares one copy instead of solving and holding its own.
+    """
+
+    def __init__(self, path=TABLE_FILE):
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.map) != HEADER.size + POSITIONS * RECORD.size:
+            self.map.close()
+            raise ValueError(f"{path} has the wrong size for a solved table")
+        magic, count, size = HEADER.unpack_from(self.map)
+        if (magic, count, size) != (MAGIC, POSITIONS, RECORD.size):
+            self.map.close()
+            raise ValueError(f"{path} is not a tic-tac-toe solved table")
+
+    def move_scores(self, board):
+        """{cell: score} for the side to move, same as ai.move_scores"""
+        x_mask, o_mask = board
+        scores = RECORD.unpack_from(self.map, HEADER.size + position_index(x_mask, o_mask) * RECORD.size)
+        return {index: scores[index] for index in MASK_CELLS[FULL & ~(x_mask | o_mask)]}
+
+    def choose_move(self, board, difficulty="Perfect", rng=random):
+        """Cell index for the side to move at the given difficulty"""
+        return ai.pick_move(self.move_scores(board), difficulty, rng)
+
+
+def open_table(path=TABLE_FILE):
+    """Map the table, building it first if the file is missing or stale"""
+    try:
+        return SolvedTable(path)
+    except (FileNotFoundError, ValueError):
+        build_table(path)
+        return SolvedTable(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the solved tic-tac-toe table")
+    parser.add_argument("--output", default=TABLE_FILE, help="where to write the table")
+    parser.add_argument("--check", action="store_true", help="verify the file against a fresh solve")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    stored = build_table(args.output)
+    print(f"💾 Wrote {stored:,} positions ({os.path.getsize(args.output):,} bytes) "
+          f"to {args.output} in {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    table = SolvedTable(args.output)
+    print(f"⏱️ Mapped in {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    if args.check:
+        mismatches = sum(table.move_scores(board) != ai.move_scores(board) for board in reachable_positions())
+        if mismatches:
+            print(f"❌ {mismatches} positions differ from the solver")
+            return 1
+        print("✅ Table matches the solver")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,13 +2,25 @@ import streamlit as st
 import random
 import time
 from datetime import datetime
+from day13_rps_leaderboard import TOP_N, Leaderboard
+from day13_rps_predictor import MarkovPredictor
+from day13_rps_rules import CLASSIC, VARIANTS
+from day13_rps_stats import DRAW, LOSE, RESULT_CODES, RESULTS, WIN, RoundHistory, RoundStats
 
 # Game Configuration
-CHOICES = {
-    "Rock": {"emoji": "🪨", "beats": "Scissors"},
-    "Paper": {"emoji": "📄", "beats": "Rock"},
-    "Scissors": {"emoji": "✂️", "beats": "Paper"}
-}
+# Each variant lists its weapons as small ints for the predictor and the
+# outcome table: weapon (i + 1) % n always beats weapon i
+VARIANT_NAMES = list(VARIANTS)
+
+# How stale the leaderboard table may be; rounds reach the database in batches anyway
+LEADERBOARD_TTL = 5
+
+# "Adaptive" predicts your next throw from your history and counters it
+OPPONENTS = ["Adaptive", "Random"]
+
+# How long the computer "thinks" before its throw is revealed. This is a
+# browser-side animation only; the round is decided in the same run.
+THINKING_SECONDS = 0.9
 
 RESULT_MESSAGES = {
     "win": [
@@ -36,14 +48,11 @@ RESULT_MESSAGES = {
 
 def initialize_session_state():
     """Initialize session state variables"""
-    if 'user_score' not in st.session_state:
-        st.session_state.user_score = 0
-    if 'computer_score' not in st.session_state:
-        st.session_state.computer_score = 0
-    if 'draws' not in st.session_state:
-        st.session_state.draws = 0
-    if 'total_games' not in st.session_state:
-        st.session_state.total_games = 0
+    if 'variant' not in st.session_state:
+        st.session_state.variant = VARIANT_NAMES[0]
+    if 'stats' not in st.session_state:
+        # Lifetime counters: wins/losses/draws, streaks, throw frequencies
+        st.session_state.stats = RoundStats(current_rules().n)
     if 'last_user_choice' not in st.session_state:
         st.session_state.last_user_choice = None
     if 'last_computer_choice' not in st.session_state:
@@ -51,66 +60,70 @@ def initialize_session_state():
     if 'last_result' not in st.session_state:
         st.session_state.last_result = None
     if 'game_history' not in st.session_state:
-        st.session_state.game_history = []
-    if 'streak' not in st.session_state:
-        st.session_state.streak = 0
-    if 'best_streak' not in st.session_state:
-        st.session_state.best_streak = 0
-    if 'computer_thinking' not in st.session_state:
-        st.session_state.computer_thinking = False
+        st.session_state.game_history = RoundHistory()
+    if 'opponent' not in st.session_state:
+        st.session_state.opponent = OPPONENTS[0]
+    if 'player_name' not in st.session_state:
+        st.session_state.player_name = ""
+    if 'predictor' not in st.session_state:
+        st.session_state.predictor = MarkovPredictor(current_rules().n)
+
+@st.cache_resource
+def get_leaderboard():
+    """One batching leaderboard writer per server process, shared by all sessions"""
+    return Leaderboard()
+
+@st.cache_data(ttl=LEADERBOARD_TTL, show_spinner=False)
+def load_top_players(by):
+    """Top players, re-read at most every LEADERBOARD_TTL seconds"""
+    return get_leaderboard().top(TOP_N, by)
+
+def current_rules():
+    """Rules of the variant being played"""
+    return VARIANTS[st.session_state.variant]
 
 def get_computer_choice():
-    """Generate computer's choice"""
-    return random.choice(list(CHOICES.keys()))
+    """Generate computer's choice: counter the predicted throw, or pick at random"""
+    rules = current_rules()
+    if st.session_state.opponent == "Random":
+        return random.choice(rules.names)
+    return rules.names[st.session_state.predictor.counter()]
 
-def determine_winner(user_choice, computer_choice):
-    """Determine the winner of the game"""
-    if user_choice == computer_choice:
-        return "draw"
-    elif CHOICES[user_choice]["beats"] == computer_choice:
-        return "win"
-    else:
-        return "lose"
+def determine_winner(user_choice, computer_choice, rules=CLASSIC):
+    """Determine the winner of the game ("win", "lose" or "draw" for the user)"""
+    return RESULTS[rules.result(rules.index[user_choice], rules.index[computer_choice])]
 
-def update_scores(result):
+def update_scores(user_choice, computer_choice, result):
     """Update game scores based on result"""
-    st.session_state.total_games += 1
-    
-    if result == "win":
-        st.session_state.user_score += 1
-        st.session_state.streak += 1
-        if st.session_state.streak > st.session_state.best_streak:
-            st.session_state.best_streak = st.session_state.streak
-    elif result == "lose":
-        st.session_state.computer_score += 1
-        st.session_state.streak = 0
-    else:  # draw
-        st.session_state.draws += 1
+    index = current_rules().index
+    st.session_state.stats.record(
+        index[user_choice], index[computer_choice], RESULT_CODES[result]
+    )
 
 def add_to_history(user_choice, computer_choice, result):
-    """Add game to history"""
-    game_record = {
-        "timestamp": datetime.now().strftime("%H:%M:%S"),
-        "user_choice": user_choice,
-        "computer_choice": computer_choice,
-        "result": result
-    }
-    st.session_state.game_history.append(game_record)
-    
-    # Keep only last 10 games
-    if len(st.session_state.game_history) > 10:
-        st.session_state.game_history.pop(0)
+    """Add game to the recent-rounds ring buffer (the oldest round drops off in O(1))"""
+    index = current_rules().index
+    st.session_state.game_history.append(
+        index[user_choice], index[computer_choice], RESULT_CODES[result], time.time()
+    )
+
+def reset_scores():
+    """Clear scores, history and what the computer has learned"""
+    n = current_rules().n
+    st.session_state.stats = RoundStats(n)
+    st.session_state.game_history.clear()
+    st.session_state.last_user_choice = None
+    st.session_state.last_computer_choice = None
+    st.session_state.last_result = None
+    st.session_state.predictor = MarkovPredictor(n)
 
 def play_game(user_choice):
     """Play a round of the game"""
-    # Show computer thinking animation
-    st.session_state.computer_thinking = True
-    
     # Generate computer choice
     computer_choice = get_computer_choice()
     
     # Determine winner
-    result = determine_winner(user_choice, computer_choice)
+    result = determine_winner(user_choice, computer_choice, current_rules())
     
     # Update game state
     st.session_state.last_user_choice = user_choice
@@ -118,54 +131,50 @@ def play_game(user_choice):
     st.session_state.last_result = result
     
     # Update scores and history
-    update_scores(result)
+    update_scores(user_choice, computer_choice, result)
     add_to_history(user_choice, computer_choice, result)
     
-    st.session_state.computer_thinking = False
+    # Learn from the player's throw (in either mode, so switching is seamless)
+    st.session_state.predictor.update(current_rules().index[user_choice])
+    
+    # Queue the round for the leaderboard (written in batches)
+    player_name = st.session_state.player_name.strip()
+    if player_name:
+        index = current_rules().index
+        get_leaderboard().record(
+            player_name, st.session_state.variant, index[user_choice], index[computer_choice],
+            RESULT_CODES[result], st.session_state.stats.streak
+        )
 
 def display_game_choices():
     """Display the main game choice buttons"""
     st.markdown("### 🎮 Make Your Choice")
     
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        if st.button(
-            f"{CHOICES['Rock']['emoji']}\n**Rock**",
-            key="rock_btn",
-            use_container_width=True,
-            disabled=st.session_state.computer_thinking
-        ):
-            play_game("Rock")
-            st.rerun()
-    
-    with col2:
-        if st.button(
-            f"{CHOICES['Paper']['emoji']}\n**Paper**",
-            key="paper_btn",
-            use_container_width=True,
-            disabled=st.session_state.computer_thinking
-        ):
-            play_game("Paper")
-            st.rerun()
-    
-    with col3:
-        if st.button(
-            f"{CHOICES['Scissors']['emoji']}\n**Scissors**",
-            key="scissors_btn",
-            use_container_width=True,
-            disabled=st.session_state.computer_thinking
-        ):
-            play_game("Scissors")
-            st.rerun()
+    rules = current_rules()
+    
+    # The round is played in the button callback, so one click is one run
+    for col, choice in zip(st.columns(rules.n), rules.names):
+        with col:
+            st.button(
+                f"{rules.emojis[choice]}\n**{choice}**",
+                key=f"{choice.lower()}_btn",
+                use_container_width=True,
+                on_click=play_game,
+                args=(choice,)
+            )
 
 def display_last_round():
     """Display the result of the last round"""
+    names = current_rules().names
     if st.session_state.last_result is None:
-        st.info("👆 Choose Rock, Paper, or Scissors to start playing!")
+        st.info(f"👆 Choose {', '.join(names[:-1])} or {names[-1]} to start playing!")
         return
     
+    emojis = current_rules().emojis
+    
     st.markdown("### 🎯 Last Round Result")
+    round_number = st.session_state.stats.games
+    display_computer_thinking(round_number)
     
     # Create battle display
     col1, col2, col3 = st.columns([2, 1, 2])
@@ -173,7 +182,7 @@ def display_last_round():
     with col1:
         st.markdown(
             f"<div style='text-align: center; font-size: 3em;'>"
-            f"{CHOICES[st.session_state.last_user_choice]['emoji']}"
+            f"{emojis[st.session_state.last_user_choice]}"
             f"</div>",
             unsafe_allow_html=True
         )
@@ -189,63 +198,74 @@ def display_last_round():
     
     with col3:
         st.markdown(
-            f"<div style='text-align: center; font-size: 3em;'>"
-            f"{CHOICES[st.session_state.last_computer_choice]['emoji']}"
-            f"</div>",
+            f"<div class='thinking-{round_number}' style='text-align: center; font-size: 3em;'>🤔</div>",
             unsafe_allow_html=True
         )
-        st.markdown(f"<div style='text-align: center;'><b>Computer</b><br>{st.session_state.last_computer_choice}</div>", unsafe_allow_html=True)
-    
-    # Display result message
-    result_message = random.choice(RESULT_MESSAGES[st.session_state.last_result])
-    
-    if st.session_state.last_result == "win":
-        st.success(result_message)
-    elif st.session_state.last_result == "lose":
-        st.error(result_message)
-    else:
-        st.warning(result_message)
-    
-    # Show game logic
-    if st.session_state.last_result != "draw":
-        winner_choice = st.session_state.last_user_choice if st.session_state.last_result == "win" else st.session_state.last_computer_choice
-        loser_choice = st.session_state.last_computer_choice if st.session_state.last_result == "win" else st.session_state.last_user_choice
-        st.caption(f"💡 {winner_choice} beats {loser_choice}")
+        with st.container(key=f"computer_reveal_{round_number}"):
+            st.markdown(
+                f"<div style='text-align: center; font-size: 3em;'>"
+                f"{emojis[st.session_state.last_computer_choice]}"
+                f"</div>",
+                unsafe_allow_html=True
+            )
+            st.markdown(f"<div style='text-align: center;'><b>Computer</b><br>{st.session_state.last_computer_choice}</div>", unsafe_allow_html=True)
+    
+    with st.container(key=f"round_result_{round_number}"):
+        # Display result message
+        result_message = random.choice(RESULT_MESSAGES[st.session_state.last_result])
+        
+        if st.session_state.last_result == "win":
+            st.success(result_message)
+        elif st.session_state.last_result == "lose":
+            st.error(result_message)
+        else:
+            st.warning(result_message)
+        
+        # Show game logic
+        if st.session_state.last_result != "draw":
+            winner_choice = st.session_state.last_user_choice if st.session_state.last_result == "win" else st.session_state.last_computer_choice
+            loser_choice = st.session_state.last_computer_choice if st.session_state.last_result == "win" else st.session_state.last_user_choice
+            st.caption(f"💡 {winner_choice} beats {loser_choice}")
 
 def display_scoreboard():
     """Display the current scores and statistics"""
     st.markdown("### 📊 Scoreboard")
     
+    stats = st.session_state.stats
+    history = st.session_state.game_history
+    
     # Main scores
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.metric("🏆 Your Wins", st.session_state.user_score)
+        st.metric("🏆 Your Wins", stats.wins)
     
     with col2:
-        st.metric("🤖 Computer Wins", st.session_state.computer_score)
+        st.metric("🤖 Computer Wins", stats.losses)
     
     with col3:
-        st.metric("🤝 Draws", st.session_state.draws)
+        st.metric("🤝 Draws", stats.draws)
     
     # Additional statistics
-    if st.session_state.total_games > 0:
-        win_rate = (st.session_state.user_score / st.session_state.total_games) * 100
-        
+    if stats.games > 0:
         col4, col5, col6 = st.columns(3)
         
         with col4:
-            st.metric("🎯 Total Games", st.session_state.total_games)
+            st.metric("🎯 Total Games", stats.games)
         
         with col5:
-            st.metric("📈 Win Rate", f"{win_rate:.1f}%")
+            st.metric(
+                "📈 Win Rate",
+                f"{stats.share(WIN) * 100:.1f}%",
+                help=f"Last {len(history)} games: {history.win_rate() * 100:.1f}%"
+            )
         
         with col6:
-            st.metric("🔥 Current Streak", st.session_state.streak)
+            st.metric("🔥 Current Streak", stats.streak)
     
     # Best streak
-    if st.session_state.best_streak > 0:
-        st.metric("🏅 Best Streak", st.session_state.best_streak)
+    if stats.best_streak > 0:
+        st.metric("🏅 Best Streak", stats.best_streak)
 
 def display_game_history():
     """Display recent game history"""
@@ -255,14 +275,17 @@ def display_game_history():
     st.markdown("### 📈 Recent Games")
     
     # Create a table of recent games
+    rules = current_rules()
     history_data = []
-    for game in reversed(st.session_state.game_history[-5:]):  # Show last 5 games
-        result_emoji = "🏆" if game["result"] == "win" else "❌" if game["result"] == "lose" else "🤝"
+    for user, computer, result, timestamp in st.session_state.game_history.recent(5):  # Show last 5 games
+        result_emoji = "🏆" if result == WIN else "❌" if result == LOSE else "🤝"
+        user_choice = rules.names[user]
+        computer_choice = rules.names[computer]
         history_data.append({
-            "Time": game["timestamp"],
-            "You": f"{CHOICES[game['user_choice']]['emoji']} {game['user_choice']}",
-            "Computer": f"{CHOICES[game['computer_choice']]['emoji']} {game['computer_choice']}",
-            "Result": f"{result_emoji} {game['result'].title()}"
+            "Time": datetime.fromtimestamp(timestamp).strftime("%H:%M:%S"),
+            "You": f"{rules.emojis[user_choice]} {user_choice}",
+            "Computer": f"{rules.emojis[computer_choice]} {computer_choice}",
+            "Result": f"{result_emoji} {RESULTS[result].title()}"
         })
     
     if history_data:
@@ -270,10 +293,48 @@ def display_game_history():
         df = pd.DataFrame(history_data)
         st.dataframe(df, use_container_width=True, hide_index=True)
 
+def display_leaderboard():
+    """Display the all-time leaderboard shared by every player"""
+    st.markdown("### 🌍 Leaderboard")
+    
+    by = st.radio("Rank by:", ["score", "streak"], horizontal=True, key="leaderboard_by",
+                  format_func=lambda by: "📈 Wins minus losses" if by == "score" else "🔥 Best streak")
+    rows = load_top_players(by)
+    if not rows:
+        st.caption("No rounds recorded yet - enter a name to get on the board!")
+        return
+    
+    import pandas as pd
+    df = pd.DataFrame(rows, columns=["Player", "Score", "Wins", "Losses", "Draws", "Best Streak"])
+    df.index = range(1, len(df) + 1)
+    st.dataframe(df, use_container_width=True)
+
 def display_game_controls():
     """Display game control buttons"""
     st.markdown("### ⚙️ Game Controls")
     
+    st.selectbox(
+        "🎲 Variant:",
+        VARIANT_NAMES,
+        key="variant",
+        on_change=reset_scores,
+        help="Switching variants starts the scores over"
+    )
+    
+    st.text_input(
+        "🏷️ Leaderboard Name:",
+        key="player_name",
+        max_chars=30,
+        help="Rounds played under a name count towards the all-time leaderboard"
+    )
+    
+    st.selectbox(
+        "🤖 Computer Opponent:",
+        OPPONENTS,
+        key="opponent",
+        help="Adaptive learns the patterns in your throws and plays to beat them"
+    )
+    
     col1, col2 = st.columns(2)
     
     with col1:
@@ -287,16 +348,7 @@ def display_game_controls():
     with col2:
         if st.button("🗑️ Reset All Scores", use_container_width=True):
             # Reset everything
-            st.session_state.user_score = 0
-            st.session_state.computer_score = 0
-            st.session_state.draws = 0
-            st.session_state.total_games = 0
-            st.session_state.game_history = []
-            st.session_state.streak = 0
-            st.session_state.best_streak = 0
-            st.session_state.last_user_choice = None
-            st.session_state.last_computer_choice = None
-            st.session_state.last_result = None
+            reset_scores()
             st.success("🎯 All scores reset!")
             st.rerun()
 
@@ -305,19 +357,23 @@ def display_game_rules():
     with st.expander("📋 Game Rules & Strategy"):
         st.markdown("""
         ### 🎮 **How to Play:**
-        - Choose Rock 🪨, Paper 📄, or Scissors ✂️
+        - Pick one of the weapons of the chosen variant
         - Computer makes its choice simultaneously
-        - Winner is determined by classic rules:
+        - Every weapon beats exactly half of the others:
+        """)
         
-        ### 🏆 **Winning Rules:**
-        - 🪨 **Rock beats Scissors** (crushes)
-        - 📄 **Paper beats Rock** (covers)
-        - ✂️ **Scissors beats Paper** (cuts)
+        rules = current_rules()
+        st.markdown(f"### 🏆 **Winning Rules ({st.session_state.variant}):**")
+        st.markdown("\n".join(
+            f"- {rules.emojis[name]} **{name}** beats {', '.join(rules.beaten_by(i))}"
+            for i, name in enumerate(rules.names)
+        ))
         
+        st.markdown("""
         ### 🎯 **Strategy Tips:**
         - It's a game of chance - no guaranteed winning strategy!
         - Try to be unpredictable in your choices
-        - Watch for patterns (though computer chooses randomly)
+        - The Adaptive computer learns your patterns - keep mixing it up!
         - Keep track of your win rate and streaks
         
         ### 📊 **Scoring:**
@@ -326,18 +382,23 @@ def display_game_rules():
         - Best Streak: Your longest winning streak
         """)
 
-def display_computer_thinking():
-    """Display computer thinking animation"""
-    if st.session_state.computer_thinking:
-        st.markdown("### 🤖 Computer is thinking...")
-        
-        # Simple thinking animation
-        thinking_placeholder = st.empty()
-        for i in range(3):
-            thinking_placeholder.markdown(f"🤔{'.' * (i + 1)}")
-            time.sleep(0.3)
-        
-        thinking_placeholder.empty()
+def display_computer_thinking(round_number):
+    """Show a thinking face, then reveal the computer's throw and the result
+    
+    Pure CSS, played by the browser: the server has already decided the
+    round. Animation names include the round number so each round plays
+    it once and other reruns leave the reveal alone.
+    """
+    st.markdown(
+        f"<style>"
+        f"@keyframes thinking-{round_number} {{ from {{ opacity: 1; max-height: 2em; }} to {{ opacity: 0; max-height: 0; }} }}"
+        f"@keyframes reveal-{round_number} {{ from {{ opacity: 0; }} to {{ opacity: 1; }} }}"
+        f".thinking-{round_number} {{ overflow: hidden; animation: thinking-{round_number} 0.1s linear {THINKING_SECONDS}s both; }}"
+        f".st-key-computer_reveal_{round_number}, .st-key-round_result_{round_number} "
+        f"{{ animation: reveal-{round_number} 0.2s ease-in {THINKING_SECONDS}s both; }}"
+        f"</style>",
+        unsafe_allow_html=True
+    )
 
 def main():
     """Main application function"""
@@ -357,10 +418,6 @@ def main():
     st.markdown("*Classic game - You vs Computer!*")
     st.markdown("---")
     
-    # Handle computer thinking state
-    if st.session_state.computer_thinking:
-        display_computer_thinking()
-    
     # Main game layout
     col1, col2 = st.columns([3, 2])
     
@@ -388,6 +445,10 @@ def main():
     # Game history
     display_game_history()
     
+    # Leaderboard
+    st.markdown("---")
+    display_leaderboard()
+    
     # Game rules
     st.markdown("---")
     display_game_rules()
@@ -396,19 +457,24 @@ def main():
     with st.sidebar:
         st.markdown("## 🎯 Quick Stats")
         
-        if st.session_state.total_games > 0:
-            st.metric("Games Played", st.session_state.total_games)
+        stats = st.session_state.stats
+        if stats.games > 0:
+            st.metric("Games Played", stats.games)
             
             # Win rate pie chart representation
-            if st.session_state.user_score > 0 or st.session_state.computer_score > 0:
-                user_pct = (st.session_state.user_score / st.session_state.total_games) * 100
-                computer_pct = (st.session_state.computer_score / st.session_state.total_games) * 100
-                draw_pct = (st.session_state.draws / st.session_state.total_games) * 100
-                
+            if stats.wins > 0 or stats.losses > 0:
                 st.markdown("**Performance Breakdown:**")
-                st.progress(user_pct / 100, text=f"Your wins: {user_pct:.1f}%")
-                st.progress(computer_pct / 100, text=f"Computer wins: {computer_pct:.1f}%")
-                st.progress(draw_pct / 100, text=f"Draws: {draw_pct:.1f}%")
+                st.progress(stats.share(WIN), text=f"Your wins: {stats.share(WIN) * 100:.1f}%")
+                st.progress(stats.share(LOSE), text=f"Computer wins: {stats.share(LOSE) * 100:.1f}%")
+                st.progress(stats.share(DRAW), text=f"Draws: {stats.share(DRAW) * 100:.1f}%")
+            
+            st.markdown("**Your Throws:**")
+            rules = current_rules()
+            for choice, share in zip(rules.names, stats.choice_shares()):
+                st.progress(share, text=f"{rules.emojis[choice]} {choice}: {share * 100:.1f}%")
+            
+            if stats.losing_streak > 1:
+                st.caption(f"🥶 Losing streak: {stats.losing_streak}")
         else:
             st.info("Start playing to see stats!")
         
@@ -0,0 +1,283 @@
+import argparse
+import atexit
+import logging
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+from day13_rps_stats import DRAW, LOSE, WIN
+
+# Leaderboard Configuration
+DB_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "day13_rps_leaderboard.db")
+BATCH_SIZE = 500  # buffered rounds that trigger a write
+FLUSH_SECONDS = 2.0  # longest a round waits in the buffer
+MAX_PENDING = 100 * BATCH_SIZE  # buffered rounds kept while the database is failing
+BUSY_TIMEOUT_MS = 10_000  # how long a writer waits for another process's transaction
+TOP_N = 10
+
+log = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rounds (
+    id INTEGER PRIMARY KEY,
+    player TEXT NOT NULL,
+    variant TEXT NOT NULL,
+    user INTEGER NOT NULL,
+    computer INTEGER NOT NULL,
+    result INTEGER NOT NULL,
+    played REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS players (
+    name TEXT PRIMARY KEY,
+    wins INTEGER NOT NULL DEFAULT 0,
+    losses INTEGER NOT NULL DEFAULT 0,
+    draws INTEGER NOT NULL DEFAULT 0,
+    score INTEGER NOT NULL DEFAULT 0,
+    best_streak INTEGER NOT NULL DEFAULT 0,
+    updated REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS players_by_score ON players (score DESC, best_streak DESC);
+CREATE INDEX IF NOT EXISTS players_by_streak ON players (best_streak DESC, score DESC);
+"""
+
+# Totals are added to, never overwritten, so writers in other processes can't lose rounds
+UPSERT_PLAYER = """
+INSERT INTO players (name, wins, losses, draws, score, best_streak, updated)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (name) DO UPDATE SET
+    wins = wins + excluded.wins,
+    losses = losses + excluded.losses,
+    draws = draws + excluded.draws,
+    score = score + excluded.score,
+    best_streak = MAX(best_streak, excluded.best_streak),
+    updated = excluded.updated
+"""
+
+ORDER_BY = {
+    "score": "score DESC, best_streak DESC",
+    "streak": "best_streak DESC, score DESC",
+}
+
+
+def connect(path=DB_FILE):
+    """Connection in WAL mode, so readers never block the writer and vice versa"""
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None,
+                           check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+@contextmanager
+def transaction(conn):
+    """BEGIN IMMEDIATE ... COMMIT: writers queue on the busy timeout instead of failing to upgrade a read lock"""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+        conn.execute("COMMIT")
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+
+
+def top_players(conn, n=TOP_N, by="score"):
+    """Top n players as (name, score, wins, losses, draws, best_streak) rows
+
+    Reads the per-player totals through an index, so it costs the same
+    however many rounds have been recorded.
+    """
+    return conn.execute(
+        f"SELECT name, score, wins, losses, draws, best_streak FROM players "
+        f"ORDER BY {ORDER_BY[by]} LIMIT ?",
+        (n,),
+    ).fetchall()
+
+
+class Leaderboard:
+    """Buffers rounds in memory and writes them in batches from a background thread
+
+    One instance per process is shared by every session in it. record()
+    only appends to the buffer, so a session never waits on the database.
+    The flusher thread writes a batch when BATCH_SIZE rounds are waiting or
+    FLUSH_SECONDS have passed, as a single transaction that appends the
+    rounds and adds each player's totals. Busy events cost one commit per
+    batch instead of one per round, and several processes can write to the
+    same file. A batch that fails to write goes back to the front of the
+    buffer for the next attempt; past MAX_PENDING rounds the oldest are
+    dropped, so a database that stays down can't use up memory.
+    """
+
+    def __init__(self, path=DB_FILE, batch_size=BATCH_SIZE, flush_seconds=FLUSH_SECONDS,
+                 max_pending=MAX_PENDING):
+        self.conn = connect(path)
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.max_pending = max_pending
+        self.pending = []
+        self.dropped = 0  # rounds dropped since the last successful write
+        self.lock = threading.Lock()  # guards pending and dropped
+        self.conn_lock = threading.Lock()  # one thread at a time on the shared connection
+        self.wake = threading.Event()  # a full batch is waiting, or closing
+        self.closed = threading.Event()
+        self.flusher = threading.Thread(target=self.flush_periodically, daemon=True)
+        self.flusher.start()
+        atexit.register(self.close)
+
+    def record(self, player, variant, user, computer, result, streak, played=None):
+        """Queue one round; streak is the player's winning streak after it"""
+        with self.lock:
+            self.pending.append((player, variant, user, computer, result, streak,
+                                 time.time() if played is None else played))
+            self.trim()
+            full = len(self.pending) >= self.batch_size
+        if full:
+            self.wake.set()
+
+    def trim(self):
+        """Drop the oldest rounds past max_pending (caller holds lock)"""
+        excess = len(self.pending) - self.max_pending
+        if excess > 0:
+            del self.pending[:excess]
+            if not self.dropped:
+                log.error("Leaderboard buffer full (%s rounds); dropping the oldest until a write succeeds",
+                          self.max_pending)
+            self.dropped += excess
+
+    def flush(self):
+        """Write everything buffered, putting it back ahead of newer rounds if that fails"""
+        with self.lock:
+            batch, self.pending = self.pending, []
+        if not batch:
+            return
+        try:
+            self.write(batch)
+        except BaseException:
+            with self.lock:
+                self.pending[:0] = batch
+                self.trim()
+            raise
+        with self.lock:
+            if self.dropped:
+                log.warning("Leaderboard writes resumed; %s rounds were dropped", self.dropped)
+                self.dropped = 0
+
+    def flush_periodically(self):
+        """Flusher thread: write on a full batch, every flush_seconds, and once more on close"""
+        while True:
+            self.wake.wait(self.flush_seconds or None)
+            self.wake.clear()
+            closing = self.closed.is_set()
+            try:
+                self.flush()
+            except Exception:
+                log.exception("Leaderboard write failed; retrying in %ss", self.flush_seconds)
+            if closing:
+                return
+
+    def write(self, batch):
+        """Write rounds and the per-player sums in one transaction"""
+        totals = {}
+        for player, _, _, _, result, streak, played in batch:
+            wins, losses, draws, best, _ = totals.get(player, (0, 0, 0, 0, 0))
+            totals[player] = (wins + (result == WIN), losses + (result == LOSE),
+                              draws + (result == DRAW), max(best, streak), played)
+        with self.conn_lock, transaction(self.conn):
+            self.conn.executemany(
+                "INSERT INTO rounds (player, variant, user, computer, result, played) VALUES (?, ?, ?, ?, ?, ?)",
+                [(player, variant, user, computer, result, played)
+                 for player, variant, user, computer, result, _, played in batch],
+            )
+            self.conn.executemany(
+                UPSERT_PLAYER,
+                [(player, wins, losses, draws, wins - losses, best, played)
+                 for player, (wins, losses, draws, best, played) in totals.items()],
+            )
+
+    def top(self, n=TOP_N, by="score"):
+        with self.conn_lock:
+            return top_players(self.conn, n, by)
+
+    def close(self):
+        """Let the flusher write what is left, then close the connection"""
+        if not self.closed.is_set():
+            self.closed.set()
+            self.wake.set()
+            self.flusher.join()
+            self.conn.close()
+
+
+def write_rounds(path, rounds, players, batch_size, seed):
+    """Benchmark worker: record random rounds for random players"""
+    rng = random.Random(seed)
+    board = Leaderboard(path, batch_size, flush_seconds=0)
+    streaks = {}
+    batch = []
+    for _ in range(rounds):
+        player = f"player{rng.randrange(players)}"
+        result = rng.randrange(3)
+        streaks[player] = streaks.get(player, 0) + 1 if result == WIN else 0
+        batch.append((player, "Classic", rng.randrange(3), rng.randrange(3), result, streaks[player],
+                      time.time()))
+        # Write in the worker itself: record() would drop rounds generated faster than the flusher writes
+        if len(batch) >= batch_size:
+            board.write(batch)
+            batch = []
+    if batch:
+        board.write(batch)
+    board.close()
+
+
+def benchmark(args, db):
+    """Time concurrent batched writes into db, then the top-N queries over it"""
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.writers) as pool:
+        futures = [pool.submit(write_rounds, db, args.rounds, args.players, args.batch, seed)
+                   for seed in range(args.writers)]
+        for future in futures:
+            future.result()
+    elapsed = time.perf_counter() - start
+    written = args.writers * args.rounds
+    print(f"✍️ {written:,} rounds from {args.writers} writers in {elapsed:.2f}s "
+          f"({written / elapsed:,.0f} rounds/sec, batches of {args.batch})")
+
+    conn = connect(db)
+    recorded = conn.execute("SELECT COUNT(*) FROM rounds").fetchone()[0]
+    for by in ORDER_BY:
+        start = time.perf_counter()
+        rows = top_players(conn, TOP_N, by)
+        elapsed = time.perf_counter() - start
+        print(f"🏆 top {TOP_N} by {by} over {recorded:,} rounds in {elapsed * 1000:.2f} ms: "
+              f"{rows[0][0]} (score {rows[0][1]}, best streak {rows[0][5]})")
+    conn.close()
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent write and top-N query benchmark for the leaderboard")
+    parser.add_argument("--db", default=None,
+                        help="database to write into (default: a temporary file, deleted afterwards; "
+                             "never the app's leaderboard)")
+    parser.add_argument("--writers", type=int, default=4, help="writer processes")
+    parser.add_argument("--rounds", type=int, default=250_000, help="rounds per writer")
+    parser.add_argument("--players", type=int, default=10_000)
+    parser.add_argument("--batch", type=int, default=BATCH_SIZE, help="rounds per transaction (1 = commit every round)")
+    args = parser.parse_args(argv)
+    if args.db is None:
+        scratch = tempfile.mkdtemp(prefix="rps_leaderboard_bench_")
+        try:
+            return benchmark(args, os.path.join(scratch, "leaderboard.db"))
+        finally:
+            shutil.rmtree(scratch, ignore_errors=True)
+    return benchmark(args, args.db)
+
+if __name__ == "__main__":
+    sys.exit(main())
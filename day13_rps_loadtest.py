@@ -0,0 +1,50 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+from streamlit.testing.v1 import AppTest
+
+from apptest_load import print_load
+
+# Load Test Configuration
+APP_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "day13_rock_paper_scissors.py")
+BUTTON_KEYS = ["rock_btn", "paper_btn", "scissors_btn"]
+DEFAULT_SESSIONS = [1, 4, 16]
+DEFAULT_ROUNDS = 30  # rounds per session
+SCRIPT_TIMEOUT = 60
+
+
+def play_session(app_file, rounds, seed):
+    """Throw a random weapon `rounds` times; returns how long each round took in seconds
+
+    A round is timed from pressing the weapon button to the end of the
+    script run it starts, so the computer's throw, the stats update and
+    the leaderboard queueing all count towards it.
+    """
+    rng = random.Random(seed)
+    at = AppTest.from_file(app_file, default_timeout=SCRIPT_TIMEOUT).run()
+
+    latencies = []
+    for _ in range(rounds):
+        button = at.button(key=rng.choice(BUTTON_KEYS))
+        start = time.perf_counter()
+        button.click().run()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test rock-paper-scissors sessions")
+    parser.add_argument("--app", default=APP_FILE, help="app script to test (e.g. an older revision)")
+    parser.add_argument("--sessions", type=int, nargs="+", default=DEFAULT_SESSIONS)
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS)
+    args = parser.parse_args(argv)
+
+    print_load(play_session, args.app, args.sessions, args.rounds, "rounds")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
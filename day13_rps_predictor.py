@@ -0,0 +1,84 @@
+import random
+from array import array
+
+# Predictor Configuration
+DEFAULT_ORDERS = (0, 1, 2, 3)  # context lengths: 0 is plain frequency, 1 is "after X they play..."
+SCORE_DECAY = 0.9  # how quickly old hits and misses stop counting towards a predictor's weight
+COUNT_LIMIT = 255  # counts are bytes; a full row is halved, which also favours recent play
+
+
+class MarkovPredictor:
+    """Predicts the player's next throw from Markov transition counts
+
+    One count table per context length k holds n^k rows of n byte counts:
+    row c counts what the player threw after the last k throws encoded as c.
+    Every table predicts the most common throw for the current context, and
+    the predictions are mixed by a decayed score of how often each table
+    was right lately. All state is fixed-size, so update() and predict()
+    cost the same after ten rounds or ten million.
+
+    Throws are small ints 0..n-1 where throw (m + 1) % n beats m.
+    """
+
+    def __init__(self, n=3, orders=DEFAULT_ORDERS, decay=SCORE_DECAY, rng=None):
+        self.n = n
+        self.orders = tuple(orders)
+        self.decay = decay
+        self.rng = rng or random.Random()
+        self.offsets = []
+        size = 0
+        for k in self.orders:
+            self.offsets.append(size)
+            size += n ** (k + 1)
+        self.counts = bytearray(size)
+        self.contexts = array("I", [0] * len(self.orders))
+        self.scores = array("d", [0.0] * len(self.orders))
+        self.guesses = array("b", [-1] * len(self.orders))  # each table's guess for the coming throw
+        self.seen = 0  # throws seen, capped at the longest context
+
+    def table_guess(self, i):
+        """Most common next throw in table i for the current context (-1 if unknown)"""
+        if self.seen < self.orders[i]:
+            return -1
+        start = self.offsets[i] + self.contexts[i] * self.n
+        row = self.counts[start:start + self.n]
+        top = max(row)
+        if top == 0:
+            return -1
+        return row.index(top)
+
+    def predict(self):
+        """Most likely next throw by accuracy-weighted vote (None before there's any data)"""
+        votes = [0.0] * self.n
+        for i, guess in enumerate(self.guesses):
+            if guess >= 0:
+                # Small floor so a fresh table still gets a say
+                votes[guess] += self.scores[i] + 0.01
+        top = max(votes)
+        if top == 0:
+            return None
+        return self.rng.choice([move for move, vote in enumerate(votes) if vote == top])
+
+    def counter(self):
+        """Throw that beats the predicted one, random while there is nothing to go on"""
+        predicted = self.predict()
+        if predicted is None:
+            return self.rng.randrange(self.n)
+        return (predicted + 1) % self.n
+
+    def update(self, move):
+        """Record the player's throw: score the guesses, count it and move the contexts on"""
+        n = self.n
+        for i, k in enumerate(self.orders):
+            self.scores[i] = self.scores[i] * self.decay + (self.guesses[i] == move)
+            if self.seen >= k:
+                start = self.offsets[i] + self.contexts[i] * n
+                if self.counts[start + move] == COUNT_LIMIT:
+                    for j in range(start, start + n):
+                        self.counts[j] >>= 1
+                self.counts[start + move] += 1
+            if k:
+                self.contexts[i] = (self.contexts[i] * n + move) % n ** k
+        self.seen = min(self.seen + 1, max(self.orders))
+        for i in range(len(self.orders)):
+            self.guesses[i] = self.table_guess(i)
@@ -0,0 +1,101 @@
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from day13_rps_stats import DRAW, LOSE, RESULTS, WIN
+
+# Variants: weapons in cycle order, each beating the (n - 1) / 2 listed before it
+CLASSIC_WEAPONS = [("Rock", "🪨"), ("Paper", "📄"), ("Scissors", "✂️")]
+LIZARD_SPOCK_WEAPONS = [("Rock", "🪨"), ("Spock", "🖖"), ("Paper", "📄"), ("Lizard", "🦎"), ("Scissors", "✂️")]
+RPS7_WEAPONS = [
+    ("Rock", "🪨"), ("Water", "💧"), ("Air", "🌬️"), ("Paper", "📄"),
+    ("Sponge", "🧽"), ("Scissors", "✂️"), ("Fire", "🔥"),
+]
+
+
+def outcome_matrix(n):
+    """n x n int8 array: outcomes[a, b] is the result code for a played against b
+
+    a beats b when a comes 1 to (n - 1) / 2 places after b round the cycle,
+    so every weapon beats exactly half of the others and (m + 1) % n beats m.
+    """
+    gap = (np.arange(n)[:, None] - np.arange(n)[None, :]) % n
+    outcomes = np.full((n, n), LOSE, dtype=np.int8)
+    outcomes[(gap >= 1) & (gap <= n // 2)] = WIN
+    outcomes[gap == 0] = DRAW
+    return outcomes
+
+
+class Rules:
+    """The weapons of one variant and a precomputed table of who beats whom
+
+    Throws are small ints (positions in the weapon list), so a round is a
+    single lookup and whole arrays of rounds resolve in one NumPy indexing
+    call.
+    """
+
+    def __init__(self, weapons):
+        if len(weapons) < 3 or len(weapons) % 2 == 0:
+            raise ValueError("A fair variant needs an odd number of weapons (3 or more)")
+        self.n = len(weapons)
+        self.names = [name for name, _ in weapons]
+        self.emojis = dict(weapons)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.outcomes = outcome_matrix(self.n)
+
+    def result(self, a, b):
+        """Result code for throw a against throw b"""
+        return int(self.outcomes[a, b])
+
+    def resolve(self, user, computer):
+        """Result codes for arrays of throws, one round per element"""
+        return self.outcomes[user, computer]
+
+    def beaten_by(self, a):
+        """Names of the weapons that throw a beats"""
+        return [self.names[b] for b in np.flatnonzero(self.outcomes[a] == WIN)]
+
+
+def numbered_rules(n):
+    """Variant with n generic weapons, e.g. 101 for RPS-101-sized simulations"""
+    return Rules([(f"Weapon {i + 1}", "🎲") for i in range(n)])
+
+
+def count_results(results):
+    """[wins, losses, draws] for an array of result codes"""
+    return np.bincount(results, minlength=len(RESULTS))
+
+
+VARIANTS = {
+    "Classic": Rules(CLASSIC_WEAPONS),
+    "Lizard Spock": Rules(LIZARD_SPOCK_WEAPONS),
+    "RPS-7": Rules(RPS7_WEAPONS),
+}
+CLASSIC = VARIANTS["Classic"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resolve random rounds in batches: rounds per second")
+    parser.add_argument("--weapons", type=int, default=3)
+    parser.add_argument("--rounds", type=int, default=10_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rules = numbered_rules(args.weapons)
+    rng = np.random.default_rng(args.seed)
+    user = rng.integers(0, rules.n, args.rounds, dtype=np.int16)
+    computer = rng.integers(0, rules.n, args.rounds, dtype=np.int16)
+
+    start = time.perf_counter()
+    totals = count_results(rules.resolve(user, computer))
+    elapsed = time.perf_counter() - start
+    print(f"🎲 {args.rounds:,} rounds of {rules.n}-weapon RPS in {elapsed:.3f}s "
+          f"({args.rounds / elapsed:,.0f} rounds/sec)")
+    print("   " + "  ".join(f"{name}: {count:,}" for name, count in zip(RESULTS, totals)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+from array import array
+
+# Stats Configuration
+HISTORY_CAPACITY = 100  # recent rounds kept; also the rolling win-rate window
+
+# Round results as small ints
+WIN = 0
+LOSE = 1
+DRAW = 2
+RESULTS = ("win", "lose", "draw")
+RESULT_CODES = {name: code for code, name in enumerate(RESULTS)}
+
+
+class RoundHistory:
+    """Fixed-capacity ring buffer of the most recent rounds
+
+    Throws and results are stored as bytes and times as floats in
+    preallocated arrays. Appending overwrites the oldest round in O(1), and
+    the number of wins in the buffer is kept up to date as rounds come and
+    go, so the rolling win rate needs no scan.
+    """
+
+    def __init__(self, capacity=HISTORY_CAPACITY):
+        self.capacity = capacity
+        self.user = bytearray(capacity)
+        self.computer = bytearray(capacity)
+        self.results = bytearray(capacity)
+        self.times = array("d", bytes(8 * capacity))
+        self.next = 0  # slot the next round goes into
+        self.length = 0
+        self.wins = 0
+
+    def __len__(self):
+        return self.length
+
+    def append(self, user, computer, result, timestamp):
+        """Record a round (throw indices, result code, epoch seconds)"""
+        slot = self.next
+        if self.length == self.capacity:
+            self.wins -= self.results[slot] == WIN
+        else:
+            self.length += 1
+        self.user[slot] = user
+        self.computer[slot] = computer
+        self.results[slot] = result
+        self.times[slot] = timestamp
+        self.wins += result == WIN
+        self.next = (slot + 1) % self.capacity
+
+    def recent(self, count=None):
+        """Newest-first (user, computer, result, timestamp) tuples"""
+        count = self.length if count is None else min(count, self.length)
+        for back in range(1, count + 1):
+            slot = (self.next - back) % self.capacity
+            yield self.user[slot], self.computer[slot], self.results[slot], self.times[slot]
+
+    def win_rate(self):
+        """Share of the buffered rounds the player won"""
+        return self.wins / self.length if self.length else 0.0
+
+    def clear(self):
+        self.next = 0
+        self.length = 0
+        self.wins = 0
+
+
+class RoundStats:
+    """Lifetime counters updated in O(1) per round, however many rounds are played"""
+
+    def __init__(self, choices=3):
+        self.totals = [0, 0, 0]  # indexed by result code
+        self.user_choices = [0] * choices
+        self.computer_choices = [0] * choices
+        self.streak = 0  # consecutive wins
+        self.best_streak = 0
+        self.losing_streak = 0
+
+    @property
+    def games(self):
+        return sum(self.totals)
+
+    @property
+    def wins(self):
+        return self.totals[WIN]
+
+    @property
+    def losses(self):
+        return self.totals[LOSE]
+
+    @property
+    def draws(self):
+        return self.totals[DRAW]
+
+    def record(self, user, computer, result):
+        """Count a round (throw indices and result code)"""
+        self.totals[result] += 1
+        self.user_choices[user] += 1
+        self.computer_choices[computer] += 1
+        if result == WIN:
+            self.streak += 1
+            self.losing_streak = 0
+            if self.streak > self.best_streak:
+                self.best_streak = self.streak
+        elif result == LOSE:
+            self.streak = 0
+            self.losing_streak += 1
+
+    def share(self, result):
+        """Fraction of all games with this result code"""
+        games = self.games
+        return self.totals[result] / games if games else 0.0
+
+    def choice_shares(self):
+        """Fraction of the player's throws that went to each choice"""
+        games = self.games
+        return [count / games if games else 0.0 for count in self.user_choices]
@@ -0,0 +1,274 @@
+import argparse
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from day13_rps_rules import VARIANTS, count_results, numbered_rules
+from day13_rps_stats import DRAW, LOSE, WIN
+from round_robin import mirror_results, print_matrices
+
+# Tournament Configuration
+DEFAULT_STRATEGIES = ["random", "constant", "cycle", "beatlast", "wsls", "frequency", "markov:1", "markov:2"]
+DEFAULT_ROUNDS = 1_000_000  # per pair of strategies
+DEFAULT_GAMES = 1000  # matches played side by side, sharing the rounds between them
+MARKOV_TABLE_BYTES = 64 * 2**20  # follow-up counts per Markov player; more contexts than fit share buckets
+
+# The same round from the other player's side
+FLIPPED = np.array([LOSE, WIN, DRAW], dtype=np.int8)
+
+
+class Strategy:
+    """Plays `games` independent matches at once: one throw per match per round
+
+    move() returns an int array of throws, one per match. update() is told
+    this player's throws, the opponent's and the result codes from this
+    player's side.
+    """
+
+    def __init__(self, games, n, rng):
+        self.games = games
+        self.n = n
+        self.rng = rng
+
+    def move(self):
+        return self.rng.integers(0, self.n, self.games)
+
+    def update(self, own, other, results):
+        pass
+
+
+class Constant(Strategy):
+    """Always the first weapon (Rock)"""
+
+    def move(self):
+        return np.zeros(self.games, dtype=np.int64)
+
+
+class Cycle(Strategy):
+    """Steps round the weapons in order from a random start"""
+
+    def __init__(self, games, n, rng):
+        super().__init__(games, n, rng)
+        self.next = rng.integers(0, n, games)
+
+    def move(self):
+        return self.next
+
+    def update(self, own, other, results):
+        self.next = (own + 1) % self.n
+
+
+class BeatLast(Strategy):
+    """Throws whatever beats the opponent's previous throw"""
+
+    def __init__(self, games, n, rng):
+        super().__init__(games, n, rng)
+        self.next = None
+
+    def move(self):
+        return self.rng.integers(0, self.n, self.games) if self.next is None else self.next
+
+    def update(self, own, other, results):
+        self.next = (other + 1) % self.n
+
+
+class WinStayLoseShift(Strategy):
+    """Repeats a winning throw, otherwise moves on to the next weapon"""
+
+    def __init__(self, games, n, rng):
+        super().__init__(games, n, rng)
+        self.next = None
+
+    def move(self):
+        return self.rng.integers(0, self.n, self.games) if self.next is None else self.next
+
+    def update(self, own, other, results):
+        self.next = np.where(results == WIN, own, (own + 1) % self.n)
+
+
+class Markov(Strategy):
+    """Counts what the opponent threw after each run of their last `order` throws
+
+    Predicts the most common follow-up for the current run (ties broken at
+    random) and plays what beats it. Order 0 is a plain frequency counter.
+    A dense table has n ** order rows of n counts per match; when that is
+    over MARKOV_TABLE_BYTES, runs are hashed into as many rows as fit, and
+    runs that share a row share their counts.
+    """
+
+    def __init__(self, games, n, rng, order=1):
+        super().__init__(games, n, rng)
+        if order < 0:
+            raise ValueError("A Markov order can't be negative")
+        if n ** (order + 1) > np.iinfo(np.int64).max:
+            raise ValueError(f"markov:{order} remembers too many throws for {n} weapons")
+        rows_that_fit = MARKOV_TABLE_BYTES // (games * n * np.dtype(np.int32).itemsize)
+        if rows_that_fit < 1:
+            raise ValueError(f"No room for Markov counts over {games} games of {n} weapons; play fewer games")
+        self.order = order
+        self.runs = n ** order
+        self.contexts = min(self.runs, rows_that_fit)
+        self.counts = np.zeros((games, self.contexts, n), dtype=np.int32)
+        self.run = np.zeros(games, dtype=np.int64)  # last `order` throws as a base-n number
+        self.seen = 0
+        self.match = np.arange(games)
+
+    def move(self):
+        if self.seen < self.order:
+            return self.rng.integers(0, self.n, self.games)
+        row = self.counts[self.match, self.run % self.contexts]
+        # Noise below 1 only reorders equal counts
+        predicted = np.argmax(row + self.rng.random(row.shape), axis=1)
+        return (predicted + 1) % self.n
+
+    def update(self, own, other, results):
+        if self.seen >= self.order:
+            self.counts[self.match, self.run % self.contexts, other] += 1
+        self.run = (self.run * self.n + other) % self.runs
+        self.seen += 1
+
+
+class Recorded(Strategy):
+    """Replays a recorded sequence of throws, each match starting at a random point"""
+
+    def __init__(self, games, n, rng, sequence):
+        super().__init__(games, n, rng)
+        self.sequence = sequence
+        self.position = rng.integers(0, len(sequence), games)
+
+    def move(self):
+        return self.sequence[self.position]
+
+    def update(self, own, other, results):
+        self.position = (self.position + 1) % len(self.sequence)
+
+
+def load_sequence(path, rules):
+    """Throws from a text file of weapon names or indices, separated by spaces, commas or newlines"""
+    index = {name.lower(): i for name, i in rules.index.items()}
+    throws = []
+    with open(path, encoding="utf-8") as f:
+        for token in re.split(r"[\s,]+", f.read().strip()):
+            throw = int(token) if token.isdigit() else index.get(token.lower())
+            if throw is None or not 0 <= throw < rules.n:
+                raise ValueError(f"{path}: unknown throw {token!r}")
+            throws.append(throw)
+    if not throws:
+        raise ValueError(f"{path}: no throws recorded")
+    return np.array(throws, dtype=np.int64)
+
+
+def make_strategy(spec, games, rules, rng):
+    """Strategy for `games` simultaneous matches from a name like "markov:2"
+
+    random       uniform random throws
+    constant     always the first weapon
+    cycle        next weapon each round
+    beatlast     beats the opponent's previous throw
+    wsls         win-stay, lose-shift
+    frequency    beats the opponent's most common throw
+    markov:ORDER beats the opponent's most likely throw after their last ORDER throws
+    human:PATH   replays recorded throws from a file
+    """
+    name, _, arg = spec.partition(":")
+    n = rules.n
+    if name == "random":
+        return Strategy(games, n, rng)
+    if name == "constant":
+        return Constant(games, n, rng)
+    if name == "cycle":
+        return Cycle(games, n, rng)
+    if name == "beatlast":
+        return BeatLast(games, n, rng)
+    if name == "wsls":
+        return WinStayLoseShift(games, n, rng)
+    if name == "frequency":
+        return Markov(games, n, rng, order=0)
+    if name == "markov":
+        return Markov(games, n, rng, order=int(arg or 1))
+    if name == "human":
+        return Recorded(games, n, rng, load_sequence(arg, rules))
+    raise ValueError(f"Unknown strategy: {spec}")
+
+
+def get_rules(variant, weapons=None):
+    """A named variant, or a generated one with `weapons` weapons"""
+    return numbered_rules(weapons) if weapons else VARIANTS[variant]
+
+
+def play_match(spec_a, spec_b, rounds, games, variant, weapons, seed):
+    """(wins for a, draws, wins for b) over exactly `rounds` rounds split across `games` matches
+
+    Each match plays rounds // games rounds and the first rounds % games
+    play one more; with fewer rounds than games, each round is its own match.
+    """
+    games = min(games, rounds)
+    full, extra = divmod(rounds, games)
+    rules = get_rules(variant, weapons)
+    rng = np.random.default_rng(seed)
+    a = make_strategy(spec_a, games, rules, rng)
+    b = make_strategy(spec_b, games, rules, rng)
+    totals = np.zeros(3, dtype=np.int64)
+    for round_number in range(full + (extra > 0)):
+        throws_a = a.move()
+        throws_b = b.move()
+        results = rules.resolve(throws_a, throws_b)
+        a.update(throws_a, throws_b, results)
+        b.update(throws_b, throws_a, FLIPPED[results])
+        totals += count_results(results if round_number < full else results[:extra])
+    return int(totals[WIN]), int(totals[DRAW]), int(totals[LOSE])
+
+
+def run_tournament(specs, rounds, games, variant="Classic", weapons=None, workers=None, seed=0):
+    """Round robin between every pair of strategies, one pair per pool task
+
+    Returns {(a, b): (wins, draws, losses)} for a against b in both orders,
+    plus the wall-clock seconds taken.
+    """
+    if rounds < 1 or games < 1:
+        raise ValueError("Need at least one round and one game per pair")
+    pairs = [(a, b) for i, a in enumerate(specs) for b in specs[i + 1:]]
+    start_time = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(play_match, a, b, rounds, games, variant, weapons, seed + i)
+            for i, (a, b) in enumerate(pairs)
+        ]
+        totals = {pair: future.result() for pair, future in zip(pairs, futures)}
+    elapsed = time.perf_counter() - start_time
+
+    return mirror_results(totals), elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Round-robin tournament for rock-paper-scissors strategies")
+    parser.add_argument("--strategies", nargs="+", default=DEFAULT_STRATEGIES,
+                        help="random, constant, cycle, beatlast, wsls, frequency, markov:ORDER, human:PATH")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS, help="rounds per pair")
+    parser.add_argument("--games", type=int, default=DEFAULT_GAMES, help="matches per pair played side by side")
+    parser.add_argument("--variant", choices=list(VARIANTS), default="Classic")
+    parser.add_argument("--weapons", type=int, help="play a generated variant with this many weapons instead")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rules = get_rules(args.variant, args.weapons)
+    for spec in args.strategies:
+        make_strategy(spec, 1, rules, np.random.default_rng())  # fail fast on a typo
+
+    results, elapsed = run_tournament(args.strategies, args.rounds, args.games,
+                                      args.variant, args.weapons, args.workers, args.seed)
+    print_matrices(args.strategies, results)
+
+    total_rounds = sum(sum(counts) for counts in results.values()) // 2
+    print(f"\n⏱️ {total_rounds:,} rounds in {elapsed:.2f}s "
+          f"({total_rounds / elapsed:,.0f} rounds/sec on {args.workers} workers)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
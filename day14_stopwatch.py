@@ -1,112 +1,55 @@
 import streamlit as st
-import time
-from datetime import datetime, timedelta
-import threading
+from datetime import datetime
+from day14_stopwatch_clock import clock_component, wall_clock_component
+from day14_stopwatch_core import NS_PER_SECOND, Stopwatch, format_ns
 
 def initialize_session_state():
     """Initialize session state variables"""
-    if 'start_time' not in st.session_state:
-        st.session_state.start_time = None
-    if 'elapsed_time' not in st.session_state:
-        st.session_state.elapsed_time = 0.0
-    if 'is_running' not in st.session_state:
-        st.session_state.is_running = False
-    if 'lap_times' not in st.session_state:
-        st.session_state.lap_times = []
+    if 'stopwatch' not in st.session_state:
+        # Integer-nanosecond timing core; laps and their stats are kept inside it
+        st.session_state.stopwatch = Stopwatch()
     if 'session_start' not in st.session_state:
         st.session_state.session_start = datetime.now()
+    if 'auto_refresh' not in st.session_state:
+        st.session_state.auto_refresh = True
 
-def format_time(seconds):
-    """Format time in HH:MM:SS.MS format"""
-    if seconds < 0:
-        seconds = 0
-    
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
-    milliseconds = int((seconds % 1) * 100)
-    
-    if hours > 0:
-        return f"{hours:02d}:{minutes:02d}:{secs:02d}.{milliseconds:02d}"
-    else:
-        return f"{minutes:02d}:{secs:02d}.{milliseconds:02d}"
+def format_time(ns):
+    """Format nanoseconds in HH:MM:SS.mmm format"""
+    return format_ns(ns)
 
 def get_current_elapsed_time():
-    """Get current elapsed time"""
-    if st.session_state.is_running and st.session_state.start_time:
-        current_time = time.time()
-        return st.session_state.elapsed_time + (current_time - st.session_state.start_time)
-    else:
-        return st.session_state.elapsed_time
+    """Get current elapsed time in nanoseconds"""
+    return st.session_state.stopwatch.elapsed_ns()
 
 def start_stopwatch():
     """Start the stopwatch"""
-    if not st.session_state.is_running:
-        st.session_state.start_time = time.time()
-        st.session_state.is_running = True
+    st.session_state.stopwatch.start()
 
 def stop_stopwatch():
     """Stop the stopwatch"""
-    if st.session_state.is_running:
-        current_time = time.time()
-        st.session_state.elapsed_time += (current_time - st.session_state.start_time)
-        st.session_state.is_running = False
-        st.session_state.start_time = None
+    st.session_state.stopwatch.pause()
 
 def reset_stopwatch():
     """Reset the stopwatch"""
-    st.session_state.start_time = None
-    st.session_state.elapsed_time = 0.0
-    st.session_state.is_running = False
-    st.session_state.lap_times = []
+    st.session_state.stopwatch.reset()
 
 def add_lap():
     """Add a lap time"""
-    current_elapsed = get_current_elapsed_time()
-    lap_number = len(st.session_state.lap_times) + 1
-    
-    # Calculate split time (time since last lap)
-    if st.session_state.lap_times:
-        split_time = current_elapsed - st.session_state.lap_times[-1]['total_time']
-    else:
-        split_time = current_elapsed
-    
-    lap_data = {
-        'lap_number': lap_number,
-        'total_time': current_elapsed,
-        'split_time': split_time,
-        'timestamp': datetime.now().strftime("%H:%M:%S")
-    }
-    
-    st.session_state.lap_times.append(lap_data)
+    st.session_state.stopwatch.lap()
+
+def lap_rows():
+    """(lap number, split ns, total ns, recorded at) for every lap"""
+    watch = st.session_state.stopwatch
+    for i in range(watch.lap_count):
+        recorded_at = datetime.fromtimestamp(watch.lap_clock[i]).strftime("%H:%M:%S")
+        yield i + 1, watch.split_ns(i), watch.laps[i], recorded_at
 
 def display_main_timer():
-    """Display the main stopwatch timer"""
-    current_time = get_current_elapsed_time()
-    formatted_time = format_time(current_time)
-    
-    # Large timer display
-    st.markdown(
-        f"""
-        <div style='
-            text-align: center;
-            font-size: 4em;
-            font-weight: bold;
-            font-family: monospace;
-            background: linear-gradient(90deg, #FF6B6B, #4ECDC4);
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-            background-clip: text;
-            padding: 20px;
-            margin: 20px 0;
-            border: 2px solid #ddd;
-            border-radius: 15px;
-            box-shadow: 0 4px 8px rgba(0,0,0,0.1);
-        '>
-            ⏱️ {formatted_time}
-        </div>
-        """,
-        unsafe_allow_html=True
+    """Display the main stopwatch timer (it ticks in the browser, not by rerunning)"""
+    clock_component(
+        get_current_elapsed_time() / NS_PER_SECOND,
+        st.session_state.stopwatch.running and st.session_state.auto_refresh,
+        key="main_clock"
     )
 
 def display_control_buttons():
@@ -116,7 +59,7 @@ def display_control_buttons():
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        if st.session_state.is_running:
+        if st.session_state.stopwatch.running:
             if st.button("⏸️ **Stop**", use_container_width=True, type="secondary"):
                 stop_stopwatch()
                 st.rerun()
@@ -131,7 +74,7 @@ def display_control_buttons():
             st.rerun()
     
     with col3:
-        if st.button("📍 **Lap**", use_container_width=True, disabled=not st.session_state.is_running):
+        if st.button("📍 **Lap**", use_container_width=True, disabled=not st.session_state.stopwatch.running):
             add_lap()
             st.rerun()
     
@@ -144,11 +87,11 @@ def display_status():
     status_col1, status_col2, status_col3 = st.columns(3)
     
     with status_col1:
-        status = "🟢 Running" if st.session_state.is_running else "🔴 Stopped"
+        status = "🟢 Running" if st.session_state.stopwatch.running else "🔴 Stopped"
         st.metric("Status", status)
     
     with status_col2:
-        total_laps = len(st.session_state.lap_times)
+        total_laps = st.session_state.stopwatch.lap_count
         st.metric("Total Laps", total_laps)
     
     with status_col3:
@@ -158,7 +101,8 @@ def display_status():
 
 def display_lap_times():
     """Display lap times table"""
-    if not st.session_state.lap_times:
+    watch = st.session_state.stopwatch
+    if not watch.lap_count:
         st.info("📍 No lap times recorded yet. Click 'Lap' while the timer is running to record lap times!")
         return
     
@@ -166,12 +110,12 @@ def display_lap_times():
     
     # Create lap times table
     lap_data = []
-    for lap in st.session_state.lap_times:
+    for lap_number, split_ns, total_ns, recorded_at in lap_rows():
         lap_data.append({
-            "Lap #": lap['lap_number'],
-            "Split Time": format_time(lap['split_time']),
-            "Total Time": format_time(lap['total_time']),
-            "Recorded At": lap['timestamp']
+            "Lap #": lap_number,
+            "Split Time": format_time(split_ns),
+            "Total Time": format_time(total_ns),
+            "Recorded At": recorded_at
         })
     
     # Display as dataframe
@@ -180,22 +124,17 @@ def display_lap_times():
     st.dataframe(df, use_container_width=True, hide_index=True)
     
     # Lap statistics
-    if len(st.session_state.lap_times) > 1:
-        split_times = [lap['split_time'] for lap in st.session_state.lap_times]
-        
+    if watch.lap_count > 1:
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            fastest_lap = min(split_times)
-            st.metric("🏃 Fastest Lap", format_time(fastest_lap))
+            st.metric("🏃 Fastest Lap", format_time(watch.fastest_ns))
         
         with col2:
-            slowest_lap = max(split_times)
-            st.metric("🐌 Slowest Lap", format_time(slowest_lap))
+            st.metric("🐌 Slowest Lap", format_time(watch.slowest_ns))
         
         with col3:
-            avg_lap = sum(split_times) / len(split_times)
-            st.metric("📊 Average Lap", format_time(avg_lap))
+            st.metric("📊 Average Lap", format_time(watch.average_split_ns()))
 
 def display_preset_timers():
     """Display preset timer options"""
@@ -218,7 +157,6 @@ def display_preset_timers():
             if st.button(label, use_container_width=True, key=f"preset_{i}"):
                 # Set the timer to the preset value and start it
                 reset_stopwatch()
-                st.session_state.elapsed_time = 0
                 start_stopwatch()
                 st.rerun()
 
@@ -227,7 +165,7 @@ def display_timer_features():
     with st.expander("⚙️ Timer Features & Tips"):
         st.markdown("""
         ### 🎯 **Stopwatch Features:**
-        - **Precision Timing**: Accurate to centiseconds (1/100th second)
+        - **Precision Timing**: Monotonic nanosecond clock, shown to the millisecond
         - **Lap Recording**: Track split times and total times
         - **Session Tracking**: See how long you've been using the app
         - **Statistics**: Fastest, slowest, and average lap times
@@ -255,7 +193,7 @@ def display_timer_features():
 
 def display_export_options():
     """Display options to export lap times"""
-    if st.session_state.lap_times:
+    if st.session_state.stopwatch.lap_count:
         st.markdown("### 📥 Export Data")
         
         col1, col2 = st.columns(2)
@@ -263,8 +201,8 @@ def display_export_options():
         with col1:
             # Create CSV data
             csv_data = "Lap Number,Split Time,Total Time,Recorded At\n"
-            for lap in st.session_state.lap_times:
-                csv_data += f"{lap['lap_number']},{format_time(lap['split_time'])},{format_time(lap['total_time'])},{lap['timestamp']}\n"
+            for lap_number, split_ns, total_ns, recorded_at in lap_rows():
+                csv_data += f"{lap_number},{format_time(split_ns)},{format_time(total_ns)},{recorded_at}\n"
             
             st.download_button(
                 label="📊 Download CSV",
@@ -279,12 +217,12 @@ def display_export_options():
             summary = f"Stopwatch Session - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
             summary += "="*50 + "\n\n"
             summary += f"Total Time: {format_time(get_current_elapsed_time())}\n"
-            summary += f"Total Laps: {len(st.session_state.lap_times)}\n\n"
+            summary += f"Total Laps: {st.session_state.stopwatch.lap_count}\n\n"
             summary += "Lap Times:\n"
             summary += "-"*30 + "\n"
             
-            for lap in st.session_state.lap_times:
-                summary += f"Lap {lap['lap_number']:2d}: {format_time(lap['split_time'])} (Total: {format_time(lap['total_time'])})\n"
+            for lap_number, split_ns, total_ns, _ in lap_rows():
+                summary += f"Lap {lap_number:2d}: {format_time(split_ns)} (Total: {format_time(total_ns)})\n"
             
             st.download_button(
                 label="📄 Download Summary",
@@ -294,13 +232,6 @@ def display_export_options():
                 use_container_width=True
             )
 
-def auto_refresh():
-    """Auto-refresh the timer display"""
-    if st.session_state.is_running:
-        # Use a placeholder for auto-updating
-        time.sleep(0.01)  # Small delay to prevent too frequent updates
-        st.rerun()
-
 def main():
     """Main application function"""
     # Page configuration
@@ -343,7 +274,7 @@ def main():
         display_preset_timers()
         
         # Export options
-        if st.session_state.lap_times:
+        if st.session_state.stopwatch.lap_count:
             st.markdown("---")
             display_export_options()
     
@@ -356,31 +287,35 @@ def main():
         st.markdown("## ⏰ Timer Info")
         
         # Current time
-        current_elapsed = get_current_elapsed_time()
-        st.metric("⏱️ Current Time", format_time(current_elapsed))
+        st.caption("⏱️ Current Time")
+        clock_component(
+            get_current_elapsed_time() / NS_PER_SECOND,
+            st.session_state.stopwatch.running and st.session_state.auto_refresh,
+            size="small",
+            prefix="",
+            key="sidebar_clock"
+        )
         
         # Real-time clock
-        st.markdown(f"🕐 **Current Time:** {datetime.now().strftime('%H:%M:%S')}")
+        wall_clock_component(prefix="🕐 ")
         
         # Session info
         st.markdown("---")
         st.markdown("### 📊 Session Stats")
         
-        if st.session_state.lap_times:
-            total_splits = sum(lap['split_time'] for lap in st.session_state.lap_times)
-            st.metric("⚡ Total Split Time", format_time(total_splits))
-            
-            if len(st.session_state.lap_times) > 0:
-                avg_split = total_splits / len(st.session_state.lap_times)
-                st.metric("📊 Average Split", format_time(avg_split))
+        watch = st.session_state.stopwatch
+        if watch.lap_count:
+            # Splits add up to the last lap's total exactly (integer nanoseconds)
+            st.metric("⚡ Total Split Time", format_time(watch.laps[-1]))
+            st.metric("📊 Average Split", format_time(watch.average_split_ns()))
         
         # Auto-refresh toggle
         st.markdown("---")
-        auto_refresh_enabled = st.checkbox("🔄 Auto Refresh", value=True)
-        
-        if auto_refresh_enabled and st.session_state.is_running:
-            time.sleep(0.1)
-            st.rerun()
+        st.checkbox(
+            "🔄 Auto Refresh",
+            key="auto_refresh",
+            help="The clock ticks in your browser without reloading the page. Turn off to hold the display until the next click."
+        )
         
         # Quick actions
         st.markdown("---")
@@ -0,0 +1,108 @@
+import streamlit as st
+
+# The clock ticks in the browser: the server sends the elapsed time and
+# whether the stopwatch is running, and the page counts on from there. A
+# running stopwatch costs no reruns at all until someone clicks something.
+
+CLOCK_HTML = '<div class="clock"></div>'
+
+CLOCK_CSS = """
+.clock {
+    text-align: center;
+    font-family: monospace;
+    font-variant-numeric: tabular-nums;
+}
+.clock.large {
+    font-size: 4em;
+    font-weight: bold;
+    background: linear-gradient(90deg, #FF6B6B, #4ECDC4);
+    -webkit-background-clip: text;
+    -webkit-text-fill-color: transparent;
+    background-clip: text;
+    padding: 20px;
+    margin: 20px 0;
+    border: 2px solid #ddd;
+    border-radius: 15px;
+    box-shadow: 0 4px 8px rgba(0,0,0,0.1);
+}
+.clock.small {
+    font-size: 1.5em;
+    text-align: left;
+}
+"""
+
+CLOCK_JS = """
+const pad = (value, width = 2) => String(value).padStart(width, "0");
+
+// Same layout as format_time(): MM:SS.mmm, or HH:MM:SS.mmm from an hour up
+function formatTime(ms) {
+    const millis = Math.floor(Math.max(ms, 0));
+    const hours = Math.floor(millis / 3600000);
+    const minutes = Math.floor(millis / 60000) % 60;
+    const seconds = Math.floor(millis / 1000) % 60;
+    const fraction = `${pad(seconds)}.${pad(millis % 1000, 3)}`;
+    return hours > 0 ? `${pad(hours)}:${pad(minutes)}:${fraction}` : `${pad(minutes)}:${fraction}`;
+}
+
+export default function(component) {
+    const { data, parentElement } = component;
+    const clock = parentElement.querySelector(".clock");
+    clock.className = `clock ${data.size}`;
+
+    // A rerun replaces the previous loop rather than starting a second one
+    cancelAnimationFrame(clock.frame);
+    clearTimeout(clock.timer);
+
+    if (data.wall) {
+        const showWall = () => {
+            clock.textContent = `${data.prefix}${new Date().toLocaleTimeString("en-GB")}`;
+            clock.timer = setTimeout(showWall, 1000 - Date.now() % 1000);
+        };
+        showWall();
+        return;
+    }
+
+    // Count from when this render arrived; the browser pauses frames in hidden tabs
+    const renderedAt = performance.now();
+    const show = () => {
+        const elapsed = data.elapsedMs + (data.running ? performance.now() - renderedAt : 0);
+        clock.textContent = `${data.prefix}${formatTime(elapsed)}`;
+        if (data.running) {
+            clock.frame = requestAnimationFrame(show);
+        }
+    };
+    show();
+}
+"""
+
+_clock_component = st.components.v2.component(
+    "stopwatch_clock",
+    html=CLOCK_HTML,
+    css=CLOCK_CSS,
+    js=CLOCK_JS,
+)
+
+
+def clock_component(elapsed, running, size="large", prefix="⏱️ ", key="clock"):
+    """Show `elapsed` seconds, counting up in the browser while `running`
+
+    size is "large" for the main display or "small" for the sidebar.
+    """
+    _clock_component(
+        key=key,
+        data={
+            "elapsedMs": elapsed * 1000,
+            "running": running,
+            "size": size,
+            "prefix": prefix,
+            "wall": False,
+        },
+    )
+
+
+def wall_clock_component(prefix="🕐 ", key="wall_clock"):
+    """The viewer's local time of day, updated every second in the browser"""
+    _clock_component(
+        key=key,
+        data={"elapsedMs": 0, "running": False, "size": "small", "prefix": prefix, "wall": True},
+    )
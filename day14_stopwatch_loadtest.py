@@ -0,0 +1,147 @@
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+# Load Test Configuration
+APP_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "day14_stopwatch.py")
+DEFAULT_TABS = 50
+DEFAULT_SECONDS = 10.0  # measuring window
+WARMUP_SECONDS = 2.0  # after every tab has started its stopwatch
+STARTUP_TIMEOUT = 120
+START_LABEL = "Start"
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("localhost", 0))
+        return s.getsockname()[1]
+
+
+def start_server(app_file, port):
+    """Run the app under a real Streamlit server; returns the process once it answers"""
+    server = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", app_file,
+         "--server.headless", "true", "--server.port", str(port),
+         "--server.enableXsrfProtection", "false", "--browser.gatherUsageStats", "false"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f"http://localhost:{port}/_stcore/health", timeout=1)
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("Streamlit server did not start")
+
+
+def cpu_seconds(pid):
+    """User + system CPU time of a process so far (Linux /proc)"""
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def rerun_message(widgets=()):
+    msg = BackMsg()
+    msg.rerun_script.page_script_hash = ""
+    for widget_id in widgets:
+        state = msg.rerun_script.widget_states.widgets.add()
+        state.id = widget_id
+        state.trigger_value = True
+    return msg.SerializeToString()
+
+
+async def open_tab(url, counts):
+    """One browser tab: load the page, press Start, then just keep the connection open
+
+    counts["started"] goes up once the Start click has been run, and
+    counts["runs"] counts every script run after that. A real browser
+    sends nothing more while the stopwatch runs either, so anything the
+    server does from then on is its own doing.
+    """
+    async with websockets.connect(url, subprotocols=["streamlit"], max_size=None) as ws:
+        await ws.send(rerun_message())
+        start_id = None
+        while True:
+            msg = ForwardMsg.FromString(await ws.recv())
+            kind = msg.WhichOneof("type")
+            if kind == "delta" and msg.delta.WhichOneof("type") == "new_element":
+                element = msg.delta.new_element
+                if element.WhichOneof("type") == "button" and START_LABEL in element.button.label:
+                    start_id = element.button.id
+            elif kind == "script_finished":
+                break
+        await ws.send(rerun_message([start_id]))
+        while ForwardMsg.FromString(await ws.recv()).WhichOneof("type") != "script_finished":
+            pass
+        counts["started"] += 1
+        while True:
+            if ForwardMsg.FromString(await ws.recv()).WhichOneof("type") == "script_finished":
+                counts["runs"] += 1
+
+
+async def measure(app_file, tabs, seconds):
+    """Server CPU use and script runs per second with `tabs` running stopwatches open"""
+    port = free_port()
+    server = start_server(app_file, port)
+    url = f"ws://localhost:{port}/_stcore/stream"
+    counts = {"started": 0, "runs": 0}
+    clients = [asyncio.create_task(open_tab(url, counts)) for _ in range(tabs)]
+    try:
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while counts["started"] < tabs:
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Only {counts['started']} of {tabs} tabs started")
+            await asyncio.sleep(0.1)
+        await asyncio.sleep(WARMUP_SECONDS)
+        counts["runs"] = 0
+        cpu_start = cpu_seconds(server.pid)
+        start = time.perf_counter()
+        await asyncio.sleep(seconds)
+        elapsed = time.perf_counter() - start
+        cpu = cpu_seconds(server.pid) - cpu_start
+        return {
+            "tabs": tabs,
+            "cpu_percent": cpu / elapsed * 100,
+            "runs_per_sec": counts["runs"] / elapsed,
+        }
+    finally:
+        for client in clients:
+            client.cancel()
+        await asyncio.gather(*clients, return_exceptions=True)
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            # Script threads stuck in a rerun loop can outlive a polite shutdown
+            server.kill()
+            server.wait()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Server CPU for open tabs with a running stopwatch")
+    parser.add_argument("--app", default=APP_FILE, help="app script to test (e.g. an older revision)")
+    parser.add_argument("--tabs", type=int, nargs="+", default=[DEFAULT_TABS])
+    parser.add_argument("--seconds", type=float, default=DEFAULT_SECONDS)
+    args = parser.parse_args(argv)
+
+    print(f"{'tabs':>6} {'server CPU':>11} {'runs/s':>8}")
+    for tabs in args.tabs:
+        r = asyncio.run(measure(args.app, tabs, args.seconds))
+        print(f"{r['tabs']:>6} {r['cpu_percent']:>10.1f}% {r['runs_per_sec']:>8.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
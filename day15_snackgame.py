@@ -1,22 +1,26 @@
 import streamlit as st
-import random
 import time
+from day15_snake_autopilot import CONTROLLERS, StraightController
+from day15_snake_engine import SnakeEngine, ATE, CRASHED, MIN_GRID_SIZE, MAX_GRID_SIZE
+from day15_snake_board import board_component
+from day15_snake_render import GridRenderer
+from day15_snake_replay import Replay, ReplayPlayer
 
 # Game Configuration
 GRID_SIZE = 15
+DEFAULT_TICK_RATE = 2.0  # auto-play ticks per second
 
 def initialize_session_state():
     """Initialize game state"""
     if 'snake' not in st.session_state:
-        # Start snake in center
-        center = GRID_SIZE // 2
-        st.session_state.snake = [(center, center), (center-1, center), (center-2, center)]
+        # Snake body, direction and food live in the engine
+        st.session_state.snake = SnakeEngine(GRID_SIZE)
     
-    if 'direction' not in st.session_state:
-        st.session_state.direction = 'RIGHT'
+    if 'board_size' not in st.session_state:
+        st.session_state.board_size = GRID_SIZE
     
-    if 'food' not in st.session_state:
-        st.session_state.food = generate_food()
+    if 'grid_renderer' not in st.session_state:
+        st.session_state.grid_renderer = GridRenderer()
     
     if 'score' not in st.session_state:
         st.session_state.score = 0
@@ -32,103 +36,168 @@ def initialize_session_state():
     
     if 'auto_play' not in st.session_state:
         st.session_state.auto_play = False
-
-def generate_food():
-    """Generate random food position"""
-    while True:
-        x = random.randint(0, GRID_SIZE-1)
-        y = random.randint(0, GRID_SIZE-1)
-        if (x, y) not in getattr(st.session_state, 'snake', []):
-            return (x, y)
+    
+    if 'last_replay' not in st.session_state:
+        st.session_state.last_replay = None
+    
+    if 'best_replay' not in st.session_state:
+        st.session_state.best_replay = None
+    
+    if 'replay_player' not in st.session_state:
+        st.session_state.replay_player = None
+    if 'uploaded_player' not in st.session_state:
+        st.session_state.uploaded_player = None
+    
+    if 'controller' not in st.session_state:
+        st.session_state.controller = StraightController()
+    
+    if 'tick_rate' not in st.session_state:
+        st.session_state.tick_rate = DEFAULT_TICK_RATE
+    
+    if 'cpu_per_tick_ms' not in st.session_state:
+        # Server CPU (ms) for a board-only tick vs a full script run
+        st.session_state.cpu_per_tick_ms = {"board": None, "full": None}
 
 def move_snake():
     """Move snake and check collisions"""
     if st.session_state.game_over:
         return
     
-    head_x, head_y = st.session_state.snake[0]
-    
-    # Calculate new head position
-    if st.session_state.direction == 'UP':
-        new_head = (head_x, head_y - 1)
-    elif st.session_state.direction == 'DOWN':
-        new_head = (head_x, head_y + 1)
-    elif st.session_state.direction == 'LEFT':
-        new_head = (head_x - 1, head_y)
-    else:  # RIGHT
-        new_head = (head_x + 1, head_y)
-    
-    # Check wall collision
-    if (new_head[0] < 0 or new_head[0] >= GRID_SIZE or 
-        new_head[1] < 0 or new_head[1] >= GRID_SIZE):
-        st.session_state.game_over = True
-        return
+    result = st.session_state.snake.step()
     
-    # Check self collision
-    if new_head in st.session_state.snake:
+    if result == CRASHED:
         st.session_state.game_over = True
-        return
-    
-    # Add new head
-    st.session_state.snake.insert(0, new_head)
-    
-    # Check if food eaten
-    if new_head == st.session_state.food:
+        # Keep the recording (seed + one byte per tick) for the replay viewer
+        replay = Replay.from_engine(st.session_state.snake)
+        st.session_state.last_replay = replay
+        if st.session_state.score > 0 and st.session_state.score >= st.session_state.high_score:
+            st.session_state.best_replay = replay
+    elif result == ATE:
         st.session_state.score += 10
         if st.session_state.score > st.session_state.high_score:
             st.session_state.high_score = st.session_state.score
-        st.session_state.food = generate_food()
-    else:
-        # Remove tail
-        st.session_state.snake.pop()
 
 def change_direction(new_dir):
     """Change direction with validation"""
-    opposites = {'UP': 'DOWN', 'DOWN': 'UP', 'LEFT': 'RIGHT', 'RIGHT': 'LEFT'}
-    
-    if new_dir != opposites.get(st.session_state.direction):
-        st.session_state.direction = new_dir
+    st.session_state.snake.change_direction(new_dir)
         
     if not st.session_state.game_started:
         st.session_state.game_started = True
 
 def restart_game():
-    """Restart the game"""
-    center = GRID_SIZE // 2
-    st.session_state.snake = [(center, center), (center-1, center), (center-2, center)]
-    st.session_state.direction = 'RIGHT'
-    st.session_state.food = generate_food()
+    """Restart the game (on a new board if the size changed)"""
+    if st.session_state.board_size != st.session_state.snake.width:
+        st.session_state.snake = SnakeEngine(st.session_state.board_size)
+    else:
+        st.session_state.snake.reset()
     st.session_state.score = 0
     st.session_state.game_over = False
     st.session_state.game_started = False
     st.session_state.auto_play = False
 
 def create_grid():
-    """Create the game grid using emojis"""
-    grid_html = '<div style="font-family: monospace; line-height: 1.2; font-size: 20px; text-align: center; background-color: #2c3e50; padding: 15px; border-radius: 10px; display: inline-block;">'
+    """Next board frame: only the cells that changed, unless the browser needs the whole board"""
+    return st.session_state.grid_renderer.render(st.session_state.snake)
+
+def on_board_resync():
+    """The browser lost track of the board; send it whole on the rerun this causes"""
+    st.session_state.grid_renderer.resync()
+    st.session_state.board_resync = True
+
+def record_cpu(kind, start):
+    """Fold the CPU used since start into a moving average"""
+    elapsed_ms = (time.thread_time() - start) * 1000
+    previous = st.session_state.cpu_per_tick_ms[kind]
+    if previous is None:
+        st.session_state.cpu_per_tick_ms[kind] = elapsed_ms
+    else:
+        st.session_state.cpu_per_tick_ms[kind] = 0.8 * previous + 0.2 * elapsed_ms
+
+def is_auto_playing():
+    """Check whether the board should tick on its own"""
+    return (st.session_state.auto_play and 
+            st.session_state.game_started and 
+            not st.session_state.game_over)
+
+def game_board():
+    """Draw the board; on timer reruns also advance the snake one tick"""
+    cpu_start = time.thread_time()
     
-    for y in range(GRID_SIZE):
-        row_html = '<div>'
-        for x in range(GRID_SIZE):
-            if (x, y) == st.session_state.snake[0]:
-                # Snake head
-                row_html += '<span style="color: #e74c3c;">🟥</span>'
-            elif (x, y) in st.session_state.snake:
-                # Snake body
-                row_html += '<span style="color: #2ecc71;">🟩</span>'
-            elif (x, y) == st.session_state.food:
-                # Food
-                row_html += '<span style="color: #f39c12;">🟨</span>'
-            else:
-                # Empty space
-                row_html += '<span style="color: #95a5a6;">⬜</span>'
-        row_html += '</div>'
-        grid_html += row_html
+    # main() sets this flag, so its absence means the browser timer fired
+    # (or the board asked for a resync, which must not move the snake)
+    drawn_by_app = st.session_state.pop('board_drawn_by_app', False)
+    resync = st.session_state.pop('board_resync', False)
+    ticked = not drawn_by_app and not resync
+    if ticked and is_auto_playing():
+        score_before = st.session_state.score
+        change_direction(st.session_state.controller.choose(st.session_state.snake))
+        move_snake()
+        # Score and game-over live outside the board, so refresh the whole page
+        if st.session_state.game_over or st.session_state.score != score_before:
+            st.rerun()
     
-    grid_html += '</div>'
-    return grid_html
+    board_component(create_grid(), on_resync=on_board_resync)
+    
+    if ticked:
+        record_cpu("board", cpu_start)
+
+def display_replay_viewer():
+    """Scrub through recorded games"""
+    with st.expander("🎞️ Replay Viewer"):
+        replays = {}
+        if st.session_state.best_replay is not None:
+            replays["🏆 High-score run"] = st.session_state.best_replay
+        if st.session_state.last_replay is not None:
+            replays["🕹️ Last game"] = st.session_state.last_replay
+        
+        uploaded = st.file_uploader("Load a replay file", type=["snake"])
+        if uploaded is not None:
+            upload = uploaded.getvalue()
+            try:
+                # Building the player plays the game through, which also rejects a bad board size or move
+                player = st.session_state.uploaded_player
+                if player is None or player.replay.to_bytes() != upload:
+                    player = ReplayPlayer(Replay.from_bytes(upload))
+                    st.session_state.uploaded_player = player
+                replays["📂 Uploaded"] = player.replay
+            except ValueError as error:
+                st.error(f"Could not read replay: {error}")
+        
+        if not replays:
+            st.info("Finish a game to record a replay!")
+            return
+        
+        replay = replays[st.selectbox("Replay", list(replays))]
+        data = replay.to_bytes()
+        
+        # Playing the replay once builds the keyframes; reuse them while scrubbing
+        player = st.session_state.replay_player
+        if player is None or player.replay.to_bytes() != data:
+            uploaded_player = st.session_state.uploaded_player
+            if uploaded_player is not None and uploaded_player.replay.to_bytes() == data:
+                player = uploaded_player
+            else:
+                player = ReplayPlayer(replay)
+            st.session_state.replay_player = player
+        
+        tick = player.ticks
+        if player.ticks > 0:
+            tick = st.slider("Tick", 0, player.ticks, player.ticks)
+        engine = player.seek(tick)
+        # A fresh renderer always sends the whole board
+        board_component(GridRenderer().render(engine), key="replay_board")
+        st.caption(f"Tick {tick}/{player.ticks} · Length {len(engine)} · Replay size {len(data)} bytes")
+        
+        st.download_button(
+            label="💾 Download Replay",
+            data=data,
+            file_name=f"snake_{replay.seed}.snake",
+            mime="application/octet-stream"
+        )
 
 def main():
+    cpu_start = time.thread_time()
+    
     st.set_page_config(page_title="Snake Game", page_icon="🐍", layout="wide")
     
     initialize_session_state()
@@ -159,9 +228,10 @@ def main():
     with game_col:
         st.markdown("### 🎮 Game Board")
         
-        # Display the grid
-        grid_html = create_grid()
-        st.markdown(grid_html, unsafe_allow_html=True)
+        # Display the grid; while auto-playing the browser reruns only this fragment
+        st.session_state.board_drawn_by_app = True
+        run_every = 1 / st.session_state.tick_rate if is_auto_playing() else None
+        st.fragment(game_board, run_every=run_every)()
         
         if st.session_state.game_over:
             st.error("💀 **GAME OVER!** Snake crashed!")
@@ -219,41 +289,61 @@ def main():
                 restart_game()
                 st.rerun()
         
+        st.number_input(
+            "📐 Board Size (applies on New Game)",
+            min_value=MIN_GRID_SIZE,
+            max_value=MAX_GRID_SIZE,
+            key="board_size"
+        )
+        
         # Auto play toggle
         auto_play = st.checkbox("🤖 Auto Play")
         if auto_play != st.session_state.auto_play:
             st.session_state.auto_play = auto_play
+            st.rerun()
+        
+        st.slider("⏱️ Ticks per second", 0.5, 10.0, step=0.5, key="tick_rate")
+        
+        controller_names = list(CONTROLLERS)
+        controller_name = st.selectbox(
+            "🧭 Auto Play Controller",
+            controller_names,
+            index=controller_names.index(st.session_state.controller.name)
+        )
+        if controller_name != st.session_state.controller.name:
+            st.session_state.controller = CONTROLLERS[controller_name]()
         
         st.markdown("---")
         
         st.markdown("### 📊 Game Status")
-        st.write(f"**Direction:** {st.session_state.direction}")
-        st.write(f"**Snake Head:** {st.session_state.snake[0]}")
-        st.write(f"**Food:** {st.session_state.food}")
+        st.write(f"**Direction:** {st.session_state.snake.direction}")
+        st.write(f"**Snake Head:** {st.session_state.snake.head}")
+        st.write(f"**Food:** {st.session_state.snake.food}")
+        
+        board_cpu = st.session_state.cpu_per_tick_ms["board"]
+        full_cpu = st.session_state.cpu_per_tick_ms["full"]
+        if board_cpu is not None and full_cpu is not None:
+            st.caption(f"⚙️ Server CPU per tick: {board_cpu:.2f} ms (board only) vs {full_cpu:.2f} ms (full rerun)")
     
-    # Auto play functionality
-    if (st.session_state.auto_play and 
-        st.session_state.game_started and 
-        not st.session_state.game_over):
-        time.sleep(0.5)
-        move_snake()
-        st.rerun()
+    # Replays
+    st.markdown("---")
+    display_replay_viewer()
     
     # Instructions
-    st.markdown("---")
     with st.expander("📋 How to Play"):
         st.markdown("""
         ### 🎯 **How to Play:**
         1. **Start**: Click any arrow button to start the game
         2. **Move**: Use arrow buttons to change direction
-        3. **Eat**: Guide the snake (🟥🟩) to the food (🟨)
+        3. **Eat**: Guide the snake (red head, green body) to the orange food
         4. **Grow**: Each food eaten increases length and score
         5. **Avoid**: Don't hit walls or yourself!
         
         ### 🎮 **Controls:**
         - **Arrow Buttons**: Change direction and move
         - **Move Button**: Advance one step manually
-        - **Auto Play**: Enable for continuous movement
+        - **Auto Play**: Enable for continuous movement at the chosen tick rate
+        - **Controller**: *Straight* keeps the current heading, *Pathfinder* steers to the food
         - **New Game**: Restart when game over
         
         ### 🏆 **Scoring:**
@@ -261,11 +351,13 @@ def main():
         - Try to beat your high score!
         
         ### 📱 **Legend:**
-        - 🟥 = Snake Head
-        - 🟩 = Snake Body  
-        - 🟨 = Food
-        - ⬜ = Empty Space
+        - 🟥 Red = Snake Head
+        - 🟩 Green = Snake Body
+        - 🟧 Orange = Food
+        - Grey = Empty Space (on the dark board)
         """)
+    
+    record_cpu("full", cpu_start)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,449 @@
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from collections import deque
+
+from day15_snake_engine import DIRECTIONS, OPPOSITES
+
+# Arena Configuration
+ARENA_SIZE = 64
+TICK_RATE = 10  # ticks per second
+FOOD_PER_PLAYER = 0.5
+MIN_FOOD = 3
+START_LENGTH = 3
+MAX_CLIENT_BUFFER = 256 * 1024  # drop clients that fall this far behind
+
+# Cell states
+FREE = 0
+BODY = 1
+FOOD = 2
+
+
+class ArenaSnake:
+    """One player's snake; body holds cell indices with the head on the left"""
+
+    __slots__ = ("id", "name", "body", "direction", "pending", "alive", "score")
+
+    def __init__(self, snake_id, name):
+        self.id = snake_id
+        self.name = name
+        self.body = deque()
+        self.direction = 'RIGHT'
+        self.pending = None
+        self.alive = False
+        self.score = 0
+
+
+class Arena:
+    """Shared board where many snakes move on one fixed tick
+
+    Joins, leaves and turns are queued and applied inside tick(), which
+    returns the delta for that tick: new heads, freed tails, deaths, food
+    changes and spawns. A client that applies every delta to the last
+    snapshot has the same board as the server.
+    """
+
+    def __init__(self, width=ARENA_SIZE, height=None, seed=None):
+        self.width = width
+        self.height = height if height is not None else width
+        self.area = self.width * self.height
+        self.rng = random.Random(seed)
+        self.cells = bytearray(self.area)
+        self.snakes = {}
+        self.food = set()
+        self.tick_count = 0
+        self.next_id = 1
+        self.to_spawn = deque()
+        self.to_remove = []
+
+    def add_player(self, name):
+        """Register a player; the snake appears on the next tick"""
+        snake = ArenaSnake(self.next_id, name)
+        self.next_id += 1
+        self.snakes[snake.id] = snake
+        self.to_spawn.append(snake.id)
+        return snake
+
+    def remove_player(self, snake_id):
+        """Queue a player to leave on the next tick"""
+        self.to_remove.append(snake_id)
+
+    def respawn(self, snake_id):
+        """Queue a dead player to come back on the next tick"""
+        snake = self.snakes.get(snake_id)
+        if snake is not None and not snake.alive and snake_id not in self.to_spawn:
+            self.to_spawn.append(snake_id)
+
+    def turn(self, snake_id, direction):
+        """Set the direction a snake takes on the next tick"""
+        snake = self.snakes.get(snake_id)
+        if snake is not None and isinstance(direction, str) and direction in DIRECTIONS:
+            snake.pending = direction
+
+    def _spawn(self, snake, delta):
+        # Look for START_LENGTH free cells in a row with room ahead
+        for _ in range(50):
+            x = self.rng.randrange(START_LENGTH - 1, self.width - 2)
+            y = self.rng.randrange(self.height)
+            cells = [y * self.width + x + 2 - i for i in range(START_LENGTH + 2)]
+            if all(self.cells[c] == FREE for c in cells):
+                snake.body = deque(cells[2:])
+                for c in snake.body:
+                    self.cells[c] = BODY
+                snake.direction = 'RIGHT'
+                snake.pending = None
+                snake.alive = True
+                snake.score = 0
+                delta["spawned"].append([snake.id, snake.name, list(snake.body)])
+                return True
+        return False
+
+    def _kill(self, snake, delta):
+        for c in snake.body:
+            self.cells[c] = FREE
+        snake.body.clear()
+        snake.alive = False
+        delta["dead"].append(snake.id)
+
+    def _place_food(self, delta):
+        target = max(MIN_FOOD, int(len(self.snakes) * FOOD_PER_PLAYER))
+        attempts = 0
+        while len(self.food) < target and attempts < 100:
+            attempts += 1
+            c = self.rng.randrange(self.area)
+            if self.cells[c] == FREE:
+                self.cells[c] = FOOD
+                self.food.add(c)
+                delta["food_added"].append(c)
+
+    def tick(self):
+        """Advance every snake one step and return the delta"""
+        self.tick_count += 1
+        delta = {
+            "tick": self.tick_count,
+            "heads": [],
+            "tails": [],
+            "dead": [],
+            "left": [],
+            "spawned": [],
+            "food_added": [],
+            "food_removed": [],
+        }
+
+        for snake_id in self.to_remove:
+            snake = self.snakes.pop(snake_id, None)
+            if snake is not None:
+                if snake.alive:
+                    self._kill(snake, delta)
+                delta["left"].append(snake_id)
+        self.to_remove = []
+
+        # Work out every move first so all snakes step simultaneously; the
+        # dead keep their cells until every head is resolved, so who survives
+        # doesn't depend on the order snakes are looked at
+        moves = []
+        targets = {}
+        dead = []
+        for snake in self.snakes.values():
+            if not snake.alive:
+                continue
+            if snake.pending and snake.pending != OPPOSITES[snake.direction]:
+                snake.direction = snake.pending
+            snake.pending = None
+            dx, dy = DIRECTIONS[snake.direction]
+            head = snake.body[0]
+            x, y = head % self.width + dx, head // self.width + dy
+            if not (0 <= x < self.width and 0 <= y < self.height):
+                dead.append(snake)
+                continue
+            target = y * self.width + x
+            moves.append((snake, target, self.cells[target] == FOOD))
+            targets[target] = targets.get(target, 0) + 1
+
+        # Tails leave before heads arrive, unless that snake is eating
+        for snake, target, eats in moves:
+            if not eats:
+                tail = snake.body.pop()
+                self.cells[tail] = FREE
+                delta["tails"].append(tail)
+
+        for snake, target, eats in moves:
+            if targets[target] > 1 or self.cells[target] == BODY:
+                dead.append(snake)
+                continue
+            if eats:
+                self.food.discard(target)
+                delta["food_removed"].append(target)
+                snake.score += 10
+            snake.body.appendleft(target)
+            self.cells[target] = BODY
+            delta["heads"].append([snake.id, target])
+        for snake in dead:
+            self._kill(snake, delta)
+
+        pending = len(self.to_spawn)
+        for _ in range(pending):
+            snake = self.snakes.get(self.to_spawn.popleft())
+            if snake is not None and not snake.alive and not self._spawn(snake, delta):
+                self.to_spawn.append(snake.id)
+
+        self._place_food(delta)
+        return delta
+
+    def snapshot(self):
+        """Full state for a client that has just connected"""
+        return {
+            "tick": self.tick_count,
+            "width": self.width,
+            "height": self.height,
+            "snakes": [[s.id, s.name, list(s.body)] for s in self.snakes.values() if s.alive],
+            "food": sorted(self.food),
+        }
+
+
+class ArenaView:
+    """Client-side mirror built from a snapshot plus per-tick deltas"""
+
+    def __init__(self, snapshot):
+        self.tick = snapshot["tick"]
+        self.width = snapshot["width"]
+        self.height = snapshot["height"]
+        self.snakes = {snake_id: deque(body) for snake_id, _, body in snapshot["snakes"]}
+        self.names = {snake_id: name for snake_id, name, _ in snapshot["snakes"]}
+        self.food = set(snapshot["food"])
+
+    def apply(self, delta):
+        """Update the mirror with one tick's delta"""
+        self.tick = delta["tick"]
+        for snake_id in delta["left"] + delta["dead"]:
+            self.snakes.pop(snake_id, None)
+        freed = set(delta["tails"])
+        for body in self.snakes.values():
+            if body and body[-1] in freed:
+                body.pop()
+        for snake_id, head in delta["heads"]:
+            if snake_id in self.snakes:
+                self.snakes[snake_id].appendleft(head)
+        for snake_id, name, body in delta["spawned"]:
+            self.snakes[snake_id] = deque(body)
+            self.names[snake_id] = name
+        self.food.difference_update(delta["food_removed"])
+        self.food.update(delta["food_added"])
+
+    def matches(self, snapshot):
+        """Check the mirror agrees with a server snapshot"""
+        server = {snake_id: list(body) for snake_id, _, body in snapshot["snakes"]}
+        mine = {snake_id: list(body) for snake_id, body in self.snakes.items()}
+        return server == mine and set(snapshot["food"]) == self.food
+
+
+def encode(message):
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode()
+
+
+class ArenaServer:
+    """asyncio TCP server speaking newline-delimited JSON
+
+    Clients send {"type": "join", "name": ...}, then {"type": "turn",
+    "direction": ...} or {"type": "respawn"}. They get one welcome message
+    with their id and a snapshot, then one delta line per tick. Each delta is
+    encoded once and the same bytes are written to every client.
+    """
+
+    def __init__(self, arena, tick_rate=TICK_RATE, record_ticks=False):
+        self.arena = arena
+        self.tick_rate = tick_rate
+        self.clients = {}
+        self.handlers = set()
+        # Per-tick timings for simulate(); a long-running server keeps none
+        self.tick_seconds = [] if record_ticks else None
+        self.server = None
+        self.loop_task = None
+
+    async def start(self, host="127.0.0.1", port=0):
+        self.server = await asyncio.start_server(self.handle_client, host, port)
+        self.loop_task = asyncio.create_task(self.game_loop())
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.loop_task.cancel()
+        self.server.close()
+        for writer in list(self.clients.values()):
+            writer.close()
+        # Let connection handlers see EOF and finish instead of being cancelled
+        if self.handlers:
+            await asyncio.wait(self.handlers, timeout=2)
+        await self.server.wait_closed()
+
+    async def handle_client(self, reader, writer):
+        snake_id = None
+        self.handlers.add(asyncio.current_task())
+        try:
+            hello = json.loads(await reader.readline() or b"{}")
+            if not isinstance(hello, dict) or hello.get("type") != "join":
+                return
+            snake = self.arena.add_player(str(hello.get("name", "player"))[:20])
+            snake_id = snake.id
+            writer.write(encode({"type": "welcome", "id": snake_id, "snapshot": self.arena.snapshot()}))
+            self.clients[snake_id] = writer
+
+            while line := await reader.readline():
+                message = json.loads(line)
+                if not isinstance(message, dict):
+                    continue  # valid JSON but not a message object
+                if message.get("type") == "turn":
+                    self.arena.turn(snake_id, message.get("direction"))
+                elif message.get("type") == "respawn":
+                    self.arena.respawn(snake_id)
+        except (ConnectionError, ValueError):
+            pass  # also bad JSON, non-UTF-8 bytes and lines over the stream limit
+        finally:
+            if snake_id is not None:
+                self.clients.pop(snake_id, None)
+                self.arena.remove_player(snake_id)
+            writer.close()
+            self.handlers.discard(asyncio.current_task())
+
+    def broadcast(self, data):
+        for snake_id, writer in list(self.clients.items()):
+            if writer.transport.get_write_buffer_size() > MAX_CLIENT_BUFFER:
+                # Slow client: drop it rather than buffer without bound
+                self.clients.pop(snake_id)
+                writer.close()
+                continue
+            writer.write(data)
+
+    async def game_loop(self):
+        loop = asyncio.get_running_loop()
+        interval = 1 / self.tick_rate
+        next_tick = loop.time()
+        while True:
+            next_tick += interval
+            start = time.perf_counter()
+            self.broadcast(encode(self.arena.tick()))
+            if self.tick_seconds is not None:
+                self.tick_seconds.append(time.perf_counter() - start)
+            # Fixed schedule: a slow tick shortens the next sleep instead of drifting
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+
+
+async def simulated_client(port, name, duration, turn_chance, rng, results):
+    """Bot that joins, turns at random, mirrors the board and counts bytes"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(encode({"type": "join", "name": name}))
+    welcome = json.loads(await reader.readline())
+    view = ArenaView(welcome["snapshot"])
+    my_id = welcome["id"]
+    received = 0
+    deltas = 0
+    deadline = time.perf_counter() + duration
+    try:
+        while time.perf_counter() < deadline:
+            line = await reader.readline()
+            if not line:
+                break
+            received += len(line)
+            deltas += 1
+            view.apply(json.loads(line))
+            if my_id not in view.snakes and deltas > 1:
+                writer.write(encode({"type": "respawn"}))
+            elif rng.random() < turn_chance:
+                writer.write(encode({"type": "turn", "direction": rng.choice(list(DIRECTIONS))}))
+    finally:
+        results.append({"bytes": received, "deltas": deltas, "view": view})
+        writer.close()
+
+
+async def observer_client(port, state):
+    """Passive client that keeps a mirror up to date until cancelled"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(encode({"type": "join", "name": "observer"}))
+    state["view"] = ArenaView(json.loads(await reader.readline())["snapshot"])
+    try:
+        while line := await reader.readline():
+            state["view"].apply(json.loads(line))
+    finally:
+        writer.close()
+
+
+async def simulate(clients=200, seconds=10.0, size=ARENA_SIZE, tick_rate=TICK_RATE, seed=None):
+    """Run a server and simulated clients in one event loop and report timings"""
+    arena = Arena(size, seed=seed)
+    server = ArenaServer(arena, tick_rate, record_ticks=True)
+    port = await server.start()
+    rng = random.Random(seed)
+    results = []
+    observer = {}
+    observer_task = asyncio.create_task(observer_client(port, observer))
+    await asyncio.gather(*(
+        simulated_client(port, f"bot{i}", seconds, 0.1, random.Random(rng.random()), results)
+        for i in range(clients)
+    ))
+
+    # Freeze the board, let the observer catch up, then compare it with the server
+    server.loop_task.cancel()
+    for _ in range(200):
+        if observer["view"].tick == arena.tick_count:
+            break
+        await asyncio.sleep(0.01)
+    consistent = observer["view"].matches(arena.snapshot())
+    observer_task.cancel()
+    await server.stop()
+
+    ticks = server.tick_seconds
+    total_deltas = sum(r["deltas"] for r in results) or 1
+    return {
+        "clients": clients,
+        "ticks": len(ticks),
+        "expected_ticks": int(seconds * tick_rate),
+        "tick_ms_p50": statistics.median(ticks) * 1000,
+        "tick_ms_p99": sorted(ticks)[int(len(ticks) * 0.99) - 1] * 1000 if ticks else 0.0,
+        "tick_ms_max": max(ticks) * 1000 if ticks else 0.0,
+        "bytes_per_delta": sum(r["bytes"] for r in results) / total_deltas,
+        "mirror_consistent": consistent,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Multiplayer snake arena over asyncio")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve = sub.add_parser("serve", help="run the arena server")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--size", type=int, default=ARENA_SIZE)
+    serve.add_argument("--tick-rate", type=float, default=TICK_RATE)
+
+    sim = sub.add_parser("simulate", help="load-test locally with simulated clients")
+    sim.add_argument("--clients", type=int, default=200)
+    sim.add_argument("--seconds", type=float, default=10.0)
+    sim.add_argument("--size", type=int, default=ARENA_SIZE)
+    sim.add_argument("--tick-rate", type=float, default=TICK_RATE)
+    sim.add_argument("--seed", type=int, default=None)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        async def serve_forever():
+            server = ArenaServer(Arena(args.size), args.tick_rate)
+            port = await server.start(args.host, args.port)
+            print(f"🐍 Arena {args.size}x{args.size} on {args.host}:{port} at {args.tick_rate} ticks/s")
+            await server.server.serve_forever()
+
+        asyncio.run(serve_forever())
+        return
+
+    report = asyncio.run(simulate(args.clients, args.seconds, args.size, args.tick_rate, args.seed))
+    print(f"🐍 {report['clients']} simulated clients, {report['ticks']}/{report['expected_ticks']} ticks")
+    print(f"   Server tick (update + encode + broadcast): p50 {report['tick_ms_p50']:.2f} ms, "
+          f"p99 {report['tick_ms_p99']:.2f} ms, max {report['tick_ms_max']:.2f} ms")
+    print(f"   {report['bytes_per_delta']:.0f} bytes per client per tick")
+    print(f"   Client mirror matches server: {'✅' if report['mirror_consistent'] else '❌'}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,399 @@
+import heapq
+import random
+from collections import deque
+
+from day15_snake_engine import DIRECTIONS, OPPOSITES
+
+# Autopilot Configuration
+HAMILTONIAN_MIN_AREA = 400  # boards at least this big fall back to the cycle
+SEARCH_LIMIT = 1024  # cells one search may visit, so a decision costs the same on any board
+CIRCLING_AREAS = 1  # ticks without food, in board areas, before the tail chase turns random
+STALEMATE_AREAS = 200  # ... and before the food is taken even when the tail check fails
+
+DELTA_TO_DIRECTION = {delta: name for name, delta in DIRECTIONS.items()}
+
+_neighbour_tables = {}
+_cycle_indexes = {}
+
+
+def neighbour_table(width, height):
+    """Cached cell -> in-bounds neighbours map for a board size"""
+    key = (width, height)
+    if key not in _neighbour_tables:
+        table = {}
+        for y in range(height):
+            for x in range(width):
+                table[(x, y)] = [
+                    (x + dx, y + dy)
+                    for dx, dy in DIRECTIONS.values()
+                    if 0 <= x + dx < width and 0 <= y + dy < height
+                ]
+        _neighbour_tables[key] = table
+    return _neighbour_tables[key]
+
+
+def manhattan(cell, target):
+    """Grid distance between two cells (0 when there is no target)"""
+    if target is None:
+        return 0
+    return abs(target[0] - cell[0]) + abs(target[1] - cell[1])
+
+
+def search_limit(engine):
+    """Cells a search may visit: SEARCH_LIMIT, or room for the snake twice over"""
+    return max(SEARCH_LIMIT, 2 * len(engine))
+
+
+def direction_between(cell, target):
+    """Direction name for a move between adjacent cells"""
+    return DELTA_TO_DIRECTION[(target[0] - cell[0], target[1] - cell[1])]
+
+
+def distance_field(source, blocked, neighbours, limit=None):
+    """BFS distances from source over cells not in blocked (stops at `limit` cells)"""
+    distances = {source: 0}
+    frontier = deque([source])
+    while frontier:
+        cell = frontier.popleft()
+        next_distance = distances[cell] + 1
+        for neighbour in neighbours[cell]:
+            if neighbour not in distances and neighbour not in blocked:
+                distances[neighbour] = next_distance
+                if len(distances) == limit:
+                    return distances
+                frontier.append(neighbour)
+    return distances
+
+
+def shortest_path(start, goal, blocked, neighbours, limit=None):
+    """Cells from start (exclusive) to goal, and whether they get there
+
+    A search cut short at `limit` cells returns the way to the cell it
+    found nearest the goal instead; one that runs out of cells returns None.
+    """
+    parents = {start: None}
+    frontier = deque([start])
+    nearest = start
+    while frontier:
+        cell = frontier.popleft()
+        for neighbour in neighbours[cell]:
+            if neighbour in parents:
+                continue
+            if neighbour == goal:
+                parents[goal] = cell
+                return trace_path(parents, goal), True
+            if neighbour not in blocked:
+                parents[neighbour] = cell
+                if manhattan(neighbour, goal) < manhattan(nearest, goal):
+                    nearest = neighbour
+                if len(parents) == limit:
+                    return trace_path(parents, nearest), False
+                frontier.append(neighbour)
+    return None, False
+
+
+def trace_path(parents, cell):
+    """Follow BFS parent links back from cell; the start itself is left out"""
+    path = []
+    while parents[cell] is not None:
+        path.append(cell)
+        cell = parents[cell]
+    return path[::-1]
+
+
+def is_reachable(start, goal, blocked, neighbours, limit=None):
+    """Whether goal can be reached from start through cells not in blocked
+
+    Searches from both ends at once, each trying the cells nearest the
+    other end first. A reachable goal turns up within a few steps across
+    open board, and an unreachable one costs only the smaller region. A
+    search that visits `limit` cells without an answer says no, so
+    callers only ever err on the safe side.
+    """
+    if start == goal:
+        return True
+    ends = (start, goal)
+    seen = ({start}, {goal})
+    frontiers = ([(0, start)], [(0, goal)])
+    visited = 2
+    while limit is None or visited < limit:
+        for side in (0, 1):
+            if not frontiers[side]:
+                return False
+            own, other, target = seen[side], seen[1 - side], ends[1 - side]
+            for neighbour in neighbours[heapq.heappop(frontiers[side])[1]]:
+                if neighbour in other:
+                    return True
+                if neighbour not in own and neighbour not in blocked:
+                    own.add(neighbour)
+                    visited += 1
+                    heapq.heappush(frontiers[side], (manhattan(neighbour, target), neighbour))
+    return False
+
+
+def hamiltonian_cycle(width, height):
+    """Cycle visiting every cell once (None when both sides are odd)
+
+    Rows are swept back and forth over columns 1..W-1 and column 0 is the
+    return lane, which needs an even number of rows; odd-row boards with an
+    even width use the transposed cycle.
+    """
+    if height % 2 == 1:
+        if width % 2 == 1:
+            return None
+        return [(x, y) for y, x in hamiltonian_cycle(height, width)]
+    if width < 2:
+        return None
+
+    cycle = [(0, 0)]
+    for y in range(height):
+        xs = range(1, width) if y % 2 == 0 else range(width - 1, 0, -1)
+        cycle.extend((x, y) for x in xs)
+    cycle.extend((0, y) for y in range(height - 1, 0, -1))
+    return cycle
+
+
+class CycleIndex:
+    """Position of each cell along hamiltonian_cycle(), computed from (x, y)
+
+    Works out the index arithmetically instead of storing a cell -> index
+    dict, so it takes the same few bytes on any board size. `reverse`
+    numbers the cycle the other way round.
+    """
+
+    def __init__(self, width, height, reverse=False):
+        self.width = width
+        self.height = height
+        self.area = width * height
+        self.reverse = reverse
+
+    def __getitem__(self, cell):
+        x, y = cell
+        width, height = self.width, self.height
+        if height % 2 == 1:
+            x, y, width, height = y, x, height, width  # the transposed cycle
+        if x > 0:
+            row = x - 1 if y % 2 == 0 else width - 1 - x
+            position = 1 + y * (width - 1) + row
+        elif y > 0:
+            position = 1 + height * (width - 1) + height - 1 - y  # the column-0 return lane
+        else:
+            position = 0
+        return self.area - 1 - position if self.reverse else position
+
+
+def cycle_indexes(width, height):
+    """Cached index lookups for both directions of the cycle (empty when there is none)"""
+    key = (width, height)
+    if key not in _cycle_indexes:
+        if hamiltonian_cycle_exists(width, height):
+            _cycle_indexes[key] = (CycleIndex(width, height), CycleIndex(width, height, reverse=True))
+        else:
+            _cycle_indexes[key] = ()
+    return _cycle_indexes[key]
+
+
+def hamiltonian_cycle_exists(width, height):
+    """Whether hamiltonian_cycle() has a cycle for this board size"""
+    if height % 2 == 1:
+        width, height = height, width
+    return height % 2 == 0 and width >= 2
+
+
+class StraightController:
+    """Keep heading the same way (the original Auto Play)"""
+
+    name = "Straight"
+
+    def choose(self, engine):
+        return engine.direction
+
+
+class PathfindingAutopilot:
+    """BFS-to-food autopilot with a tail-reachability safety check
+
+    On small boards the shortest path to the food is found once per food
+    and cached, so a normal tick is O(1). The path is only taken if the
+    snake could still reach its tail after eating; otherwise it chases its
+    tail and replans each tick until a safe path appears. Chasing the tail
+    can settle into a loop the food never falls inside, so after
+    CIRCLING_AREAS board areas' worth of ticks without eating the chase
+    picks among its safe moves at random, which reshapes the body. Near a
+    full board even that can leave no safe path for good, so after
+    STALEMATE_AREAS it takes the food regardless. On large boards the body
+    is kept ordered along a Hamiltonian cycle and each tick takes the O(1)
+    shortcut closest to the food that cannot overtake the tail.
+
+    Every search stops after SEARCH_LIMIT cells (or twice the snake's
+    length, if that's more), so a decision costs about the same on a 256
+    board as on a 64 one. Food further away than that is approached in
+    legs, each cached like a path to the food.
+    """
+
+    name = "Pathfinder"
+
+    def __init__(self, hamiltonian_min_area=HAMILTONIAN_MIN_AREA, seed=None):
+        self.hamiltonian_min_area = hamiltonian_min_area
+        self.rng = random.Random(seed)
+        self.plan_key = None
+        self.path = deque()
+        self.cycle_index = None
+        self.fed_length = 0
+        self.hungry_ticks = 0
+
+    def choose(self, engine):
+        """Direction for the next tick"""
+        neighbours = neighbour_table(engine.width, engine.height)
+        if len(engine) != self.fed_length:
+            self.fed_length = len(engine)
+            self.hungry_ticks = 0
+        self.hungry_ticks += 1
+        # Replan when the food moves, or once the path (or a leg of it) runs out
+        if self.plan_key != (engine.food, engine.width, engine.height) or (
+                self.cycle_index is None and not self.path):
+            self._plan(engine, neighbours)
+
+        if self.cycle_index is not None:
+            move = self._cycle_move(engine, neighbours)
+        else:
+            move = self._path_move(engine)
+            if move is None:
+                circling = self.hungry_ticks > CIRCLING_AREAS * engine.width * engine.height
+                move = self._tail_chase_move(engine, neighbours, circling)
+        return move or engine.direction
+
+    def _plan(self, engine, neighbours):
+        """Rebuild the cached path for a new food position"""
+        self.plan_key = (engine.food, engine.width, engine.height)
+        self.path = deque()
+        self.cycle_index = self._aligned_cycle(engine)
+        if self.cycle_index is not None or engine.food is None:
+            return
+        path, eats = shortest_path(engine.head, engine.food, engine, neighbours, search_limit(engine))
+        if not path:
+            return
+        # A stalemate random moves haven't broken is one the tail check never
+        # lets through: eat anyway and either win or end the game
+        stalemate = self.hungry_ticks > STALEMATE_AREAS * engine.width * engine.height
+        if stalemate or self._safe_after(engine, path, neighbours, eats):
+            self.path = deque(path)
+
+    def _safe_after(self, engine, path, neighbours, eats=True):
+        """Check the tail is reachable from the end of the path once it's walked
+
+        The snake grows by one if the path ends on the food.
+        """
+        new_length = len(engine) + eats
+        if eats and new_length == engine.width * engine.height:
+            return True  # the last food fills the board and wins
+        virtual_body = list(reversed(path))[:new_length]
+        if len(virtual_body) < new_length:
+            for cell in engine:
+                virtual_body.append(cell)
+                if len(virtual_body) == new_length:
+                    break
+        head, tail = virtual_body[0], virtual_body[-1]
+        blocked = set(virtual_body[:-1])
+        if eats and new_length == engine.width * engine.height - 1:
+            # The next food can only land on the one free cell, so a head next to it eats and wins
+            if any(cell not in blocked and cell != tail for cell in neighbours[head]):
+                return True
+        return is_reachable(head, tail, blocked, neighbours, search_limit(engine))
+
+    def _path_move(self, engine):
+        """Next step of the cached path, if the head is still on it"""
+        if self.path and self.path[0] in neighbour_table(engine.width, engine.height)[engine.head]:
+            if engine.is_safe(self.path[0]):
+                return direction_between(engine.head, self.path.popleft())
+        self.path = deque()
+        return None
+
+    def _aligned_cycle(self, engine):
+        """CycleIndex the body is ordered along (None on small boards)
+
+        Either direction of the cycle works; if the body doesn't run
+        tail -> head along one (e.g. after manual steering) the small-board
+        strategy takes over.
+        """
+        area = engine.width * engine.height
+        if area < self.hamiltonian_min_area:
+            return None
+        for index in cycle_indexes(engine.width, engine.height):
+            span = 0
+            newer = None
+            for cell in engine:
+                if newer is not None:
+                    step = (index[newer] - index[cell]) % area
+                    if step == 0:
+                        break
+                    span += step
+                newer = cell
+            else:
+                if span < area:
+                    return index
+        return None
+
+    def _cycle_move(self, engine, neighbours):
+        """Closest-to-food neighbour that stays between head and tail on the cycle"""
+        index = self.cycle_index
+        area = engine.width * engine.height
+        head_index = index[engine.head]
+        to_tail = (index[engine.tail] - head_index) % area
+        # Shortcuts leave gaps behind the head, so stop taking them once the
+        # snake is long and keep a margin for the growth from eating
+        limit = to_tail - 3 if len(engine) < area // 2 else 1
+
+        to_food = (index[engine.food] - head_index) % area if engine.food is not None else area
+
+        best, best_distance = None, None
+        for cell in neighbours[engine.head]:
+            ahead = (index[cell] - head_index) % area
+            if ahead == 0 or (ahead > limit and ahead != 1) or cell in engine:
+                continue
+            # Remaining cycle distance to the food; overshooting it wraps around
+            distance = (to_food - ahead) % area
+            if best_distance is None or distance < best_distance:
+                best, best_distance = cell, distance
+        if best is None:
+            return None
+        return direction_between(engine.head, best)
+
+    def _tail_chase_move(self, engine, neighbours, circling=False):
+        """Safe move that keeps the tail reachable, preferring the roomiest
+
+        Ties (common once room is capped by the search limit) go to the move
+        nearer the food. While circling, a random draw takes the place of
+        room and distance so the loop doesn't repeat.
+
+        Unlike the path to the food, nothing here is cached: the body moves
+        every tick, so fields keyed on occupancy would be rebuilt every tick
+        anyway. Each candidate instead gets its own searches, capped at
+        search_limit() cells, so a tick's cost stays bounded on any board.
+        """
+        body = list(engine)
+        limit = search_limit(engine)
+        best, best_score = None, None
+        for direction in DIRECTIONS:
+            if direction == OPPOSITES[engine.direction]:
+                continue
+            target = engine.next_head(direction)
+            if not engine.is_safe(target):
+                continue
+            # Body after the move (tail stays only if we eat)
+            new_body = [target] + (body if target == engine.food else body[:-1])
+            blocked = set(new_body[:-1])
+            reachable = is_reachable(target, new_body[-1], blocked, neighbours, limit)
+            if circling and reachable:
+                score = (reachable, self.rng.random())
+            else:
+                room = len(distance_field(target, blocked, neighbours, limit))
+                score = (reachable, room, -manhattan(target, engine.food))
+            if best_score is None or score > best_score:
+                best, best_score = direction, score
+        return best
+
+
+CONTROLLERS = {
+    StraightController.name: StraightController,
+    PathfindingAutopilot.name: PathfindingAutopilot,
+}
@@ -0,0 +1,225 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from day15_snake_autopilot import direction_between, hamiltonian_cycle
+from day15_snake_engine import SnakeEngine
+from day15_snake_render import GridRenderer
+
+# Benchmark Configuration
+DEFAULT_SIZES = [16, 64, 256]
+DEFAULT_LENGTHS = [3, 100, 1000, 10000]
+DEFAULT_OCCUPANCIES = [0.9, 0.99]  # crowded cases per size, as a share of the cycle
+DEFAULT_TICKS = 2000
+REGRESSION_THRESHOLD = 0.25  # 25% slower than the baseline counts as a regression
+
+
+def board_cycle(size):
+    """Hamiltonian cycle to steer along (odd boards use all but the last row)"""
+    return hamiltonian_cycle(size, size) or hamiltonian_cycle(size, size - 1)
+
+
+def engine_on_cycle(size, length, cycle, seed=0):
+    """Engine whose body of the given length lies along the cycle"""
+    body = cycle[:length][::-1]
+    return SnakeEngine.from_body(body, size, direction=direction_between(body[1], body[0]), seed=seed)
+
+
+def steer_along(engine, cycle_next):
+    engine.change_direction(direction_between(engine.head, cycle_next[engine.head]))
+
+
+def rewinder(engine, renderer=None):
+    """Callable that puts the engine (and renderer) back to how they are now
+
+    A snake stepping along the cycle grows whenever it meets the food, so
+    cases on a crowded board rewind before it fills up. The renderer is
+    redrawn after each rewind so the full frame isn't timed.
+    """
+    state = engine.__getstate__()
+
+    def rewind():
+        engine.__setstate__(state)
+        if renderer is not None:
+            renderer.render(engine)
+
+    return rewind
+
+
+def measure(run, count, rewind=None, chunk=None):
+    """ns per operation plus allocation figures for `count` calls of run()
+
+    Python doesn't expose transient allocation counts, so this reports the
+    net change in live memory blocks and the tracemalloc peak above the
+    starting point, both per operation. With `rewind`, the calls are made
+    in runs of `chunk` and rewind() is called, untimed, before each run.
+    """
+    chunk = min(chunk or count, count)
+    chunks = [min(chunk, count - done) for done in range(0, count, chunk)]
+    if rewind:
+        rewind()
+    run()  # warm caches
+
+    elapsed = 0
+    blocks = 0
+    for n in chunks:
+        if rewind:
+            rewind()
+        blocks_before = sys.getallocatedblocks()
+        start = time.perf_counter_ns()
+        for _ in range(n):
+            run()
+        elapsed += time.perf_counter_ns() - start
+        blocks += sys.getallocatedblocks() - blocks_before
+
+    peak = 0
+    tracemalloc.start()
+    for n in chunks:
+        if rewind:
+            rewind()
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        for _ in range(n):
+            run()
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+
+    return {
+        "ns_per_op": elapsed / count,
+        "net_blocks_per_op": blocks / count,
+        "peak_alloc_bytes": peak,
+    }
+
+
+def bench_case(size, length, ticks):
+    """Benchmark tick, food spawn and render for one board size and snake length"""
+    cycle = board_cycle(size)
+    cycle_next = {cell: cycle[(i + 1) % len(cycle)] for i, cell in enumerate(cycle)}
+    # Each tick grows the snake by at most one, so it can't fill the cycle within a chunk
+    chunk = len(cycle) - length - 1
+    results = []
+
+    # move_snake equivalent: steer along the cycle and step
+    engine = engine_on_cycle(size, length, cycle)
+
+    def tick():
+        steer_along(engine, cycle_next)
+        engine.step()
+
+    results.append({"op": "tick", **measure(tick, ticks, rewinder(engine), chunk)})
+
+    # generate_food equivalent
+    engine = engine_on_cycle(size, length, cycle)
+    results.append({"op": "spawn_food", **measure(engine.spawn_food, ticks)})
+
+    # create_grid equivalent: one tick plus an incremental frame (changed cells only)
+    engine = engine_on_cycle(size, length, cycle)
+    renderer = GridRenderer()
+
+    def frame():
+        steer_along(engine, cycle_next)
+        engine.step()
+        return renderer.render(engine)
+
+    stats = measure(frame, ticks, rewinder(engine, renderer), chunk)
+    # What the component sends for a typical tick
+    stats["bytes_per_frame"] = len(json.dumps(frame()))
+    results.append({"op": "tick+render", **stats})
+
+    for result in results:
+        result.update(size=size, length=length)
+    return results
+
+
+def run_suite(sizes, lengths, ticks, occupancies=DEFAULT_OCCUPANCIES):
+    """Every (size, length) pair where the snake leaves room to move on the cycle
+
+    Each size also gets a snake covering each of `occupancies` of its
+    cycle, so the crowded-board paths (the free-cell index) are always
+    measured. Pairs that don't fit are listed under "skipped".
+    """
+    results = []
+    skipped = []
+    for size in sizes:
+        cycle_length = len(board_cycle(size))
+        crowded = [int(cycle_length * occupancy) for occupancy in occupancies]
+        for length in sorted(set(lengths) | set(crowded)):
+            if not 2 <= length <= cycle_length - 2:
+                skipped.append([size, length])
+                continue
+            results.extend(bench_case(size, length, ticks))
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "ticks": ticks,
+        },
+        "results": results,
+        "skipped": skipped,
+    }
+
+
+def compare(current, baseline, threshold=REGRESSION_THRESHOLD):
+    """Rows whose ns/op got more than `threshold` slower than the baseline"""
+    previous = {(r["op"], r["size"], r["length"]): r for r in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        old = previous.get((result["op"], result["size"], result["length"]))
+        if old and result["ns_per_op"] > old["ns_per_op"] * (1 + threshold):
+            regressions.append({**result, "baseline_ns_per_op": old["ns_per_op"]})
+    return regressions
+
+
+def print_results(report):
+    print(f"{'op':<12} {'size':>5} {'length':>7} {'ns/op':>12} {'blocks/op':>10} {'peak B':>9} {'B/frame':>10}")
+    for r in report["results"]:
+        frame = f"{r['bytes_per_frame']:,.0f}" if "bytes_per_frame" in r else "-"
+        print(
+            f"{r['op']:<12} {r['size']:>5} {r['length']:>7} {r['ns_per_op']:>12,.0f} "
+            f"{r['net_blocks_per_op']:>10.2f} {r['peak_alloc_bytes']:>9,} {frame:>10}"
+        )
+    if report["skipped"]:
+        pairs = ", ".join(f"{size}/{length}" for size, length in report["skipped"])
+        print(f"\n⏭️ Skipped (size/length) where the snake doesn't fit the board: {pairs}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the snake per-tick hot path")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--lengths", type=int, nargs="+", default=DEFAULT_LENGTHS)
+    parser.add_argument("--occupancies", type=float, nargs="*", default=DEFAULT_OCCUPANCIES,
+                        help="extra snake lengths per size, as a share of the board's cycle")
+    parser.add_argument("--ticks", type=int, default=DEFAULT_TICKS)
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="JSON from an earlier run to check for regressions")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.sizes, args.lengths, args.ticks, args.occupancies)
+    print_results(report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Saved results to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n⚠️ {len(regressions)} regression(s) over {args.threshold:.0%}:")
+            for r in regressions:
+                print(f"   {r['op']} size={r['size']} length={r['length']}: "
+                      f"{r['baseline_ns_per_op']:,.0f} -> {r['ns_per_op']:,.0f} ns/op")
+            return 1
+        print("\n✅ No regressions against the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+import streamlit as st
+
+# The browser keeps the board between reruns and applies each frame's
+# changed cells to it, so a tick sends a few cells instead of the whole grid
+
+BOARD_HTML = '<div class="board"></div>'
+
+BOARD_CSS = """
+.board {
+    display: inline-grid;
+    gap: 1px;
+    padding: 15px;
+    border-radius: 10px;
+    background: #2c3e50;
+}
+.cell {
+    width: var(--cell-size);
+    height: var(--cell-size);
+    border-radius: 2px;
+    background: #95a5a6;
+}
+.cell.body {
+    background: #2ecc71;
+}
+.cell.head {
+    background: #e74c3c;
+}
+.cell.food {
+    background: #f39c12;
+}
+"""
+
+BOARD_JS = """
+const CLASSES = { ".": "cell", b: "cell body", h: "cell head", f: "cell food" };
+
+export default function(component) {
+    const { data, setTriggerValue, parentElement } = component;
+    const board = parentElement.querySelector(".board");
+
+    if (data.cells !== null) {
+        const cellSize = Math.max(2, Math.floor(480 / Math.max(data.width, data.height)));
+        board.style.gridTemplateColumns = `repeat(${data.width}, ${cellSize}px)`;
+        board.style.setProperty("--cell-size", `${cellSize}px`);
+        board.replaceChildren(...Array.from(data.cells, (code) => {
+            const cell = document.createElement("div");
+            cell.className = CLASSES[code];
+            return cell;
+        }));
+    } else if (Number(board.dataset.frame) === data.base) {
+        for (const [index, code] of data.patch) {
+            board.children[index].className = CLASSES[code];
+        }
+    } else {
+        // Missed a frame or just mounted: ask for the whole board and keep this one
+        setTriggerValue("resync", data.frame);
+        return;
+    }
+    board.dataset.frame = data.frame;
+}
+"""
+
+_board_component = st.components.v2.component(
+    "snake_board",
+    html=BOARD_HTML,
+    css=BOARD_CSS,
+    js=BOARD_JS,
+)
+
+
+def board_component(frame, on_resync=None, key="snake_board"):
+    """Draw one GridRenderer frame
+
+    If the browser doesn't have the frame a patch builds on, it asks for
+    the whole board: on_resync runs before the rerun that request causes.
+    """
+    _board_component(key=key, data=frame, on_resync_change=on_resync or (lambda: None))
@@ -0,0 +1,320 @@
+import random
+from array import array
+
+# Engine Configuration
+DEFAULT_GRID_SIZE = 15
+MIN_GRID_SIZE = 5
+MAX_GRID_SIZE = 256  # cell indices must fit in a uint16
+INITIAL_RING_CAPACITY = 16
+
+DIRECTIONS = {
+    'UP': (0, -1),
+    'DOWN': (0, 1),
+    'LEFT': (-1, 0),
+    'RIGHT': (1, 0),
+}
+
+OPPOSITES = {'UP': 'DOWN', 'DOWN': 'UP', 'LEFT': 'RIGHT', 'RIGHT': 'LEFT'}
+
+# One-byte direction codes used by recordings and the batch simulator
+DIRECTION_CODES = {name: code for code, name in enumerate(DIRECTIONS)}
+
+# Step results
+MOVED = "moved"
+ATE = "ate"
+CRASHED = "crashed"
+
+
+class FreeCellIndex:
+    """Set of free cells with O(1) add, remove and uniform random choice
+
+    Cells live in a dense list; a position map lets remove swap the last
+    cell into the hole instead of shifting the list.
+    """
+
+    def __init__(self, cells=()):
+        self.cells = list(cells)
+        self.positions = {cell: i for i, cell in enumerate(self.cells)}
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, cell):
+        return cell in self.positions
+
+    def add(self, cell):
+        """Mark a cell as free"""
+        if cell not in self.positions:
+            self.positions[cell] = len(self.cells)
+            self.cells.append(cell)
+
+    def remove(self, cell):
+        """Mark a cell as taken (swap-remove)"""
+        index = self.positions.pop(cell)
+        last = self.cells.pop()
+        if index < len(self.cells):
+            self.cells[index] = last
+            self.positions[last] = index
+
+    def choice(self, rng):
+        """Pick a uniformly random free cell (None when empty)"""
+        if not self.cells:
+            return None
+        return self.cells[rng.randrange(len(self.cells))]
+
+
+class SnakeEngine:
+    """Streamlit-free snake game state with O(1) move, grow and collision checks
+
+    Cells are stored as ``y * width + x``. Occupancy is a one-bit-per-cell
+    bytearray bitboard and the body is a uint16 ring buffer (head/tail
+    pointers, doubled when full), so memory follows the snake's length and a
+    256x256 board only costs 8 KB of bitboard. Once the snake covers half the
+    board a free-cell index takes over food spawning, keeping it O(1) even
+    at 99% occupancy. The public API speaks (x, y) tuples.
+    """
+
+    def __init__(self, width=DEFAULT_GRID_SIZE, height=None, seed=None):
+        height = height if height is not None else width
+        if not (MIN_GRID_SIZE <= width <= MAX_GRID_SIZE and MIN_GRID_SIZE <= height <= MAX_GRID_SIZE):
+            raise ValueError(f"Board must be between {MIN_GRID_SIZE} and {MAX_GRID_SIZE} cells per side")
+        self.width = width
+        self.height = height
+        self.area = width * height
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        """Start a new game: length-3 snake in the centre heading right, food placed
+
+        Food comes from a RNG seeded per game, so the seed plus the recorded
+        direction of every tick reproduces the game exactly.
+        """
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        self.rng = random.Random(self.seed)
+        self.moves = bytearray()
+        center_x = self.width // 2
+        center_y = self.height // 2
+        self.bits = bytearray((self.area + 7) // 8)
+        self.ring = array('H', bytes(2 * INITIAL_RING_CAPACITY))
+        self.head_ptr = -1
+        self.length = 0
+        self.free = None
+        for i in (2, 1, 0):
+            self._push(center_y * self.width + center_x - i)
+        self.direction = 'RIGHT'
+        # None means "everything changed"; renderers redraw the full board
+        self.dirty = None
+        self.food = None
+        self.spawn_food()
+
+    @classmethod
+    def from_body(cls, body, width=DEFAULT_GRID_SIZE, height=None, direction='RIGHT', seed=None):
+        """Engine with the given body (head first) instead of the starting snake"""
+        engine = cls(width, height, seed=seed)
+        engine.bits = bytearray(len(engine.bits))
+        engine.head_ptr = -1
+        engine.length = 0
+        engine.free = None
+        for cell in reversed(body):
+            if not engine.in_bounds(cell) or cell in engine:
+                raise ValueError(f"Invalid body cell: {cell}")
+            engine._push(engine._index(cell))
+        engine.direction = direction
+        engine.dirty = None
+        engine.food = None
+        engine.spawn_food()
+        return engine
+
+    # Cell encoding and bitboard helpers
+
+    def _cell(self, index):
+        return (index % self.width, index // self.width)
+
+    def _index(self, cell):
+        return cell[1] * self.width + cell[0]
+
+    def _occupied(self, index):
+        return self.bits[index >> 3] >> (index & 7) & 1
+
+    def _set(self, index):
+        self.bits[index >> 3] |= 1 << (index & 7)
+
+    def _clear(self, index):
+        self.bits[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+
+    # Ring buffer helpers (head at head_ptr, body runs backwards from it)
+
+    def _push(self, index):
+        capacity = len(self.ring)
+        if self.length == capacity:
+            # Unroll tail -> head into a buffer twice the size
+            ordered = array('H', (self.ring[(self.head_ptr - i) % capacity] for i in range(self.length - 1, -1, -1)))
+            ordered.extend(array('H', bytes(2 * capacity)))
+            self.ring = ordered
+            self.head_ptr = self.length - 1
+        self.head_ptr = (self.head_ptr + 1) % len(self.ring)
+        self.ring[self.head_ptr] = index
+        self.length += 1
+        self._set(index)
+        if self.free is not None:
+            self.free.remove(index)
+        elif self.length * 2 >= self.area:
+            self._build_free_index()
+
+    def _pop_tail(self):
+        index = self.ring[(self.head_ptr - self.length + 1) % len(self.ring)]
+        self.length -= 1
+        self._clear(index)
+        if self.free is not None:
+            self.free.add(index)
+        return index
+
+    def _build_free_index(self):
+        self.free = FreeCellIndex(i for i in range(self.area) if not self._occupied(i))
+
+    @property
+    def head(self):
+        return self._cell(self.ring[self.head_ptr])
+
+    @property
+    def tail(self):
+        return self._cell(self.ring[(self.head_ptr - self.length + 1) % len(self.ring)])
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        """Body cells from head to tail"""
+        capacity = len(self.ring)
+        for i in range(self.length):
+            yield self._cell(self.ring[(self.head_ptr - i) % capacity])
+
+    def __contains__(self, cell):
+        return self.in_bounds(cell) and bool(self._occupied(self._index(cell)))
+
+    def in_bounds(self, cell):
+        """Check whether a cell lies on the board"""
+        x, y = cell
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def spawn_food(self):
+        """Place food on a random free cell (None when the board is full)"""
+        self._mark_dirty(self.food)
+        if self.free is not None:
+            index = self.free.choice(self.rng)
+        elif self.length < self.area:
+            # At most half the board is taken, so this needs < 2 tries on average
+            index = self.rng.randrange(self.area)
+            while self._occupied(index):
+                index = self.rng.randrange(self.area)
+        else:
+            index = None
+        self.food = self._cell(index) if index is not None else None
+        self._mark_dirty(self.food)
+        return self.food
+
+    def pop_dirty(self):
+        """Return cells changed since the last call (None for a full redraw)"""
+        dirty = self.dirty
+        self.dirty = set()
+        return dirty
+
+    def _mark_dirty(self, cell):
+        if self.dirty is not None and cell is not None:
+            self.dirty.add(cell)
+
+    def change_direction(self, new_dir):
+        """Change direction unless it would reverse onto the body"""
+        if new_dir not in DIRECTIONS:
+            raise ValueError(f"Unknown direction: {new_dir}")
+        if new_dir != OPPOSITES[self.direction]:
+            self.direction = new_dir
+            return True
+        return False
+
+    def next_head(self, direction=None):
+        """Cell the head would move into for the given (or current) direction"""
+        dx, dy = DIRECTIONS[direction or self.direction]
+        head_x, head_y = self.head
+        return (head_x + dx, head_y + dy)
+
+    def is_safe(self, cell):
+        """Check whether moving the head into cell would not crash
+
+        The current tail cell is safe because it moves away on the same tick,
+        unless the snake is about to eat and grow.
+        """
+        if not self.in_bounds(cell):
+            return False
+        if not self._occupied(self._index(cell)):
+            return True
+        return cell == self.tail and cell != self.food
+
+    def step(self):
+        """Advance one tick and return MOVED, ATE or CRASHED"""
+        self.moves.append(DIRECTION_CODES[self.direction])
+        new_head = self.next_head()
+
+        # Check wall and self collision
+        if not self.is_safe(new_head):
+            return CRASHED
+
+        # The old head turns into body, so it needs repainting too
+        self._mark_dirty(self.head)
+        self._mark_dirty(new_head)
+
+        # Check if food eaten
+        if new_head == self.food:
+            self._push(self._index(new_head))
+            self.spawn_food()
+            return ATE
+
+        # Remove tail before adding head so a head-follows-tail move stays occupied
+        self._mark_dirty(self._cell(self._pop_tail()))
+        self._push(self._index(new_head))
+        return MOVED
+
+    def __getstate__(self):
+        """Compact pickle: bitboard, body (tail -> head), free index order and scalars"""
+        capacity = len(self.ring)
+        body = array('H', (self.ring[(self.head_ptr - i) % capacity] for i in range(self.length - 1, -1, -1)))
+        return {
+            "width": self.width,
+            "height": self.height,
+            "bits": bytes(self.bits),
+            "body": body.tobytes(),
+            "direction": self.direction,
+            "food": self.food,
+            "seed": self.seed,
+            "rng": self.rng.getstate(),
+            "moves": bytes(self.moves),
+            # Food picks depend on the index order, so keep it for exact replays
+            "free": array('H', self.free.cells).tobytes() if self.free is not None else None,
+        }
+
+    def __setstate__(self, state):
+        self.width = state["width"]
+        self.height = state["height"]
+        self.area = self.width * self.height
+        self.seed = state["seed"]
+        self.rng = random.Random()
+        self.rng.setstate(state["rng"])
+        self.moves = bytearray(state["moves"])
+        self.bits = bytearray(state["bits"])
+        body = array('H')
+        body.frombytes(state["body"])
+        self.length = len(body)
+        self.head_ptr = self.length - 1
+        capacity = INITIAL_RING_CAPACITY
+        while capacity < self.length:
+            capacity *= 2
+        body.extend(array('H', bytes(2 * (capacity - self.length))))
+        self.ring = body
+        self.free = None
+        if state["free"] is not None:
+            free_cells = array('H')
+            free_cells.frombytes(state["free"])
+            self.free = FreeCellIndex(free_cells)
+        self.direction = state["direction"]
+        self.food = state["food"]
+        self.dirty = None
@@ -0,0 +1,53 @@
+# Cell codes the board component understands
+EMPTY = "."
+BODY = "b"
+HEAD = "h"
+FOOD = "f"
+
+
+def cell_code(engine, cell):
+    """Code for a single cell"""
+    if cell == engine.head:
+        return HEAD
+    if cell in engine:
+        return BODY
+    if cell == engine.food:
+        return FOOD
+    return EMPTY
+
+
+class GridRenderer:
+    """Sends the browser only the cells that changed since the frame it has
+
+    render() returns one frame of component data. The first frame, one
+    after a resize or a full engine change, and one after resync() carry
+    the whole board as a string of cell codes. Every other frame carries
+    just the cells the engine marked dirty (old tail, old and new head,
+    food) plus the number of the frame it applies on top of, so a tick
+    costs O(changed cells) to build and to send whatever the board size.
+    """
+
+    def __init__(self):
+        self.size = None
+        self.frame = 0
+        self.full_needed = True
+
+    def resync(self):
+        """Send the whole board next time (the browser lost track of the frames)"""
+        self.full_needed = True
+
+    def render(self, engine):
+        """Return the component data for the engine's current state"""
+        dirty = engine.pop_dirty()
+        size = (engine.width, engine.height)
+        self.frame += 1
+        frame = {"width": engine.width, "height": engine.height, "frame": self.frame}
+        if dirty is None or self.full_needed or self.size != size:
+            self.size = size
+            self.full_needed = False
+            cells = ''.join(
+                cell_code(engine, (x, y)) for y in range(engine.height) for x in range(engine.width)
+            )
+            return {**frame, "base": None, "cells": cells, "patch": []}
+        patch = [[y * engine.width + x, cell_code(engine, (x, y))] for x, y in dirty]
+        return {**frame, "base": self.frame - 1, "cells": None, "patch": patch}
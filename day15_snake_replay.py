@@ -0,0 +1,104 @@
+import pickle
+import struct
+
+from day15_snake_engine import CRASHED, DIRECTIONS, SnakeEngine
+
+# Replay Configuration
+KEYFRAME_INTERVAL = 256  # ticks between stored snapshots
+HEADER = struct.Struct("<4sHHI")  # magic, width, height, seed
+MAGIC = b"SNK1"
+
+DIRECTION_NAMES = list(DIRECTIONS)
+
+
+class Replay:
+    """A recorded game: board size, food seed and one direction byte per tick"""
+
+    def __init__(self, width, height, seed, moves):
+        self.width = width
+        self.height = height
+        self.seed = seed
+        self.moves = bytes(moves)
+
+    @classmethod
+    def from_engine(cls, engine):
+        """Recording of the engine's current game so far"""
+        return cls(engine.width, engine.height, engine.seed, engine.moves)
+
+    def __len__(self):
+        return len(self.moves)
+
+    def to_bytes(self):
+        """Serialize as a 12-byte header followed by the move bytes"""
+        return HEADER.pack(MAGIC, self.width, self.height, self.seed) + self.moves
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Parse bytes produced by to_bytes"""
+        if len(data) < HEADER.size:
+            raise ValueError("Replay data is too short")
+        magic, width, height, seed = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Not a snake replay")
+        moves = data[HEADER.size:]
+        if any(code >= len(DIRECTION_NAMES) for code in moves):
+            raise ValueError("Replay contains an unknown direction")
+        return cls(width, height, seed, moves)
+
+
+def replay_step(engine, code):
+    """Apply one recorded tick to an engine"""
+    engine.direction = DIRECTION_NAMES[code]
+    return engine.step()
+
+
+class ReplayPlayer:
+    """Random-access playback using periodic keyframe snapshots
+
+    Playing the replay once stores a pickled engine every
+    ``keyframe_interval`` ticks. Seeking restores the nearest keyframe at or
+    before the target and replays fewer than ``keyframe_interval`` ticks, so
+    scrubbing costs the same anywhere in a long game.
+    """
+
+    def __init__(self, replay, keyframe_interval=KEYFRAME_INTERVAL):
+        self.replay = replay
+        self.keyframe_interval = keyframe_interval
+        self.keyframes = []
+        self.results = []
+        self._record()
+
+    def _new_engine(self):
+        return SnakeEngine(self.replay.width, self.replay.height, seed=self.replay.seed)
+
+    def _snapshot(self, engine):
+        # The replay already holds the moves, so keyframes don't repeat them
+        engine.moves.clear()
+        self.keyframes.append(pickle.dumps(engine))
+
+    def _record(self):
+        engine = self._new_engine()
+        for tick, code in enumerate(self.replay.moves):
+            if tick % self.keyframe_interval == 0:
+                self._snapshot(engine)
+            result = replay_step(engine, code)
+            self.results.append(result)
+            if result == CRASHED:
+                break
+        if len(self.results) % self.keyframe_interval == 0:
+            self._snapshot(engine)
+        self.final_length = len(engine)
+
+    @property
+    def ticks(self):
+        """Number of ticks that can be shown (0 .. ticks inclusive)"""
+        return len(self.results)
+
+    def seek(self, tick):
+        """Engine state after `tick` ticks"""
+        tick = max(0, min(tick, self.ticks))
+        keyframe = tick // self.keyframe_interval
+        engine = pickle.loads(self.keyframes[keyframe])
+        for code in self.replay.moves[keyframe * self.keyframe_interval:tick]:
+            replay_step(engine, code)
+        return engine
@@ -0,0 +1,238 @@
+import argparse
+import time
+
+import numpy as np
+
+from day15_snake_engine import DEFAULT_GRID_SIZE, DIRECTIONS, MAX_GRID_SIZE, MIN_GRID_SIZE
+
+# Direction codes follow the engine's DIRECTIONS order: UP, DOWN, LEFT, RIGHT
+DIRECTION_NAMES = list(DIRECTIONS)
+DELTAS = np.array([(dy, dx) for dx, dy in DIRECTIONS.values()], dtype=np.int64)
+OPPOSITE_CODES = np.array(
+    [DIRECTION_NAMES.index(name) for name in ('DOWN', 'UP', 'RIGHT', 'LEFT')],
+    dtype=np.int64,
+)
+RIGHT = DIRECTION_NAMES.index('RIGHT')
+
+FOOD_POINTS = 10
+
+
+class BatchSnakeSim:
+    """Many independent snake games stepped together with NumPy
+
+    ``board[g, y, x]`` is the game clock at which the head last entered that
+    cell. A cell is body while ``stamp > clock - length``, so the tail frees
+    itself as the clock advances and eating only bumps ``length``; a tick
+    never touches the rest of the board. Rules match SnakeEngine: walls and
+    body kill, the vacating tail cell is safe unless the snake is eating.
+    """
+
+    def __init__(self, n_games, width=DEFAULT_GRID_SIZE, height=None, seed=None, starve_limit=None):
+        height = height if height is not None else width
+        # Same bounds as SnakeEngine; below the minimum the starting body would wrap off the board
+        if not (MIN_GRID_SIZE <= width <= MAX_GRID_SIZE and MIN_GRID_SIZE <= height <= MAX_GRID_SIZE):
+            raise ValueError(f"Board must be between {MIN_GRID_SIZE} and {MAX_GRID_SIZE} cells per side")
+        self.n_games = n_games
+        self.width = width
+        self.height = height
+        self.rng = np.random.default_rng(seed)
+        # Games that go this long without eating are stopped (loop protection)
+        self.starve_limit = starve_limit if starve_limit is not None else 2 * self.width * self.height
+        self.reset()
+
+    def reset(self):
+        """Start every game with a length-3 snake in the centre heading right"""
+        g = self.n_games
+        center_x = self.width // 2
+        center_y = self.height // 2
+
+        self.board = np.zeros((g, self.height, self.width), dtype=np.int32)
+        for i in range(3):
+            self.board[:, center_y, center_x - i] = 3 - i
+        # Clock starts at the initial length so never-visited cells (0) read as free
+        self.clock = np.full(g, 3, dtype=np.int64)
+
+        self.head = np.tile(np.array([center_y, center_x], dtype=np.int64), (g, 1))
+        self.direction = np.full(g, RIGHT, dtype=np.int64)
+        self.length = np.full(g, 3, dtype=np.int64)
+        self.score = np.zeros(g, dtype=np.int64)
+        self.steps = np.zeros(g, dtype=np.int64)
+        self.since_food = np.zeros(g, dtype=np.int64)
+        self.alive = np.ones(g, dtype=bool)
+        self.food = np.zeros((g, 2), dtype=np.int64)
+        self.spawn_food(np.arange(g))
+
+    def spawn_food(self, games):
+        """Place food on a uniformly random free cell for each game index
+
+        Games with a full board are finished and get food at (-1, -1).
+        """
+        if len(games) == 0:
+            return
+        occupied = self.occupancy(games).reshape(len(games), -1)
+        keys = self.rng.random(occupied.shape)
+        keys[occupied] = -1.0
+        cells = keys.argmax(axis=1)
+        full = occupied.all(axis=1)
+
+        self.food[games, 0] = cells // self.width
+        self.food[games, 1] = cells % self.width
+        self.food[games[full]] = -1
+        self.alive[games[full]] = False
+
+    def occupancy(self, games=None):
+        """Boolean (games, H, W) body mask"""
+        if games is None:
+            games = np.arange(self.n_games)
+        horizon = self.clock[games] - self.length[games]
+        return self.board[games] > horizon[:, None, None]
+
+    def life(self, games, ys, xs):
+        """Ticks the body still occupies each cell (<= 0 means free)"""
+        return self.board[games, ys, xs] - self.clock[games] + self.length[games]
+
+    def candidate_heads(self):
+        """Next head cell for each game and each direction, shape (games, 4, 2)"""
+        return self.head[:, None, :] + DELTAS[None, :, :]
+
+    def safe_moves(self):
+        """Boolean (games, 4) mask of directions that don't crash this tick"""
+        heads = self.candidate_heads()
+        ys, xs = heads[..., 0], heads[..., 1]
+        inside = (ys >= 0) & (ys < self.height) & (xs >= 0) & (xs < self.width)
+        cy = np.clip(ys, 0, self.height - 1)
+        cx = np.clip(xs, 0, self.width - 1)
+        games = np.arange(self.n_games)[:, None]
+        occupant = self.board[games, cy, cx] - self.clock[games] + self.length[games]
+        eats = (ys == self.food[:, None, 0]) & (xs == self.food[:, None, 1])
+        free = (occupant <= 0) | ((occupant == 1) & ~eats)
+        safe = inside & free
+        # Reversing is ignored by step(), so it never counts as a real option
+        safe[np.arange(self.n_games), OPPOSITE_CODES[self.direction]] = False
+        return safe
+
+    def step(self, actions=None):
+        """Advance every live game one tick; actions are direction codes or None"""
+        live = np.flatnonzero(self.alive)
+        if len(live) == 0:
+            return
+
+        if actions is not None:
+            actions = np.asarray(actions, dtype=np.int64)[live]
+            turn = actions != OPPOSITE_CODES[self.direction[live]]
+            self.direction[live[turn]] = actions[turn]
+
+        new_head = self.head[live] + DELTAS[self.direction[live]]
+        ys, xs = new_head[:, 0], new_head[:, 1]
+        inside = (ys >= 0) & (ys < self.height) & (xs >= 0) & (xs < self.width)
+        cy = np.clip(ys, 0, self.height - 1)
+        cx = np.clip(xs, 0, self.width - 1)
+        occupant = self.life(live, cy, cx)
+        eats = inside & (ys == self.food[live, 0]) & (xs == self.food[live, 1])
+        crashed = ~inside | (occupant > 1) | ((occupant == 1) & eats)
+
+        self.alive[live[crashed]] = False
+        movers = live[~crashed]
+        eats = eats[~crashed]
+        ys, xs = ys[~crashed], xs[~crashed]
+
+        # Advancing the clock frees the tail; eaters keep it by growing
+        eaters = movers[eats]
+        self.length[eaters] += 1
+        self.score[eaters] += FOOD_POINTS
+        self.since_food[movers] += 1
+        self.since_food[eaters] = 0
+
+        self.clock[movers] += 1
+        self.board[movers, ys, xs] = self.clock[movers]
+        self.head[movers, 0] = ys
+        self.head[movers, 1] = xs
+        self.steps[movers] += 1
+
+        self.spawn_food(eaters)
+        self.alive[self.since_food > self.starve_limit] = False
+
+    def run(self, policy=None, max_steps=10_000):
+        """Step until every game ends or max_steps ticks pass; returns ticks run"""
+        for tick in range(max_steps):
+            if not self.alive.any():
+                return tick
+            self.step(policy(self) if policy is not None else None)
+        return max_steps
+
+
+# Policies take a BatchSnakeSim and return a (games,) array of direction codes
+
+def straight_policy(sim):
+    """Keep the current direction (the old Auto Play behaviour)"""
+    return sim.direction
+
+
+def random_policy(sim):
+    """Pick a random safe direction, or keep going when none is safe"""
+    safe = sim.safe_moves()
+    keys = sim.rng.random(safe.shape)
+    keys[~safe] = -1.0
+    choice = keys.argmax(axis=1)
+    return np.where(safe.any(axis=1), choice, sim.direction)
+
+
+def greedy_policy(sim):
+    """Take the safe direction that gets closest (Manhattan) to the food"""
+    safe = sim.safe_moves()
+    heads = sim.candidate_heads()
+    distance = np.abs(heads - sim.food[:, None, :]).sum(axis=2).astype(np.float64)
+    distance[~safe] = np.inf
+    choice = distance.argmin(axis=1)
+    return np.where(safe.any(axis=1), choice, sim.direction)
+
+
+POLICIES = {
+    "straight": straight_policy,
+    "random": random_policy,
+    "greedy": greedy_policy,
+}
+
+
+def summarize(sim, elapsed):
+    """Throughput and score distribution for a finished batch"""
+    scores = sim.score
+    return {
+        "games": sim.n_games,
+        "seconds": elapsed,
+        "games_per_second": sim.n_games / elapsed if elapsed > 0 else float("inf"),
+        "ticks_per_second": int(sim.steps.sum()) / elapsed if elapsed > 0 else float("inf"),
+        "mean_score": float(scores.mean()),
+        "max_score": int(scores.max()),
+        "percentiles": {p: float(np.percentile(scores, p)) for p in (10, 25, 50, 75, 90, 99)},
+        "histogram": dict(zip(*[a.tolist() for a in np.unique(scores, return_counts=True)])),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless batch snake simulator")
+    parser.add_argument("--games", type=int, default=10_000, help="games stepped in parallel")
+    parser.add_argument("--size", type=int, default=DEFAULT_GRID_SIZE, help="board width and height")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="greedy")
+    parser.add_argument("--max-steps", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    sim = BatchSnakeSim(args.games, args.size, seed=args.seed)
+    start = time.perf_counter()
+    sim.run(POLICIES[args.policy], args.max_steps)
+    stats = summarize(sim, time.perf_counter() - start)
+
+    print(f"🐍 {stats['games']} games on {args.size}x{args.size} with '{args.policy}' in {stats['seconds']:.2f}s")
+    print(f"   {stats['games_per_second']:,.0f} games/s, {stats['ticks_per_second']:,.0f} ticks/s")
+    print(f"   Score mean {stats['mean_score']:.1f}, max {stats['max_score']}")
+    print("   Percentiles: " + ", ".join(f"p{p}={v:.0f}" for p, v in stats['percentiles'].items()))
+    print("   Distribution:")
+    top = max(stats['histogram'].values())
+    for score, count in stats['histogram'].items():
+        print(f"   {score:>6} | {'█' * max(1, round(40 * count / top))} {count}")
+    return stats
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+# Result tables for the round robins (tic-tac-toe arena, RPS tournament).
+# Results map (a, b) to (wins, draws, losses) for a against b.
+
+
+def mirror_results(totals):
+    """Results for both orders of each pair from one (wins, draws, losses) per pair"""
+    results = {}
+    for (a, b), (wins, draws, losses) in totals.items():
+        results[(a, b)] = (wins, draws, losses)
+        results[(b, a)] = (losses, draws, wins)
+    return results
+
+
+def print_matrix(title, specs, results, column):
+    """One row per strategy: its share of games (or rounds) won / drawn / lost against each column"""
+    width = max(len(spec) for spec in specs) + 2
+    print(f"\n{title} (row vs column)")
+    print(" " * width + "".join(f"{spec:>{width}}" for spec in specs))
+    for a in specs:
+        cells = []
+        for b in specs:
+            if a == b:
+                cells.append(f"{'-':>{width}}")
+            else:
+                counts = results[(a, b)]
+                cells.append(f"{counts[column] / sum(counts):>{width}.1%}")
+        print(f"{a:<{width}}" + "".join(cells))
+
+
+def print_matrices(specs, results):
+    """Win, draw and loss tables, one after another"""
+    print_matrix("🏆 Wins", specs, results, 0)
+    print_matrix("🤝 Draws", specs, results, 1)
+    print_matrix("💀 Losses", specs, results, 2)
@@ -0,0 +1,31 @@
+from collections import deque
+
+from day15_snake_arena import BODY, Arena
+
+
+def place(arena, name, body, direction):
+    """Put a live snake on the board with the given cells, head first"""
+    snake = arena.add_player(name)
+    arena.to_spawn.clear()
+    snake.body = deque(y * arena.width + x for x, y in body)
+    snake.direction = direction
+    snake.alive = True
+    for c in snake.body:
+        arena.cells[c] = BODY
+    return snake
+
+
+def test_collisions_do_not_depend_on_snake_order():
+    # "wall" drives into the left wall; "hit" drives into its neck on the same tick
+    setups = [
+        ("wall", [(0, 1), (1, 1), (2, 1)], 'LEFT'),
+        ("hit", [(1, 2), (1, 3), (1, 4)], 'UP'),
+    ]
+    for order in (setups, setups[::-1]):
+        arena = Arena(8, seed=1)
+        snakes = {name: place(arena, name, body, direction) for name, body, direction in order}
+        delta = arena.tick()
+        assert not snakes["wall"].alive
+        assert not snakes["hit"].alive
+        assert sorted(delta["dead"]) == sorted(s.id for s in snakes.values())
+        assert BODY not in arena.cells